@@ -13,6 +13,7 @@ SETUP_ONLY=false
 SKIP_SETUP=false
 THRESHOLD=""
 WINDOW=""
+PROFILES=""
 while [[ "$#" -gt 0 ]]; do
     case $1 in
         --setup-only) SETUP_ONLY=true ;;
@@ -21,17 +22,21 @@ while [[ "$#" -gt 0 ]]; do
         --threshold=*) THRESHOLD="${1#*=}" ;;
         --window) WINDOW="$2"; shift ;;
         --window=*) WINDOW="${1#*=}" ;;
+        --profiles) PROFILES="$2"; shift ;;
+        --profiles=*) PROFILES="${1#*=}" ;;
         --help)
             echo "Usage: $0 [OPTIONS]"
             echo "  --setup-only        Only run setup, don't execute agent"
             echo "  --skip-setup        Skip setup, only run agent"
             echo "  --threshold PCT     Minimum price change % to detect (default: 5.0)"
             echo "  --window MINUTES    Time window in minutes (default: 60)"
+            echo "  --profiles LIST     Several PCT:MINUTES profiles in one pass (e.g. 3:5,5:60,20:1440)"
             echo "  --help              Show this help"
             echo ""
             echo "Examples:"
             echo "  $0 --threshold 10 --window 60    # 10% pumps in 1 hour"
             echo "  $0 --threshold 20 --window 1440  # 20% pumps in 24 hours"
+            echo "  $0 --profiles 3:5,5:60,20:1440   # fast spikes and slow grinds together"
             exit 0
             ;;
         *) echo "Unknown option: $1"; exit 1 ;;
@@ -97,6 +102,10 @@ if [ -n "$WINDOW" ]; then
     ORCH_ARGS="$ORCH_ARGS --window $WINDOW"
     echo "Using time window: ${WINDOW} minutes"
 fi
+if [ -n "$PROFILES" ]; then
+    ORCH_ARGS="$ORCH_ARGS --profiles $PROFILES"
+    echo "Using detection profiles: ${PROFILES}"
+fi
 
 # Generate the prompt and save to temp file (avoids shell escaping issues)
 PROMPT_FILE=$(mktemp)
@@ -49,6 +49,10 @@ else
     echo "    Grok-MCP already exists, skipping clone"
 fi
 
+# mcp-proxy (stdio -> SSE bridge used by the worker's pre-warmed MCP pool)
+echo "  - mcp-proxy"
+uv tool install mcp-proxy || pip3 install mcp-proxy --break-system-packages || true
+
 # Install Node.js-based MCP servers
 echo "Installing Node.js-based MCP servers..."
 
@@ -0,0 +1,150 @@
+"""
+Incremental Anomaly Scoring
+
+Keeps per-symbol running mean/variance of tick returns and log volume,
+updated in O(1) per tick and vectorized across the symbol universe, so
+detection can flag moves that are unusual for that particular symbol
+("price z > k AND volume z > m") instead of only a flat threshold.
+"""
+
+import io
+import os
+from typing import Optional
+
+import numpy as np
+
+ANOMALY_PRICE_Z = float(os.environ.get("ANOMALY_PRICE_Z", "4.0"))
+ANOMALY_VOLUME_Z = float(os.environ.get("ANOMALY_VOLUME_Z", "2.0"))
+# EWMA smoothing; half-life of ~1 day of minute ticks
+EWMA_ALPHA = float(os.environ.get("ANOMALY_EWMA_ALPHA", "0.0005"))
+# Ticks needed before a symbol's z-scores are trusted
+MIN_TICKS = int(os.environ.get("ANOMALY_MIN_TICKS", "120"))
+
+
+class SymbolStats:
+    """
+    Running return and volume statistics for a symbol universe.
+
+    Each update uses alpha_t = max(EWMA_ALPHA, 1/n): a plain Welford mean
+    and variance while a symbol is warming up, turning into an EWMA once
+    n exceeds 1/alpha.
+    """
+
+    FIELDS = ("last_price", "count", "ret_mean", "ret_var", "vol_mean", "vol_var")
+
+    def __init__(self, alpha: float = EWMA_ALPHA):
+        self.alpha = alpha
+        self.symbols: list[str] = []
+        self.index: dict[str, int] = {}
+        self.last_price = np.zeros(0)
+        self.count = np.zeros(0, dtype=np.int64)
+        self.ret_mean = np.zeros(0)
+        self.ret_var = np.zeros(0)
+        self.vol_mean = np.zeros(0)
+        self.vol_var = np.zeros(0)
+
+    def _positions(self, symbols: list[str]) -> np.ndarray:
+        """Map symbols to array positions, growing the arrays for new ones."""
+        new = [s for s in dict.fromkeys(symbols) if s not in self.index]
+        if new:
+            for s in new:
+                self.index[s] = len(self.symbols)
+                self.symbols.append(s)
+            grow = len(new)
+            self.last_price = np.concatenate([self.last_price, np.full(grow, np.nan)])
+            self.count = np.concatenate([self.count, np.zeros(grow, dtype=np.int64)])
+            for name in ("ret_mean", "ret_var", "vol_mean", "vol_var"):
+                setattr(self, name, np.concatenate([getattr(self, name), np.zeros(grow)]))
+        return np.array([self.index[s] for s in symbols], dtype=np.int64)
+
+    def update(self, symbols: list[str], prices, volumes):
+        """Fold one tick (latest price and 24h quote volume per symbol) into the stats."""
+        pos = self._positions(symbols)
+        prices = np.asarray(prices, dtype=float)
+        log_volume = np.log1p(np.maximum(np.asarray(volumes, dtype=float), 0.0))
+
+        previous = self.last_price[pos]
+        has_previous = np.isfinite(previous) & (previous > 0) & (prices > 0)
+        self.last_price[pos] = prices
+
+        # Volume level stats update on every tick
+        count = self.count[pos] + 1
+        self.count[pos] = count
+        alpha = np.maximum(self.alpha, 1.0 / count)
+        delta = log_volume - self.vol_mean[pos]
+        self.vol_mean[pos] += alpha * delta
+        self.vol_var[pos] = (1 - alpha) * (self.vol_var[pos] + alpha * delta ** 2)
+
+        # Return stats need a previous price
+        p = pos[has_previous]
+        if len(p):
+            returns = np.log(prices[has_previous] / previous[has_previous])
+            alpha_r = np.maximum(self.alpha, 1.0 / np.maximum(count[has_previous] - 1, 1))
+            delta = returns - self.ret_mean[p]
+            self.ret_mean[p] += alpha_r * delta
+            self.ret_var[p] = (1 - alpha_r) * (self.ret_var[p] + alpha_r * delta ** 2)
+
+    def zscores(self, symbols: list[str], window_change_pct, window_ticks: int,
+                volumes) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Price and volume z-scores for a window.
+
+        The window's log return is compared with the tick return
+        distribution scaled by sqrt(window_ticks); volume is the current
+        log 24h volume against its running level. Symbols without enough
+        history get NaN.
+        """
+        pos = np.array([self.index.get(s, -1) for s in symbols], dtype=np.int64)
+        known = pos >= 0
+        price_z = np.full(len(symbols), np.nan)
+        volume_z = np.full(len(symbols), np.nan)
+        if not known.any():
+            return price_z, volume_z
+
+        k = pos[known]
+        trusted = self.count[k] >= MIN_TICKS
+        change = np.asarray(window_change_pct, dtype=float)[known]
+        log_volume = np.log1p(np.maximum(np.asarray(volumes, dtype=float)[known], 0.0))
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            window_return = np.log1p(change / 100)
+            expected = self.ret_mean[k] * window_ticks
+            spread = np.sqrt(self.ret_var[k] * window_ticks)
+            pz = np.where(trusted & (spread > 0), (window_return - expected) / spread, np.nan)
+            vz = np.where(trusted & (self.vol_var[k] > 0),
+                          (log_volume - self.vol_mean[k]) / np.sqrt(self.vol_var[k]), np.nan)
+
+        price_z[known] = pz
+        volume_z[known] = vz
+        return price_z, volume_z
+
+    def to_bytes(self) -> bytes:
+        """Serialize the state (for Redis) as plain arrays, loadable without pickle."""
+        buffer = io.BytesIO()
+        np.savez(buffer, symbols=np.array(self.symbols, dtype=str), alpha=self.alpha,
+                 **{name: getattr(self, name) for name in self.FIELDS})
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: Optional[bytes]) -> "SymbolStats":
+        """
+        Restore state saved with to_bytes (empty state for None).
+
+        Raises ValueError for data that is not plain arrays (e.g. pickled objects).
+        """
+        if not data:
+            return cls()
+        arrays = np.load(io.BytesIO(data), allow_pickle=False)
+        stats = cls(alpha=float(arrays["alpha"]))
+        stats.symbols = arrays["symbols"].tolist()
+        stats.index = {s: i for i, s in enumerate(stats.symbols)}
+        for name in cls.FIELDS:
+            setattr(stats, name, arrays[name])
+        return stats
+
+
+def is_anomalous(price_z, volume_z, price_k: float = ANOMALY_PRICE_Z,
+                 volume_m: float = ANOMALY_VOLUME_Z) -> np.ndarray:
+    """Boolean mask for "price z > k AND volume z > m" (NaN never matches)."""
+    with np.errstate(invalid="ignore"):
+        return (np.nan_to_num(price_z, nan=-np.inf) > price_k) & (np.nan_to_num(volume_z, nan=-np.inf) > volume_m)
@@ -0,0 +1,91 @@
+"""
+Pump Clustering
+
+Groups co-moving pumps (whole-market or sector moves) so each distinct
+event is investigated once: the representative gets the specific trigger
+and the other members a market_trend trigger pointing to it.
+"""
+
+import math
+import os
+
+CLUSTER_MIN_CORRELATION = float(os.environ.get("CLUSTER_MIN_CORRELATION", "0.8"))
+# Lower bar for pumps that share a sector tag (e.g. both "ai-big-data")
+CLUSTER_SECTOR_CORRELATION = float(os.environ.get("CLUSTER_SECTOR_CORRELATION", "0.5"))
+
+
+def log_returns(closes: list[float]) -> list[float]:
+    """Convert a close price series into log returns."""
+    return [
+        math.log(b / a) for a, b in zip(closes, closes[1:])
+        if a > 0 and b > 0
+    ]
+
+
+def correlation(x: list[float], y: list[float]) -> float:
+    """Pearson correlation of two return series (aligned from the end)."""
+    n = min(len(x), len(y))
+    if n < 3:
+        return 0.0
+    x, y = x[-n:], y[-n:]
+    mean_x = sum(x) / n
+    mean_y = sum(y) / n
+    cov = sum((a - mean_x) * (b - mean_y) for a, b in zip(x, y))
+    var_x = sum((a - mean_x) ** 2 for a in x)
+    var_y = sum((b - mean_y) ** 2 for b in y)
+    if var_x == 0 or var_y == 0:
+        return 0.0
+    return cov / math.sqrt(var_x * var_y)
+
+
+def _representative_key(pump: dict):
+    """Prefer the largest market cap (most coverage), then the largest move."""
+    return (pump.get("market_cap") or 0.0, pump["price_change_pct"])
+
+
+def cluster_pumps(pumps: list[dict], histories: dict[str, list[float]],
+                  min_correlation: float = CLUSTER_MIN_CORRELATION,
+                  sector_correlation: float = CLUSTER_SECTOR_CORRELATION) -> list[list[dict]]:
+    """
+    Group pumps whose returns move together.
+
+    Two pumps are linked when their return correlation reaches
+    min_correlation, or sector_correlation if they share a sector tag;
+    clusters are the connected components of those links.
+
+    Args:
+        pumps: Detected pumps (may carry a "tags" list)
+        histories: Close prices per symbol over the detection window
+
+    Returns:
+        List of clusters, each with its representative pump first, ordered
+        by the representative's price change.
+    """
+    returns = [log_returns(histories.get(p["symbol"], [])) for p in pumps]
+    tags = [set(p.get("tags") or []) for p in pumps]
+    parent = list(range(len(pumps)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i in range(len(pumps)):
+        for j in range(i + 1, len(pumps)):
+            if find(i) == find(j):
+                continue
+            threshold = sector_correlation if tags[i] & tags[j] else min_correlation
+            if correlation(returns[i], returns[j]) >= threshold:
+                parent[find(j)] = find(i)
+
+    groups = {}
+    for i, pump in enumerate(pumps):
+        groups.setdefault(find(i), []).append(pump)
+
+    clusters = [
+        sorted(members, key=_representative_key, reverse=True)
+        for members in groups.values()
+    ]
+    clusters.sort(key=lambda c: c[0]["price_change_pct"], reverse=True)
+    return clusters
@@ -0,0 +1,121 @@
+"""
+Cross-Exchange Merge
+
+Joins Binance and CoinMarketCap detections on canonical symbols (a hash
+join: Binance hits are indexed by symbol, CMC hits probe the index) and
+resolves conflicting fields with fixed rules, replacing the model's
+"combine and deduplicate" step.
+"""
+
+import os
+from typing import Optional
+
+from .universe import MULTIPLIER_PREFIX, SymbolIndex
+
+# Above this relative price gap the two rows are different assets, not one
+MAX_PRICE_DIVERGENCE = float(os.environ.get("MERGE_MAX_PRICE_DIVERGENCE", "0.2"))
+
+# Field -> source whose value wins when both have one
+AUTHORITATIVE = {
+    "price_at_detection": "binance",    # exchange last trade
+    "price_change_pct": "binance",      # same feed as the price
+    "volume_change_pct": "binance",     # from stored snapshots when available
+    "market_cap": "coinmarketcap",      # Binance has no supply data
+    "name": "coinmarketcap",
+    "tags": "coinmarketcap",
+}
+
+MULTIPLIERS = {"1000": 1000, "1000000": 1000000, "1M": 1000000}
+
+
+def price_scale(binance_symbol: str, canonical: str) -> int:
+    """Units per Binance quote for multiplier listings (1000SATS -> 1000)."""
+    match = MULTIPLIER_PREFIX.match(binance_symbol)
+    if match and match.group(2) == canonical:
+        return MULTIPLIERS[match.group(1)]
+    return 1
+
+
+def normalize_binance(pump: dict, universe: SymbolIndex) -> dict:
+    """Key a Binance hit by its canonical symbol and convert to per-unit prices."""
+    raw = pump["symbol"]
+    symbol = universe.canonical_binance(raw)
+    scale = price_scale(raw, symbol)
+    price = pump.get("price_at_detection")
+    return {
+        **pump,
+        "symbol": symbol,
+        "binance_symbol": raw,
+        "price_at_detection": price / scale if price and scale != 1 else price,
+    }
+
+
+def normalize_cmc(pump: dict, universe: SymbolIndex) -> dict:
+    """
+    Key a CMC hit by its canonical symbol.
+
+    A coin whose ticker collides with a higher-ranked one is kept under its
+    CMC-qualified symbol, with the bare ticker as "ticker" for news search.
+    """
+    ticker = pump["symbol"]
+    symbol = universe.canonical_cmc(ticker, pump.get("cmc_id"))
+    if symbol == ticker:
+        return {**pump, "symbol": symbol}
+    return {**pump, "symbol": symbol, "ticker": ticker, "aliases": [ticker]}
+
+
+def _diverges(a: Optional[float], b: Optional[float]) -> bool:
+    if not a or not b:
+        return False
+    return abs(a - b) / max(a, b) > MAX_PRICE_DIVERGENCE
+
+
+def _combine(binance_pump: dict, cmc_pump: dict) -> dict:
+    """Merge one asset's Binance and CMC hits field by field."""
+    sides = {"binance": binance_pump, "coinmarketcap": cmc_pump}
+    merged = {**cmc_pump, **binance_pump, "source": "both"}
+
+    for field, winner in AUTHORITATIVE.items():
+        loser = sides["coinmarketcap" if winner == "binance" else "binance"]
+        value = sides[winner].get(field)
+        merged[field] = value if value is not None else loser.get(field)
+
+    merged["volume_24h"] = max(binance_pump.get("volume_24h") or 0.0,
+                               cmc_pump.get("volume_24h") or 0.0) or None
+
+    # The shortest window either side matched decides the headline profile
+    first = min((binance_pump, cmc_pump), key=lambda p: p["time_window_minutes"])
+    merged["profile"] = first["profile"]
+    merged["time_window_minutes"] = first["time_window_minutes"]
+    merged["profiles"] = list(dict.fromkeys(binance_pump["profiles"] + cmc_pump["profiles"]))
+    return merged
+
+
+def merge_sources(binance_pumps: list[dict], cmc_pumps: list[dict],
+                  universe: SymbolIndex = None) -> list[dict]:
+    """
+    Merge per-source detections into one pump per asset.
+
+    Returns:
+        Pumps sorted by price change, each with source "binance",
+        "coinmarketcap" or "both"
+    """
+    universe = universe or SymbolIndex([])
+
+    # Build side: Binance, keyed by canonical symbol
+    merged = {}
+    for pump in binance_pumps:
+        pump = normalize_binance(pump, universe)
+        merged[pump["symbol"]] = {**pump, "source": "binance"}
+
+    # Probe side: CoinMarketCap
+    for pump in cmc_pumps:
+        pump = normalize_cmc(pump, universe)
+        match = merged.get(pump["symbol"])
+        if match is None:
+            merged[pump["symbol"]] = {**pump, "source": "coinmarketcap"}
+        elif not _diverges(match["price_at_detection"], pump.get("price_at_detection")):
+            merged[pump["symbol"]] = _combine(match, pump)
+        # else: same ticker, different asset - the exchange listing wins
+
+    return sorted(merged.values(), key=lambda p: p["price_change_pct"], reverse=True)
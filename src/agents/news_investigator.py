@@ -7,24 +7,34 @@ Investigates detected pumps across multiple sources to find news triggers.
 import json
 from datetime import datetime
 
-def get_investigation_prompt(symbol: str, price_change_pct: float) -> str:
-    """Generate investigation prompt for a specific pump."""
-    return f"""
-You are a crypto news investigation agent. Your task is to find the news trigger for a pump.
+from .prompts import PromptTemplate
 
-## Target
-- **Symbol:** {symbol}
-- **Price Change:** {price_change_pct:.1f}% in the last hour
+TRIGGER_TYPES = [
+    "announcement",      # Official project announcement
+    "partnership",       # New partnership/collaboration
+    "listing",          # Exchange listing
+    "product_launch",   # New product or feature
+    "social_hype",      # Influencer/viral social media
+    "whale_activity",   # Large wallet movements
+    "airdrop",          # Airdrop or rewards announcement
+    "regulation",       # Regulatory news
+    "market_trend",     # Following broader market
+    "unknown"           # Could not determine
+]
+
+INVESTIGATION_PROMPT = PromptTemplate("investigation", """
+You are a crypto news investigation agent. Your task is to find the news trigger for a pump.
+The target token and its move are given at the end of this prompt; SYMBOL below stands for its ticker.
 
 ## Investigation Sources (use in this order)
 
 ### 1. Reddit (via reddit MCP)
-- Search r/cryptocurrency, r/CryptoMoonShots, r/{symbol.lower()} for recent posts
+- Search r/cryptocurrency, r/CryptoMoonShots and the token's own subreddit for recent posts
 - Look for announcements, partnerships, or hype posts
-- Get top posts from last 24 hours mentioning {symbol}
+- Get top posts from last 24 hours mentioning SYMBOL
 
 ### 2. Twitter/X (via twitter MCP)
-- Search for ${symbol} and #{symbol}
+- Search for $SYMBOL and #SYMBOL
 - Look for official announcements, influencer posts
 - Check engagement metrics (likes, retweets)
 
@@ -33,16 +43,16 @@ You are a crypto news investigation agent. Your task is to find the news trigger
 - Look for coordinated pump signals or news sharing
 
 ### 4. Telegram (via telegram MCP)
-- Search crypto channels for {symbol} mentions
+- Search crypto channels for SYMBOL mentions
 - Look for group discussions about the pump
 
 ### 5. Web Search (via WebSearch)
-- Search for "{symbol} crypto news today"
-- Search for "{symbol} announcement partnership"
+- Search for "SYMBOL crypto news today"
+- Search for "SYMBOL announcement partnership"
 - Look for press releases, blog posts, official announcements
 
 ### 6. Grok Analysis (via grok MCP)
-- Ask Grok to analyze current sentiment and news around {symbol}
+- Ask Grok to analyze current sentiment and news around SYMBOL
 - Request live web search results about the token
 
 ## Analysis Guidelines
@@ -54,43 +64,100 @@ You are a crypto news investigation agent. Your task is to find the news trigger
 ## Output Format
 Return a JSON object:
 ```json
-{{
-  "symbol": "{symbol}",
+{
+  "symbol": "SYMBOL",
   "findings": [
-    {{
+    {
       "source_type": "twitter",
       "source_url": "https://twitter.com/...",
       "content": "Brief summary of finding",
       "relevance_score": 0.85,
       "sentiment": "positive",
-      "metadata": {{"likes": 1500, "retweets": 300}}
-    }}
+      "metadata": {"likes": 1500, "retweets": 300}
+    }
   ],
-  "likely_trigger": {{
+  "likely_trigger": {
     "trigger_type": "partnership",
     "description": "Announced partnership with major exchange",
     "confidence": 0.8,
     "supporting_evidence": ["Summary of key evidence"]
+  },
+  "summary": "One paragraph analysis of why this token pumped"
+}
+```
+
+Execute the investigation and return ONLY the JSON output.
+""")
+
+EVIDENCE_PROMPT = PromptTemplate("evidence", f"""
+You are a crypto news investigation agent. Your task is to find the news trigger for a pump.
+All source data has already been collected for you - do NOT call any tools.
+The target token and its evidence bundle are given at the end of this prompt.
+
+## Analysis Guidelines
+- Only use items from the evidence bundle; cite their URLs as source_url
+- Ignore items that are not about this token (ticker collisions are common)
+- Prioritize official sources and reputable outlets over anonymous posts
+- Note the timing - news should precede or coincide with the pump
+- Look for: listings, partnerships, product launches, whale activity, social campaigns
+- If "Moved together with" is given, the price action was correlated - look for a shared cause such as a sector or market move
+- If nothing in the bundle explains the move, use trigger_type "unknown" or "market_trend"
+
+## Output Format
+Return a JSON object ("symbol" is the target symbol):
+```json
+{{
+  "symbol": "SYMBOL",
+  "findings": [
+    {{
+      "source_type": "reddit",
+      "source_url": "https://www.reddit.com/...",
+      "content": "Brief summary of finding",
+      "relevance_score": 0.85,
+      "sentiment": "positive",
+      "metadata": {{"score": 1500}}
+    }}
+  ],
+  "likely_trigger": {{
+    "trigger_type": "listing",
+    "description": "Announced listing on major exchange",
+    "confidence": 0.8,
+    "supporting_evidence": ["Summary of key evidence"]
   }},
   "summary": "One paragraph analysis of why this token pumped"
 }}
 ```
 
-Execute the investigation now and return ONLY the JSON output.
-"""
+trigger_type must be one of: {", ".join(TRIGGER_TYPES)}
 
-TRIGGER_TYPES = [
-    "announcement",      # Official project announcement
-    "partnership",       # New partnership/collaboration
-    "listing",          # Exchange listing
-    "product_launch",   # New product or feature
-    "social_hype",      # Influencer/viral social media
-    "whale_activity",   # Large wallet movements
-    "airdrop",          # Airdrop or rewards announcement
-    "regulation",       # Regulatory news
-    "market_trend",     # Following broader market
-    "unknown"           # Could not determine
-]
+Return ONLY the JSON output.
+""")
+
+
+def get_investigation_prompt(symbol: str, price_change_pct: float) -> str:
+    """Generate investigation prompt for a specific pump."""
+    return INVESTIGATION_PROMPT.build(f"""
+## Target
+- **Symbol:** {symbol} (SYMBOL = {symbol}, subreddit r/{symbol.lower()})
+- **Price Change:** {price_change_pct:.1f}% in the last hour
+""")
+
+def get_evidence_prompt(symbol: str, price_change_pct: float, evidence: str,
+                        co_moving: list[str] = None) -> str:
+    """Generate analysis prompt for a pump whose evidence was already gathered."""
+    cluster_note = f"\n- **Moved together with:** {', '.join(co_moving)}" if co_moving else ""
+
+    return EVIDENCE_PROMPT.build(f"""
+## Target
+- **Symbol:** {symbol}
+- **Price Change:** {price_change_pct:.1f}%{cluster_note}
+
+## Evidence Bundle
+Market data from Binance/CoinMarketCap and recent posts/articles from Reddit and web news:
+```json
+{evidence}
+```
+""")
 
 def parse_investigation_results(json_str: str) -> dict:
     """Parse investigation results from Claude Code output."""
@@ -15,7 +15,11 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from db.init import init_db
-from agents.pump_detector import get_detection_prompt, parse_pump_results, PUMP_THRESHOLD_PCT, TIME_WINDOW_MINUTES
+from agents.pump_detector import (
+    get_detection_criteria, parse_pump_results, parse_profiles,
+    DETECTION_INSTRUCTIONS, PUMP_THRESHOLD_PCT, TIME_WINDOW_MINUTES
+)
+from agents.prompts import PromptTemplate
 from agents.news_investigator import get_investigation_prompt, parse_investigation_results
 from agents.reporter import (
     save_pump_to_db, save_findings_to_db, save_trigger_to_db,
@@ -23,11 +27,11 @@ from agents.reporter import (
     start_agent_run, complete_agent_run
 )
 
-ORCHESTRATOR_PROMPT = """
+ORCHESTRATOR_INSTRUCTIONS = """
 You are the Pump Research Agent orchestrator. Execute the following workflow:
 
 ## Phase 1: Detect Pumps
-{detection_prompt}
+{detection_instructions}
 
 ## Phase 2: Investigate Each Pump
 For each detected pump, you MUST search for the actual news/event that caused the pump. Use these MCP tools:
@@ -138,17 +142,22 @@ Return summary:
 ```
 """
 
-def generate_full_prompt(threshold_pct: float = None, time_window_minutes: int = None) -> str:
+# The detection criteria of a run go in the suffix; everything above is shared by all runs
+ORCHESTRATOR_PROMPT = PromptTemplate(
+    "orchestrator", ORCHESTRATOR_INSTRUCTIONS.format(detection_instructions=DETECTION_INSTRUCTIONS)
+)
+
+def generate_full_prompt(threshold_pct: float = None, time_window_minutes: int = None,
+                         profiles: list[tuple[float, int]] = None) -> str:
     """
     Generate the complete orchestrator prompt for Claude Code.
 
     Args:
         threshold_pct: Minimum price change percentage to detect
         time_window_minutes: Time window for detection in minutes
+        profiles: Several (threshold, window) pairs to detect in one pass
     """
-    return ORCHESTRATOR_PROMPT.format(
-        detection_prompt=get_detection_prompt(threshold_pct, time_window_minutes)
-    )
+    return ORCHESTRATOR_PROMPT.build(get_detection_criteria(threshold_pct, time_window_minutes, profiles))
 
 def main():
     """Main entry point - prints the orchestrator prompt."""
@@ -165,13 +174,19 @@ def main():
         default=None,
         help=f"Time window in minutes (default: {TIME_WINDOW_MINUTES})"
     )
+    parser.add_argument(
+        "--profiles",
+        type=parse_profiles,
+        default=None,
+        help="Several threshold:window profiles in one pass, e.g. 3:5,5:60,20:1440"
+    )
     args = parser.parse_args()
 
     # Initialize database
     init_db()
 
     # Generate and print the full prompt
-    prompt = generate_full_prompt(args.threshold, args.window)
+    prompt = generate_full_prompt(args.threshold, args.window, args.profiles)
     print(prompt)
 
 if __name__ == "__main__":
@@ -0,0 +1,150 @@
+"""
+Investigation Prioritizer
+
+Orders detected pumps so the most important moves are investigated first
+and tracks the per-run budget that decides when the rest is deferred to
+the next cycle.
+"""
+
+import math
+import os
+import time
+from typing import Optional
+
+# Relative weight of each factor in the priority score (sums to 1.0)
+PRIORITY_WEIGHTS = {
+    "market_cap": float(os.environ.get("PRIORITY_WEIGHT_MARKET_CAP", "0.35")),
+    "volume_change": float(os.environ.get("PRIORITY_WEIGHT_VOLUME", "0.2")),
+    "price_change": float(os.environ.get("PRIORITY_WEIGHT_PRICE", "0.25")),
+    "novelty": float(os.environ.get("PRIORITY_WEIGHT_NOVELTY", "0.2")),
+}
+
+RUN_TIME_BUDGET_SECONDS = int(os.environ.get("RUN_TIME_BUDGET_SECONDS", "480"))
+RUN_TOKEN_BUDGET = int(os.environ.get("RUN_TOKEN_BUDGET", "0"))  # 0 = unlimited
+RUN_COST_BUDGET_USD = float(os.environ.get("RUN_COST_BUDGET_USD", "0"))
+# One pump's analysis is stopped once it uses this many tokens
+PUMP_TOKEN_BUDGET = int(os.environ.get("PUMP_TOKEN_BUDGET", "0"))
+# Ceilings across all runs per UTC day
+DAILY_TOKEN_BUDGET = int(os.environ.get("DAILY_TOKEN_BUDGET", "0"))
+DAILY_COST_BUDGET_USD = float(os.environ.get("DAILY_COST_BUDGET_USD", "0"))
+
+# Normalization caps: values at or above these score 1.0
+MARKET_CAP_CAP = 1e11
+VOLUME_CHANGE_CAP = 500.0
+PRICE_CHANGE_CAP = 50.0
+
+
+def score_pump(pump: dict, recent_pumps: int = 0) -> float:
+    """
+    Score a pump between 0 and 1.
+
+    Market cap is log-scaled so large caps rank high without drowning out
+    everything else; novelty falls off with the number of pumps the same
+    symbol had recently.
+    """
+    market_cap = pump.get("market_cap") or 0.0
+    market_cap_score = min(1.0, math.log10(market_cap + 1) / math.log10(MARKET_CAP_CAP))
+    volume_score = min(1.0, max(0.0, pump.get("volume_change_pct") or 0.0) / VOLUME_CHANGE_CAP)
+    price_score = min(1.0, max(0.0, pump["price_change_pct"]) / PRICE_CHANGE_CAP)
+    novelty_score = 1.0 / (1 + recent_pumps)
+
+    return round(
+        PRIORITY_WEIGHTS["market_cap"] * market_cap_score
+        + PRIORITY_WEIGHTS["volume_change"] * volume_score
+        + PRIORITY_WEIGHTS["price_change"] * price_score
+        + PRIORITY_WEIGHTS["novelty"] * novelty_score,
+        4
+    )
+
+
+def prioritize_clusters(clusters: list[list[dict]], recent_counts: dict[str, int]) -> list[list[dict]]:
+    """
+    Sort clusters by priority, highest first.
+
+    Each pump gets a "priority" key; a cluster ranks by its best member.
+    """
+    for cluster in clusters:
+        for pump in cluster:
+            pump["priority"] = score_pump(pump, recent_counts.get(pump["symbol"], 0))
+
+    return sorted(clusters, key=lambda c: max(p["priority"] for p in c), reverse=True)
+
+
+class RunBudget:
+    """
+    Time, token and cost budget for one run's investigations.
+
+    Token and cost limits of 0 are unlimited. daily_tokens_left and
+    daily_cost_left are what the daily ceilings leave for this run (None
+    when there is no daily ceiling).
+    """
+
+    def __init__(self, time_seconds: int = RUN_TIME_BUDGET_SECONDS,
+                 tokens: int = RUN_TOKEN_BUDGET, initial_estimate_seconds: float = 60.0,
+                 cost_usd: float = RUN_COST_BUDGET_USD,
+                 daily_tokens_left: Optional[int] = None, daily_cost_left: Optional[float] = None):
+        self.time_seconds = time_seconds
+        self.tokens = tokens
+        self.cost_usd = cost_usd
+        self.daily_tokens_left = daily_tokens_left
+        self.daily_cost_left = daily_cost_left
+        self.started_at = time.monotonic()
+        self.tokens_used = 0
+        self.cost_used = 0.0
+        self._durations = []
+        self._costs = []
+        self._initial_estimate = initial_estimate_seconds
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def estimated_duration(self) -> float:
+        """Average duration of finished investigations (initial guess until one finishes)."""
+        if not self._durations:
+            return self._initial_estimate
+        return sum(self._durations) / len(self._durations)
+
+    def estimated_cost(self, initial: float = 0.0) -> float:
+        """Average cost of finished model calls (initial guess until one finishes)."""
+        if not self._costs:
+            return initial
+        return sum(self._costs) / len(self._costs)
+
+    def can_afford(self, estimated_tokens: int = 0, model_call: bool = True,
+                   estimated_cost: float = 0.0) -> bool:
+        """Check whether another investigation fits in what is left of the budget."""
+        expected = self.estimated_duration() if model_call else 0.0
+        if self.elapsed + expected > self.time_seconds:
+            return False
+        if not model_call:
+            return True
+        tokens = self.tokens_used + estimated_tokens
+        cost = self.cost_used + estimated_cost
+        if self.tokens and tokens > self.tokens:
+            return False
+        if self.cost_usd and cost > self.cost_usd:
+            return False
+        if self.daily_tokens_left is not None and tokens > self.daily_tokens_left:
+            return False
+        if self.daily_cost_left is not None and cost > self.daily_cost_left:
+            return False
+        return True
+
+    def reserve(self, tokens: int, cost_usd: float = 0.0):
+        """Count an investigation's estimated tokens and cost when it starts (runs may overlap)."""
+        self.tokens_used += tokens
+        self.cost_used += cost_usd
+
+    def record(self, duration_seconds: float, tokens: int = 0, cost_usd: float = 0.0,
+               reserved: int = 0, reserved_cost: float = 0.0):
+        """Record a finished model investigation, replacing its reservation with actual usage."""
+        self._durations.append(duration_seconds)
+        self._costs.append(cost_usd)
+        self.tokens_used += tokens - reserved
+        self.cost_used += cost_usd - reserved_cost
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate for prompt text (~4 characters per token)."""
+    return len(text) // 4
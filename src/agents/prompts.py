@@ -0,0 +1,42 @@
+"""
+Prompt Assembly
+
+Every prompt is a static instruction prefix followed by a small per-call
+suffix. The prefix never contains a symbol, threshold or timestamp, so it
+is byte-identical across calls and repeated per-pump calls hit the prompt
+prefix cache; only the suffix is sent as fresh tokens.
+"""
+
+# Separates the shared instructions from the per-call data
+SUFFIX_SEPARATOR = "\n---\n\n"
+
+
+class PromptTemplate:
+    """A named static prefix; build() appends the per-call suffix."""
+
+    def __init__(self, name: str, prefix: str):
+        self.name = name
+        self.prefix = prefix.strip() + "\n" + SUFFIX_SEPARATOR
+        TEMPLATES[name] = self
+
+    def build(self, suffix: str) -> str:
+        return self.prefix + suffix.strip() + "\n"
+
+
+TEMPLATES: dict[str, PromptTemplate] = {}
+
+
+def prompt_metrics(prompt: str) -> dict:
+    """
+    Size of a prompt's shared prefix and per-call suffix.
+
+    Returns:
+        dict with template name (None for unstructured prompts),
+        prefix_chars and suffix_chars
+    """
+    for template in TEMPLATES.values():
+        if prompt.startswith(template.prefix):
+            prefix = len(template.prefix)
+            return {"template": template.name, "prefix_chars": prefix,
+                    "suffix_chars": len(prompt) - prefix}
+    return {"template": None, "prefix_chars": 0, "suffix_chars": len(prompt)}
@@ -10,34 +10,66 @@ import os
 from datetime import datetime
 from typing import Optional
 
+from .prompts import PromptTemplate
+
 # Pump detection configuration (can be overridden via environment variables)
 PUMP_THRESHOLD_PCT = float(os.environ.get("PUMP_THRESHOLD_PCT", "5.0"))
 TIME_WINDOW_MINUTES = int(os.environ.get("PUMP_TIME_WINDOW_MINUTES", "60"))
 
-def get_detection_prompt(threshold_pct: float = None, time_window_minutes: int = None) -> str:
+# Several (threshold, window) profiles evaluated in one pass, e.g. "3:5,5:60,20:1440".
+# Empty means the single PUMP_THRESHOLD_PCT / PUMP_TIME_WINDOW_MINUTES profile.
+DETECTION_PROFILES = os.environ.get("PUMP_DETECTION_PROFILES", "")
+
+def parse_profiles(spec: str) -> list[tuple[float, int]]:
+    """Parse "threshold:window,..." into (threshold_pct, window_minutes) pairs sorted by window."""
+    profiles = []
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        threshold, window = part.split(":")
+        profiles.append((float(threshold), int(window)))
+    return sorted(profiles, key=lambda p: p[1])
+
+def get_detection_profiles(threshold_pct: float = None, time_window_minutes: int = None) -> list[tuple[float, int]]:
     """
-    Get the pump detection prompt for Claude Code.
+    Resolve the detection profiles for a run.
 
-    Args:
-        threshold_pct: Minimum price change percentage to detect (default: from env or 5.0)
-        time_window_minutes: Time window for detection (default: from env or 60)
+    An explicit threshold or window selects a single profile; otherwise
+    PUMP_DETECTION_PROFILES is used, falling back to the env defaults.
     """
-    threshold = threshold_pct if threshold_pct is not None else PUMP_THRESHOLD_PCT
-    window = time_window_minutes if time_window_minutes is not None else TIME_WINDOW_MINUTES
-
-    # Convert minutes to human-readable format
+    if threshold_pct is None and time_window_minutes is None and DETECTION_PROFILES:
+        return parse_profiles(DETECTION_PROFILES)
+    return [(
+        threshold_pct if threshold_pct is not None else PUMP_THRESHOLD_PCT,
+        time_window_minutes if time_window_minutes is not None else TIME_WINDOW_MINUTES
+    )]
+
+def describe_window(window: int) -> str:
+    """Convert minutes to human-readable format."""
     if window >= 1440:
-        time_desc = f"{window // 1440} day{'s' if window >= 2880 else ''}"
+        return f"{window // 1440} day{'s' if window >= 2880 else ''}"
     elif window >= 60:
-        time_desc = f"{window // 60} hour{'s' if window >= 120 else ''}"
-    else:
-        time_desc = f"{window} minute{'s' if window != 1 else ''}"
-
-    return f"""
+        return f"{window // 60} hour{'s' if window >= 120 else ''}"
+    return f"{window} minute{'s' if window != 1 else ''}"
+
+def window_label(time_window_minutes: int) -> str:
+    """Compact window label, e.g. "5m", "1h", "1d"."""
+    if time_window_minutes % 1440 == 0:
+        return f"{time_window_minutes // 1440}d"
+    elif time_window_minutes % 60 == 0:
+        return f"{time_window_minutes // 60}h"
+    return f"{time_window_minutes}m"
+
+def profile_name(threshold_pct: float, time_window_minutes: int) -> str:
+    """Short profile label, e.g. "5%/1h"."""
+    return f"{threshold_pct:g}%/{window_label(time_window_minutes)}"
+
+DETECTION_INSTRUCTIONS = """
 You are a crypto pump detection agent. Your task is to identify tokens that have pumped significantly.
+The detection profiles (threshold and window pairs) are listed under "Detection Criteria" at the end of this prompt.
 
-## Detection Criteria
-- Price increase >= {threshold}% in the last {time_desc}
+## Rules
+- A token matching ANY profile is a pump; tag it with the shortest-window profile it matched
 - Use BOTH Binance and CoinMarketCap data for comprehensive coverage
 
 ## Instructions
@@ -45,12 +77,12 @@ You are a crypto pump detection agent. Your task is to identify tokens that have
 ### Step 1: Get Binance Data
 Use the Binance MCP server to:
 1. Get list of all trading pairs (focus on USDT pairs)
-2. Get price changes for the last {time_desc}
-3. Filter for tokens with >= {threshold}% increase
+2. Get price changes for each profile window - fetch the data once and reuse it
+3. Filter for tokens meeting any profile's threshold
 
 ### Step 2: Get CoinMarketCap Data
 Use the CoinMarketCap MCP server to:
-1. Get top gainers in the last {time_desc}
+1. Get top gainers for the same windows (where available)
 2. Get market cap and volume data for context
 
 ### Step 3: Combine and Deduplicate
@@ -59,26 +91,54 @@ Use the CoinMarketCap MCP server to:
 - Include: symbol, price_change_pct, volume_change_pct, market_cap, current_price
 
 ### Output Format
-Return a JSON array of detected pumps:
+Return a JSON array of detected pumps, with time_window_minutes and profile taken
+from the profile each token matched:
 ```json
 [
-  {{
+  {
     "symbol": "BTC",
     "price_change_pct": 7.5,
     "volume_change_pct": 150.2,
     "market_cap": 1200000000000,
     "price_at_detection": 65000.50,
     "source": "both",
-    "time_window_minutes": {window}
-  }}
+    "time_window_minutes": 60,
+    "profile": "5%/1h"
+  }
 ]
 ```
 
 If no pumps detected, return an empty array: []
 
-Execute now and return ONLY the JSON output.
+Return ONLY the JSON output.
 """
 
+DETECTION_PROMPT = PromptTemplate("detection", DETECTION_INSTRUCTIONS)
+
+
+def get_detection_criteria(threshold_pct: float = None, time_window_minutes: int = None,
+                           profiles: list[tuple[float, int]] = None) -> str:
+    """Per-run part of the detection prompt: the profiles to check."""
+    profiles = profiles or get_detection_profiles(threshold_pct, time_window_minutes)
+    criteria = "\n".join(
+        f"- Profile `{profile_name(t, w)}` (time_window_minutes {w}): "
+        f"price increase >= {t}% in the last {describe_window(w)}"
+        for t, w in profiles
+    )
+    return f"## Detection Criteria\n{criteria}\n"
+
+def get_detection_prompt(threshold_pct: float = None, time_window_minutes: int = None,
+                         profiles: list[tuple[float, int]] = None) -> str:
+    """
+    Get the pump detection prompt for Claude Code.
+
+    Args:
+        threshold_pct: Minimum price change percentage to detect (default: from env or 5.0)
+        time_window_minutes: Time window for detection (default: from env or 60)
+        profiles: Several (threshold, window) pairs to check in one pass (overrides the above)
+    """
+    return DETECTION_PROMPT.build(get_detection_criteria(threshold_pct, time_window_minutes, profiles))
+
 def parse_pump_results(json_str: str) -> list[dict]:
     """Parse pump detection results from Claude Code output."""
     try:
@@ -9,6 +9,8 @@ import sqlite3
 from datetime import datetime
 from pathlib import Path
 
+from .prompts import PromptTemplate
+
 DB_PATH = Path(__file__).parent.parent.parent / "data" / "research.db"
 
 def save_pump_to_db(pump: dict) -> int:
@@ -66,6 +68,15 @@ def save_trigger_to_db(pump_id: int, trigger: dict, finding_ids: list[int]) -> i
         ))
         return cursor.lastrowid
 
+TELEGRAM_REPORT_PROMPT = PromptTemplate("telegram_report", """
+Use the Telegram MCP to send a research finding to the configured chat.
+
+Send the message given at the end of this prompt exactly as written to the chat ID
+configured in the TELEGRAM_CHAT_ID environment variable.
+Return the message ID after sending.
+""")
+
+
 def get_telegram_report_prompt(pump: dict, investigation: dict) -> str:
     """Generate prompt to send Telegram notification."""
     findings_summary = ""
@@ -76,9 +87,7 @@ def get_telegram_report_prompt(pump: dict, investigation: dict) -> str:
     trigger_type = trigger.get('trigger_type', 'Unknown').replace('_', ' ').title()
     no_findings = "\n- No specific findings identified"
 
-    return f"""
-Use the Telegram MCP to send this research finding to the configured chat.
-
+    return TELEGRAM_REPORT_PROMPT.build(f"""
 ## Message to Send
 
 🚀 **PUMP DETECTED: ${pump['symbol']}**
@@ -99,12 +108,7 @@ Use the Telegram MCP to send this research finding to the configured chat.
 ---
 _Generated by Pump Researcher Agent_
 _Detected at: {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}_
-
----
-
-Send this message to the chat ID configured in TELEGRAM_CHAT_ID environment variable.
-Return the message ID after sending.
-"""
+""")
 
 def save_notification_to_db(pump_id: int, chat_id: str, message_id: str = None, status: str = "sent"):
     """Record that a notification was sent."""
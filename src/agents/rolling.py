@@ -0,0 +1,120 @@
+"""
+Multi-Resolution Price History
+
+Builds rolling price/volume matrices (symbols x time buckets) from stored
+market snapshots at several resolutions at once, so every detection
+profile reads its window from the same precomputed arrays.
+"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+
+# (bucket size in minutes, number of buckets kept): 2h of 1m, 26h of 15m, 7d of 1h
+RESOLUTIONS = [(1, 120), (15, 104), (60, 168)]
+
+
+def _epoch_minute(t: datetime) -> int:
+    """Minutes since the epoch, treating naive datetimes as UTC."""
+    if t.tzinfo is None:
+        t = t.replace(tzinfo=timezone.utc)
+    return int(t.timestamp() // 60)
+
+
+def forward_fill(matrix: np.ndarray) -> np.ndarray:
+    """Forward-fill NaNs along the time axis (vectorized)."""
+    mask = np.isnan(matrix)
+    idx = np.where(~mask, np.arange(matrix.shape[1]), 0)
+    np.maximum.accumulate(idx, axis=1, out=idx)
+    return matrix[np.arange(matrix.shape[0])[:, None], idx]
+
+
+class MultiResolutionHistory:
+    """
+    Last-price and volume matrices per resolution for a symbol universe.
+
+    Args:
+        symbols: Symbol for each snapshot row
+        captured_at: Snapshot time for each row
+        prices: Price for each row
+        volumes: Rolling 24h quote volume for each row
+        now: Reference time (defaults to the latest snapshot)
+    """
+
+    def __init__(self, symbols: list[str], captured_at: list[datetime],
+                 prices: list[float], volumes: list[float], now: datetime = None):
+        self.symbols = sorted(set(symbols))
+        self.index = {s: i for i, s in enumerate(self.symbols)}
+        self.levels = {}
+
+        if not symbols:
+            self.span_minutes = 0
+            return
+
+        rows = np.array([self.index[s] for s in symbols])
+        minutes = np.array([_epoch_minute(t) for t in captured_at])
+        price_arr = np.asarray(prices, dtype=float)
+        volume_arr = np.asarray(volumes, dtype=float)
+        now_minute = _epoch_minute(now) if now else int(minutes.max())
+        self.span_minutes = now_minute - int(minutes.min())
+
+        # Sort by time so the last snapshot in each bucket wins
+        order = np.argsort(minutes, kind="stable")
+        rows, minutes = rows[order], minutes[order]
+        price_arr, volume_arr = price_arr[order], volume_arr[order]
+
+        for bucket, count in RESOLUTIONS:
+            end = now_minute // bucket
+            cols = minutes // bucket - (end - count)
+            keep = (cols >= 0) & (cols <= count)
+
+            close = np.full((len(self.symbols), count + 1), np.nan)
+            volume = np.full_like(close, np.nan)
+            # Keep the last occurrence of each (row, col) pair
+            flat = rows[keep] * (count + 1) + cols[keep]
+            _, last = np.unique(flat[::-1], return_index=True)
+            last = len(flat) - 1 - last
+            close.flat[flat[last]] = price_arr[keep][last]
+            volume.flat[flat[last]] = volume_arr[keep][last]
+
+            self.levels[bucket] = (forward_fill(close), forward_fill(volume))
+
+    def _level_for(self, window_minutes: int):
+        """Finest resolution whose span covers the window."""
+        for bucket, count in RESOLUTIONS:
+            if window_minutes % bucket == 0 and window_minutes // bucket <= count:
+                return bucket
+        for bucket, count in RESOLUTIONS:
+            if window_minutes <= bucket * count:
+                return bucket
+        return None
+
+    def covers(self, window_minutes: int) -> bool:
+        """Whether there is enough history to evaluate the window."""
+        return self._level_for(window_minutes) is not None and self.span_minutes >= window_minutes
+
+    def window_changes(self, window_minutes: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Percent price and volume change over the window for every symbol.
+
+        Returns:
+            (price_change_pct, volume_change_pct) arrays aligned with
+            self.symbols; NaN where the symbol has no data that far back
+        """
+        bucket = self._level_for(window_minutes)
+        if bucket is None:
+            nan = np.full(len(self.symbols), np.nan)
+            return nan, nan.copy()
+
+        close, volume = self.levels[bucket]
+        lag = max(1, round(window_minutes / bucket))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            price_change = (close[:, -1] / close[:, -1 - lag] - 1) * 100
+            volume_change = (volume[:, -1] / volume[:, -1 - lag] - 1) * 100
+        return price_change, volume_change
+
+    def latest_prices(self) -> np.ndarray:
+        """Most recent price per symbol."""
+        if not self.levels:
+            return np.array([])
+        return self.levels[RESOLUTIONS[0][0]][0][:, -1]
@@ -0,0 +1,253 @@
+"""
+Rule-Based Trigger Classifier
+
+Deterministic fast path for pumps with an obvious cause (exchange listing,
+partnership, airdrop...). Gathered evidence is matched against keyword
+rules; when the combined confidence clears FAST_PATH_CONFIDENCE the result
+is used directly and the model analysis call is skipped.
+"""
+
+import json
+import os
+import re
+from typing import Optional
+from urllib.parse import urlsplit
+
+from .news_investigator import TRIGGER_TYPES
+
+FAST_PATH_CONFIDENCE = float(os.environ.get("FAST_PATH_CONFIDENCE", "0.85"))
+
+EXCHANGES = r"(binance|coinbase|upbit|bithumb|okx|bybit|kraken|robinhood|kucoin|gate\.?io|bitget|htx|mexc)"
+REGULATORS = r"(sec|cftc|doj|finra|esma|fca)"
+
+# (name, trigger_type, pattern, precision, decisive) - precision is the
+# estimated share of matching items that really explain the pump, used as
+# the item probability (calibrated with src/worker/rule_calibration.py and
+# overridable via TRIGGER_RULE_PRECISIONS). Only decisive rules can carry a
+# classification onto the fast path; the others merely add support.
+RULES = [
+    ("listing_exchange", "listing",
+     re.compile(rf"\b{EXCHANGES}\b.{{0,60}}\b(will list|lists|listed|listing|adds|to list)\b"
+                rf"|\b(will list|lists|listed|listing|adds|to list)\b.{{0,60}}\b{EXCHANGES}\b"), 0.8, True),
+    ("listing_generic", "listing", re.compile(r"\b(new listing|listed on|lists)\b"), 0.4, False),
+    ("partnership", "partnership",
+     re.compile(r"\b(partners? with|partnership|strategic alliance|collaborat(es|ion) with|integrat(es|ion) with)\b"),
+     0.6, True),
+    ("airdrop", "airdrop", re.compile(r"\b(airdrop|token claim|snapshot date)\b"), 0.6, True),
+    ("product_launch", "product_launch",
+     re.compile(r"\b(mainnet|testnet launch|goes live|launch(es|ed)|v\d upgrade|upgrade goes|hard fork)\b"), 0.5, True),
+    # A regulator acting on something, or a spot ETF decision - not any mention of "sec" or "court"
+    ("regulation", "regulation",
+     re.compile(rf"\b{REGULATORS}\b.{{0,40}}\b(approv(es|ed|al)|sues|sued|charges|settle[sd]?|settlement|"
+                rf"drops? (the )?(case|lawsuit)|dismiss(es|ed)|classif(y|ies|ied)|not a security)\b"
+                r"|\betf (approval|approved|rejected|denied)\b"
+                r"|\b(judge|court) (rules|ruled|dismisses|dismissed|sides)\b"), 0.55, True),
+    ("whale_activity", "whale_activity",
+     re.compile(r"\b(whales?|large holder)\b.{0,60}\b(bought|buy|accumulat\w*|moved|transferred)\b"), 0.45, True),
+    ("announcement", "announcement", re.compile(r"\b(announce[sd]?|announcement|official(ly)?)\b"), 0.35, False),
+]
+
+# Calibrated precisions, e.g. {"listing_exchange": 0.74, "announcement": 0.21}
+RULE_PRECISIONS = json.loads(os.getenv("TRIGGER_RULE_PRECISIONS") or "{}")
+RULES = [
+    (name, trigger_type, pattern, RULE_PRECISIONS.get(name, precision), decisive)
+    for name, trigger_type, pattern, precision, decisive in RULES
+]
+
+# How much an item from each source counts toward the decision
+SOURCE_WEIGHTS = {
+    "web": 1.0,
+    "twitter": 0.8,
+    "reddit": 0.6,
+    "telegram": 0.5,
+    "discord": 0.5,
+}
+
+# Weight of the runner-up type subtracted from the winner (ambiguity penalty)
+AMBIGUITY_PENALTY = 0.5
+
+# Corroboration across sources cuts a rule's own error rate by at most this factor.
+# With the default precisions, listings clear FAST_PATH_CONFIDENCE from two sources,
+# partnerships and airdrops from three, regulator actions from four and launches from
+# all five; whale chatter never does.
+CORROBORATION_MAX_ERROR_CUT = 4
+
+# Ceiling for a type supported only by non-decisive rules
+WEAK_RULES_MAX_CONFIDENCE = 0.6
+
+SENTIMENT_POSITIVE = re.compile(
+    r"\b(surg\w+|soar\w*|rall(y|ies|ied)|jump\w*|gains?|bullish|approv\w+|record high|all-time high|"
+    r"partner\w*|launch\w*|will list|to list|lists|listed|listing|adds|integrat\w+|upgrade\w*|airdrop)\b"
+)
+SENTIMENT_NEGATIVE = re.compile(
+    r"\b(hack(s|ed)?|exploit(s|ed)?|delist\w*|sues|sued|lawsuit|charges|fraud|scam|rug ?pull|crash\w*|"
+    r"plung\w+|dump(s|ed|ing)?|bans?|banned|fined?|halt\w*|bearish|rejected|denied)\b"
+)
+
+
+def _item_text(item: dict) -> str:
+    return f"{item.get('title') or ''}. {item.get('content') or ''}".lower()
+
+
+def evidence_sentiment(text: str) -> str:
+    """Positive, negative or neutral, by which kind of wording dominates."""
+    positive = len(SENTIMENT_POSITIVE.findall(text))
+    negative = len(SENTIMENT_NEGATIVE.findall(text))
+    if positive > negative:
+        return "positive"
+    if negative > positive:
+        return "negative"
+    return "neutral"
+
+
+def _dedupe(items: list[dict], seen_urls: set, seen_titles: set) -> list[dict]:
+    """Drop items already seen by URL (without query) or by title, e.g. syndicated copies."""
+    unique = []
+    for item in items:
+        url = item.get("source_url") or ""
+        parts = urlsplit(url.lower())
+        url_key = f"{parts.netloc}{parts.path}".rstrip("/") if url else None
+        title_key = re.sub(r"\W+", " ", (item.get("title") or "").lower()).strip() or None
+        if (url_key and url_key in seen_urls) or (title_key and title_key in seen_titles):
+            continue
+        seen_urls.add(url_key)
+        seen_titles.add(title_key)
+        unique.append(item)
+    return unique
+
+
+def match_rule(text: str) -> Optional[tuple]:
+    """The most precise rule matching a text, if any."""
+    best = None
+    for rule in RULES:
+        if rule[2].search(text) and (best is None or rule[3] > best[3]):
+            best = rule
+    return best
+
+
+def classify_evidence(bundle: dict) -> Optional[dict]:
+    """
+    Classify an evidence bundle with keyword rules.
+
+    Items are deduplicated by URL and title first. Repeated articles from
+    one source are correlated, so each rule counts only its best item per
+    source; the sources are combined with a noisy-OR, capped so corroboration
+    cuts a rule's own error rate by at most CORROBORATION_MAX_ERROR_CUT.
+    Rules of a type are then combined the same way. The best type's confidence is reduced by a competing
+    type's confidence to stay calibrated on ambiguous bundles, and a type
+    backed only by weak (non-decisive) rules never reaches the fast path.
+
+    Returns:
+        Investigation result in the parse_investigation_results format,
+        or None if no rule matched.
+    """
+    seen_urls, seen_titles = set(), set()
+    best_per_source = {}  # (rule name, source) -> probability
+    rules_by_type = {}
+    matches = {}
+    for source, items in bundle["items"].items():
+        weight = SOURCE_WEIGHTS.get(source, 0.5)
+        for item in _dedupe(items, seen_urls, seen_titles):
+            rule = match_rule(_item_text(item))
+            if rule is None:
+                continue
+
+            name, trigger_type, _, precision, _ = rule
+            probability = precision * weight
+            key = (name, source)
+            best_per_source[key] = max(best_per_source.get(key, 0.0), probability)
+            rules_by_type.setdefault(trigger_type, {})[name] = rule
+            matches.setdefault(trigger_type, []).append((item, probability))
+
+    if not matches:
+        return None
+
+    scores = []
+    for trigger_type, rules in rules_by_type.items():
+        if trigger_type not in TRIGGER_TYPES:
+            continue
+        type_miss = 1.0
+        for name, (_, _, _, precision, _) in rules.items():
+            rule_miss = 1.0
+            for (rule_name, _), probability in best_per_source.items():
+                if rule_name == name:
+                    rule_miss *= 1 - probability
+            type_miss *= 1 - min(1 - rule_miss, 1 - (1 - precision) / CORROBORATION_MAX_ERROR_CUT)
+        score = 1 - type_miss
+        if not any(rule[4] for rule in rules.values()):
+            score = min(score, WEAK_RULES_MAX_CONFIDENCE)
+        scores.append((score, trigger_type))
+    if not scores:
+        return None
+
+    scores.sort(reverse=True)
+    top_score, top_type = scores[0]
+    runner_up = scores[1][0] if len(scores) > 1 else 0.0
+    confidence = max(0.0, top_score - AMBIGUITY_PENALTY * runner_up)
+
+    supporting = matches[top_type]
+    findings = [
+        {
+            "source_type": item.get("source_type", "web"),
+            "source_url": item.get("source_url"),
+            "content": f"{item.get('title') or ''} - {item.get('content') or ''}".strip(" -")[:500],
+            "relevance_score": round(probability, 2),
+            "sentiment": evidence_sentiment(_item_text(item)),
+            "metadata": item.get("metadata", {}),
+        }
+        for item, probability in sorted(supporting, key=lambda m: m[1], reverse=True)
+    ]
+    headline = findings[0]["content"][:160]
+
+    return {
+        "symbol": bundle["symbol"],
+        "findings": findings,
+        "likely_trigger": {
+            "trigger_type": top_type,
+            "description": headline,
+            "confidence": round(confidence, 3),
+            "supporting_evidence": [f.get("source_url") for f in findings if f.get("source_url")],
+        },
+        "summary": f"Rule-based classification: {len(supporting)} item(s) matched "
+                   f"{top_type.replace('_', ' ')} patterns",
+        "classified_by": "rules",
+    }
+
+
+def calibrate_precisions(examples, prior_strength: float = 10.0) -> dict:
+    """
+    Estimate each rule's precision from labeled investigations.
+
+    examples: (evidence text, trigger type the investigation settled on)
+    pairs. A rule's precision is the share of texts it is the best match
+    for whose label is the rule's type, shrunk toward the current precision
+    by prior_strength pseudo-observations so rare rules do not swing.
+
+    Returns:
+        {rule name: {"precision", "matches", "hits"}}
+    """
+    counts = {name: [0, 0] for name, *_ in RULES}
+    for text, label in examples:
+        rule = match_rule(text.lower())
+        if rule is None:
+            continue
+        counts[rule[0]][0] += 1
+        counts[rule[0]][1] += rule[1] == label
+
+    calibrated = {}
+    for name, trigger_type, _, precision, _ in RULES:
+        matched, hits = counts[name]
+        calibrated[name] = {
+            "precision": round((hits + prior_strength * precision) / (matched + prior_strength), 3),
+            "matches": matched,
+            "hits": hits,
+        }
+    return calibrated
+
+
+def fast_path(bundle: dict, min_confidence: float = FAST_PATH_CONFIDENCE) -> Optional[dict]:
+    """Return the rule-based result if it is confident enough to skip the model."""
+    result = classify_evidence(bundle)
+    if result and result["likely_trigger"]["confidence"] >= min_confidence:
+        return result
+    return None
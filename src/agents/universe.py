@@ -0,0 +1,138 @@
+"""
+Symbol Universe
+
+Canonical index of tradable assets built from Binance tickers and
+CoinMarketCap listings. Detection resolves every exchange-native symbol
+through it, so the same asset seen on both sources merges exactly, and
+drops assets below the liquidity floors before anything is investigated.
+"""
+
+import os
+import re
+from typing import Optional
+
+# Liquidity floors in USD (0 disables a floor)
+MIN_VOLUME_USD = float(os.environ.get("UNIVERSE_MIN_VOLUME_USD", "500000"))
+MIN_MARKET_CAP_USD = float(os.environ.get("UNIVERSE_MIN_MARKET_CAP_USD", "5000000"))
+
+# Bits of the "exchanges" bitmap
+EXCHANGE_BINANCE = 1
+EXCHANGE_COINMARKETCAP = 2
+
+# Binance lists some low-priced assets per 1000 (or million) units, e.g. 1000SATS
+MULTIPLIER_PREFIX = re.compile(r"^(1000000|1000|1M)([A-Z0-9]+)$")
+
+
+def build_universe(tickers: list[dict], listings: list[dict], quote: str = "USDT") -> list[dict]:
+    """
+    Merge Binance tickers and CMC listings into universe entries.
+
+    CMC symbols are unique by rank: when several coins share a ticker only
+    the highest-ranked one is kept. A Binance base that is not a CMC symbol
+    but is a multiplier form of one (1000SATS -> SATS) becomes an alias.
+    """
+    entries = {}
+    for coin in sorted(listings, key=lambda c: c.get("rank") or float("inf")):
+        if coin["symbol"] in entries:
+            continue
+        entries[coin["symbol"]] = {
+            "symbol": coin["symbol"],
+            "name": coin.get("name"),
+            "quote": None,
+            "binance_pair": None,
+            "cmc_id": coin.get("id"),
+            "cmc_slug": coin.get("slug"),
+            "aliases": [],
+            "market_cap": coin.get("market_cap"),
+            "volume_24h": coin.get("volume_24h"),
+            "exchanges": EXCHANGE_COINMARKETCAP,
+        }
+
+    # Exact matches first, so an alias never claims an asset that trades under its own name
+    for ticker in sorted(tickers, key=lambda t: MULTIPLIER_PREFIX.match(t["symbol"]) is not None):
+        base = ticker["symbol"]
+        key = base
+        match = MULTIPLIER_PREFIX.match(base)
+        if base not in entries and match and match.group(2) in entries \
+                and entries[match.group(2)]["binance_pair"] is None:
+            key = match.group(2)
+
+        entry = entries.get(key)
+        if entry is None:
+            entry = entries[key] = {
+                "symbol": key,
+                "name": None,
+                "quote": None,
+                "binance_pair": None,
+                "cmc_id": None,
+                "cmc_slug": None,
+                "aliases": [],
+                "market_cap": None,
+                "volume_24h": None,
+                "exchanges": 0,
+            }
+        elif entry["binance_pair"] is not None:
+            continue
+
+        entry["quote"] = quote
+        entry["binance_pair"] = ticker["pair"]
+        entry["exchanges"] |= EXCHANGE_BINANCE
+        if key != base:
+            entry["aliases"].append(base)
+        if entry["volume_24h"] is None:
+            entry["volume_24h"] = ticker["quote_volume"]
+
+    return list(entries.values())
+
+
+class SymbolIndex:
+    """
+    In-memory lookup over universe entries.
+
+    An empty index (universe never refreshed) resolves every symbol to
+    itself and only applies the floors to the values a detection carries.
+    """
+
+    def __init__(self, entries: list[dict]):
+        self.entries = {e["symbol"]: e for e in entries}
+        self.aliases = {alias: e["symbol"] for e in entries for alias in e.get("aliases") or []}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, symbol: str) -> Optional[dict]:
+        return self.entries.get(symbol)
+
+    def canonical_binance(self, base: str) -> str:
+        """Canonical symbol for a Binance base asset."""
+        return self.aliases.get(base, base)
+
+    def canonical_cmc(self, symbol: str, cmc_id: int = None) -> str:
+        """
+        Canonical symbol for a CMC coin.
+
+        When the ticker belongs to a different, higher-ranked coin in the
+        universe (a ticker collision) it is qualified with the CMC id
+        (PEPE#24478), so the two never merge.
+        """
+        entry = self.entries.get(symbol)
+        if entry and cmc_id and entry["cmc_id"] and entry["cmc_id"] != cmc_id:
+            return f"{symbol}#{cmc_id}"
+        return symbol
+
+    def is_liquid(self, symbol: str, market_cap: float = None, volume_24h: float = None) -> bool:
+        """
+        Check a symbol against the liquidity floors.
+
+        Universe data is preferred; the detection's own values fill in for
+        symbols the universe does not know yet. An unknown market cap does
+        not fail the floor (Binance-only assets have none).
+        """
+        entry = self.entries.get(symbol) or {}
+        market_cap = entry.get("market_cap") or market_cap
+        volume_24h = entry.get("volume_24h") or volume_24h
+        if MIN_VOLUME_USD and (volume_24h or 0.0) < MIN_VOLUME_USD:
+            return False
+        if MIN_MARKET_CAP_USD and market_cap is not None and market_cap < MIN_MARKET_CAP_USD:
+            return False
+        return True
@@ -0,0 +1,128 @@
+"""
+Binance market data collector.
+
+Fetches spot tickers straight from the public Binance REST API.
+"""
+
+import asyncio
+import json
+import os
+from typing import Optional
+
+from .http import get_json
+
+BINANCE_API_URL = os.environ.get("BINANCE_API_URL", "https://api.binance.com")
+QUOTE_ASSET = "USDT"
+
+# /api/v3/ticker accepts at most 100 symbols per request
+WINDOW_BATCH_SIZE = 100
+
+
+def _normalize_ticker(ticker: dict, quote: str = QUOTE_ASSET) -> dict:
+    """Convert a raw Binance ticker into the collector ticker format."""
+    pair = ticker["symbol"]
+    return {
+        "symbol": pair[:-len(quote)],
+        "pair": pair,
+        "price": float(ticker["lastPrice"]),
+        "price_change_pct": float(ticker["priceChangePercent"]),
+        "volume": float(ticker["volume"]),
+        "quote_volume": float(ticker["quoteVolume"]),
+        "open_price": float(ticker["openPrice"]),
+    }
+
+
+def window_size(time_window_minutes: int) -> Optional[str]:
+    """Map a window in minutes to a Binance rolling windowSize, if supported."""
+    if time_window_minutes < 60:
+        return f"{time_window_minutes}m"
+    if time_window_minutes % 1440 == 0 and time_window_minutes <= 7 * 1440:
+        return f"{time_window_minutes // 1440}d"
+    if time_window_minutes % 60 == 0 and time_window_minutes < 1440:
+        return f"{time_window_minutes // 60}h"
+    return None
+
+
+async def fetch_tickers(quote: str = QUOTE_ASSET) -> list[dict]:
+    """Fetch 24h tickers for every trading pair quoted in `quote`."""
+    data = await get_json(f"{BINANCE_API_URL}/api/v3/ticker/24hr")
+    if not data:
+        return []
+
+    return [
+        _normalize_ticker(t, quote) for t in data
+        if t["symbol"].endswith(quote) and float(t.get("lastPrice") or 0) > 0
+    ]
+
+
+async def fetch_ticker(symbol: str, quote: str = QUOTE_ASSET) -> Optional[dict]:
+    """Fetch the 24h ticker for a single base asset."""
+    data = await get_json(
+        f"{BINANCE_API_URL}/api/v3/ticker/24hr",
+        params={"symbol": f"{symbol.upper()}{quote}"}
+    )
+    return _normalize_ticker(data, quote) if data else None
+
+
+async def fetch_window_tickers(pairs: list[str], time_window_minutes: int,
+                               quote: str = QUOTE_ASSET) -> list[dict]:
+    """
+    Fetch rolling-window tickers for many pairs concurrently.
+
+    Pairs are split into batches of WINDOW_BATCH_SIZE and all batches are
+    requested at once over the shared connection pool.
+    """
+    size = window_size(time_window_minutes)
+    if size is None:
+        return []
+
+    async def fetch_batch(batch: list[str]) -> list[dict]:
+        data = await get_json(
+            f"{BINANCE_API_URL}/api/v3/ticker",
+            params={"symbols": json.dumps(batch, separators=(",", ":")), "windowSize": size}
+        )
+        return [_normalize_ticker(t, quote) for t in data or []]
+
+    batches = [pairs[i:i + WINDOW_BATCH_SIZE] for i in range(0, len(pairs), WINDOW_BATCH_SIZE)]
+    results = await asyncio.gather(*(fetch_batch(b) for b in batches))
+    return [ticker for batch in results for ticker in batch]
+
+
+def kline_interval(time_window_minutes: int) -> tuple[str, int]:
+    """Pick a kline interval and candle count that cover the window."""
+    if time_window_minutes <= 120:
+        return "1m", time_window_minutes
+    if time_window_minutes <= 1440:
+        return "15m", time_window_minutes // 15
+    return "1h", min(time_window_minutes // 60, 1000)
+
+
+async def fetch_klines(symbol: str, interval: str, limit: int,
+                       quote: str = QUOTE_ASSET, start_time: int = None) -> list[dict]:
+    """Fetch klines (candles) for a base asset, most recent unless start_time (ms) is given."""
+    params = {"symbol": f"{symbol.upper()}{quote}", "interval": interval, "limit": limit}
+    if start_time is not None:
+        params["startTime"] = start_time
+    data = await get_json(f"{BINANCE_API_URL}/api/v3/klines", params=params)
+    return [
+        {
+            "open_time": k[0],
+            "open": float(k[1]),
+            "high": float(k[2]),
+            "low": float(k[3]),
+            "close": float(k[4]),
+            "volume": float(k[5]),
+            "quote_volume": float(k[7]),
+        }
+        for k in data or []
+    ]
+
+
+async def fetch_closes(symbols: list[str], time_window_minutes: int) -> dict[str, list[float]]:
+    """Fetch close price series over the window for many symbols concurrently."""
+    interval, limit = kline_interval(time_window_minutes)
+    results = await asyncio.gather(*(fetch_klines(s, interval, limit + 1) for s in symbols))
+    return {
+        symbol: [k["close"] for k in klines]
+        for symbol, klines in zip(symbols, results) if klines
+    }
@@ -0,0 +1,102 @@
+"""
+CoinMarketCap data collector.
+
+Uses the CoinMarketCap Pro API. Requires COINMARKETCAP_API_KEY; without it
+every call returns an empty result.
+"""
+
+import os
+from typing import Optional
+
+from .http import get_json
+
+CMC_API_URL = os.environ.get("COINMARKETCAP_API_URL", "https://pro-api.coinmarketcap.com")
+CMC_API_KEY = os.environ.get("COINMARKETCAP_API_KEY", "")
+
+
+# Windows (minutes) CMC reports percent changes for
+CHANGE_FIELDS = {
+    60: "percent_change_1h",
+    1440: "percent_change_24h",
+    10080: "percent_change_7d",
+}
+
+
+def _change_field(time_window_minutes: int) -> str:
+    """Pick the CMC percent change field closest to the detection window."""
+    for window, field in CHANGE_FIELDS.items():
+        if time_window_minutes <= window:
+            return field
+    return CHANGE_FIELDS[10080]
+
+
+def _normalize_coin(coin: dict, change_field: str = "percent_change_24h") -> dict:
+    """Convert a raw CMC listing into the collector coin format."""
+    quote = coin.get("quote", {}).get("USD", {})
+    return {
+        "symbol": coin["symbol"],
+        "id": coin.get("id"),
+        "rank": coin.get("cmc_rank"),
+        "name": coin.get("name"),
+        "slug": coin.get("slug"),
+        "price": quote.get("price"),
+        "price_change_pct": quote.get(change_field),
+        "market_cap": quote.get("market_cap"),
+        "volume_24h": quote.get("volume_24h"),
+        "volume_change_pct": quote.get("volume_change_24h"),
+        "tags": coin.get("tags") or [],
+    }
+
+
+async def fetch_gainers(time_window_minutes: int = 60, limit: int = 200) -> list[dict]:
+    """Fetch the top gainers for the window, sorted by percent change."""
+    if not CMC_API_KEY:
+        return []
+
+    field = _change_field(time_window_minutes)
+    data = await get_json(
+        f"{CMC_API_URL}/v1/cryptocurrency/listings/latest",
+        params={"sort": field, "sort_dir": "desc", "limit": limit, "convert": "USD"},
+        headers={"X-CMC_PRO_API_KEY": CMC_API_KEY}
+    )
+    if not data:
+        return []
+
+    return [_normalize_coin(c, field) for c in data.get("data", [])]
+
+
+async def fetch_listings(limit: int = 1000) -> list[dict]:
+    """Fetch the top coins by market cap (one credit per 200 coins)."""
+    if not CMC_API_KEY:
+        return []
+
+    data = await get_json(
+        f"{CMC_API_URL}/v1/cryptocurrency/listings/latest",
+        params={"sort": "market_cap", "sort_dir": "desc", "limit": limit, "convert": "USD"},
+        headers={"X-CMC_PRO_API_KEY": CMC_API_KEY}
+    )
+    if not data:
+        return []
+
+    return [_normalize_coin(c) for c in data.get("data", [])]
+
+
+async def fetch_quote(symbol: str) -> Optional[dict]:
+    """Fetch the latest quote for a symbol (highest-ranked match)."""
+    if not CMC_API_KEY:
+        return None
+
+    data = await get_json(
+        f"{CMC_API_URL}/v2/cryptocurrency/quotes/latest",
+        params={"symbol": symbol.upper(), "convert": "USD"},
+        headers={"X-CMC_PRO_API_KEY": CMC_API_KEY}
+    )
+    if not data:
+        return None
+
+    matches = data.get("data", {}).get(symbol.upper()) or []
+    if not matches:
+        return None
+
+    best = min(matches, key=lambda c: c.get("cmc_rank") or float("inf"))
+    return _normalize_coin(best)
@@ -0,0 +1,77 @@
+"""
+Evidence bundle assembly.
+
+Runs every collector for a pump concurrently and packs the results into a
+single bundle that is handed to the model for analysis.
+"""
+
+import asyncio
+import json
+from datetime import datetime
+
+from . import binance, coinmarketcap, reddit, web_search
+
+
+def search_query(pump: dict) -> str:
+    """Build the social/news search query for a pump."""
+    # A CMC coin kept under a qualified symbol (PEPE#24478) is still talked about by its ticker
+    symbol = (pump.get("ticker") or pump["symbol"]).upper()
+    name = pump.get("name")
+    if name and name.upper() != symbol:
+        return f'"{name}" OR "${symbol}"'
+    return f'"${symbol}" OR "{symbol} crypto"'
+
+
+async def gather_evidence(pump: dict) -> dict:
+    """Collect market context and social/news evidence for one pump."""
+    symbol = pump["symbol"].upper()
+    query = search_query(pump)
+
+    sources = {
+        "binance": binance.fetch_ticker(pump.get("binance_symbol") or symbol),
+        "coinmarketcap": coinmarketcap.fetch_quote(symbol),
+        "reddit": reddit.search_posts(query),
+        "web": web_search.search_news(query),
+    }
+    results = await asyncio.gather(*sources.values(), return_exceptions=True)
+
+    bundle = {
+        "symbol": symbol,
+        "pump": pump,
+        "market": {},
+        "items": {},
+        "errors": {},
+        "gathered_at": datetime.utcnow().isoformat(),
+    }
+    for name, result in zip(sources, results):
+        if isinstance(result, Exception):
+            bundle["errors"][name] = str(result)
+        elif name in ("binance", "coinmarketcap"):
+            bundle["market"][name] = result
+        else:
+            bundle["items"][name] = result
+
+    return bundle
+
+
+def format_bundle(bundle: dict, max_items_per_source: int = 25) -> str:
+    """Render an evidence bundle as compact JSON for the analysis prompt."""
+    items = {}
+    for source, source_items in bundle["items"].items():
+        items[source] = [
+            {
+                "url": item.get("source_url"),
+                "title": item.get("title"),
+                "content": (item.get("content") or "")[:500],
+                "published_at": item.get("published_at"),
+                "relevance": item.get("relevance"),
+                "metadata": item.get("metadata", {}),
+            }
+            for item in source_items[:max_items_per_source]
+        ]
+
+    return json.dumps({
+        "market": bundle["market"],
+        "evidence": items,
+        "unavailable_sources": sorted(bundle["errors"]),
+    }, indent=1, default=str)
@@ -0,0 +1,67 @@
+"""
+Shared HTTP client pool for the collectors.
+
+All collectors borrow the same pooled httpx.AsyncClient so concurrent
+requests reuse keep-alive connections instead of opening a new socket per
+call. The client is bound to the running event loop and must be closed with
+close_client() before that loop shuts down.
+"""
+
+import asyncio
+from typing import Optional
+
+import httpx
+
+DEFAULT_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+DEFAULT_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+USER_AGENT = "pump-researcher/1.0"
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# Optional transport override, e.g. httpx.MockTransport serving recorded fixtures
+_transport: Optional[httpx.AsyncBaseTransport] = None
+
+
+def set_transport(transport: Optional[httpx.AsyncBaseTransport]):
+    """Route all collector traffic through a custom transport (None to reset)."""
+    global _transport
+    _transport = transport
+
+
+def get_client() -> httpx.AsyncClient:
+    """Get the pooled client for the running event loop, creating it if needed."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            timeout=DEFAULT_TIMEOUT,
+            limits=DEFAULT_LIMITS,
+            headers={"User-Agent": USER_AGENT},
+            follow_redirects=True,
+            transport=_transport,
+        )
+        _client_loop = loop
+
+    return _client
+
+
+async def close_client():
+    """Close the pooled client if it belongs to the running event loop."""
+    global _client, _client_loop
+    if _client is not None and _client_loop is asyncio.get_running_loop():
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
+
+async def get_json(url: str, **kwargs):
+    """GET a URL and decode JSON, returning None on any HTTP or decode error."""
+    try:
+        response = await get_client().get(url, **kwargs)
+        response.raise_for_status()
+        return response.json()
+    except (httpx.HTTPError, ValueError) as e:
+        print(f"Error fetching {url}: {e}")
+        return None
@@ -0,0 +1,149 @@
+"""
+Local relevance ranking for evidence items.
+
+Scores candidate posts/articles with BM25 against the pump's symbol and
+aliases, weights them by recency relative to the pump window, and keeps
+only the top-K items per source so the analysis prompt stays small.
+"""
+
+import math
+import os
+import re
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+TOP_K_PER_SOURCE = int(os.environ.get("EVIDENCE_TOP_K", "10"))
+HALF_LIFE_HOURS = float(os.environ.get("EVIDENCE_HALF_LIFE_HOURS", "6"))
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Weight for items without a publish date
+UNDATED_WEIGHT = 0.5
+# Weight for items published after the pump was detected
+LATE_WEIGHT = 0.7
+# Extra score for explicit cashtags ($SYMBOL), which rarely collide
+CASHTAG_BOOST = 1.5
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def query_terms(symbol: str, aliases: Iterable[str] = ()) -> set[str]:
+    """Build the set of query tokens for a symbol and its aliases."""
+    terms = {symbol.lower()}
+    for alias in aliases:
+        if alias:
+            terms.update(TOKEN_RE.findall(alias.lower()))
+    return terms
+
+
+def _parse_time(value) -> Optional[datetime]:
+    """Parse an ISO timestamp into an aware UTC datetime."""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def recency_weight(published_at, pump_time: datetime, window_minutes: int,
+                   half_life_hours: float = HALF_LIFE_HOURS) -> float:
+    """
+    Weight an item by when it was published relative to the pump.
+
+    Items inside the pump window get full weight, older items decay
+    exponentially with the given half-life, and items published after
+    detection are discounted since they more likely react to the move.
+    """
+    published = _parse_time(published_at)
+    if published is None:
+        return UNDATED_WEIGHT
+    if published > pump_time:
+        return LATE_WEIGHT
+
+    window_start = pump_time - timedelta(minutes=window_minutes)
+    if published >= window_start:
+        return 1.0
+
+    age_hours = (window_start - published).total_seconds() / 3600
+    return 0.5 ** (age_hours / half_life_hours)
+
+
+def score_items(items: list[dict], terms: set[str], symbol: str) -> list[float]:
+    """Score items with BM25 over title + content against the query terms."""
+    cashtag = f"${symbol.lower()}"
+    doc_lengths = []
+    term_counts = []
+    cashtags = []
+
+    for item in items:
+        text = f"{item.get('title') or ''} {item.get('content') or ''}".lower()
+        tokens = TOKEN_RE.findall(text)
+        doc_lengths.append(len(tokens))
+        term_counts.append(Counter(t for t in tokens if t in terms))
+        cashtags.append(cashtag in text)
+
+    n_docs = len(items)
+    if n_docs == 0:
+        return []
+
+    avg_length = (sum(doc_lengths) / n_docs) or 1.0
+    doc_freq = Counter(term for counts in term_counts for term in counts)
+    idf = {
+        term: math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+        for term, df in doc_freq.items()
+    }
+
+    scores = []
+    for length, counts, has_cashtag in zip(doc_lengths, term_counts, cashtags):
+        norm = K1 * (1 - B + B * length / avg_length)
+        score = sum(idf[t] * tf * (K1 + 1) / (tf + norm) for t, tf in counts.items())
+        if has_cashtag and score > 0:
+            score += CASHTAG_BOOST
+        scores.append(score)
+    return scores
+
+
+def rank_bundle(bundle: dict, top_k: int = TOP_K_PER_SOURCE,
+                aliases: Iterable[str] = ()) -> dict:
+    """
+    Keep the top-K most relevant items per source in an evidence bundle.
+
+    Items that never mention the symbol or an alias are dropped. Each kept
+    item gets a "relevance" score; the bundle is modified in place and
+    returned.
+    """
+    pump = bundle["pump"]
+    symbol = bundle["symbol"]
+    terms = query_terms(symbol, [pump.get("name") or "", *aliases])
+    pump_time = _parse_time(pump.get("detected_at") or bundle["gathered_at"])
+    window = pump.get("time_window_minutes", 60)
+
+    sources = list(bundle["items"])
+    bundle["candidate_counts"] = {s: len(bundle["items"][s]) for s in sources}
+    candidates = [(s, item) for s in sources for item in bundle["items"][s]]
+    scores = score_items([item for _, item in candidates], terms, symbol)
+
+    ranked = {s: [] for s in sources}
+    for (source, item), score in zip(candidates, scores):
+        if score <= 0:
+            continue
+        weighted = score * recency_weight(item.get("published_at"), pump_time, window)
+        ranked[source].append((weighted, item))
+
+    for source, scored in ranked.items():
+        scored.sort(key=lambda pair: pair[0], reverse=True)
+        bundle["items"][source] = [
+            {**item, "relevance": round(score, 3)} for score, item in scored[:top_k]
+        ]
+
+    return bundle
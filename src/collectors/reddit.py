@@ -0,0 +1,81 @@
+"""
+Reddit search collector.
+
+Uses app-only OAuth when REDDIT_CLIENT_ID/REDDIT_CLIENT_SECRET are set and
+falls back to the public JSON endpoint otherwise.
+"""
+
+import os
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+import httpx
+
+from .http import get_client, get_json
+
+REDDIT_CLIENT_ID = os.environ.get("REDDIT_CLIENT_ID", "")
+REDDIT_CLIENT_SECRET = os.environ.get("REDDIT_CLIENT_SECRET", "")
+
+_token: dict = {"value": None, "expires_at": 0.0}
+
+
+async def _get_token() -> Optional[str]:
+    """Get a cached app-only OAuth token, refreshing it shortly before expiry."""
+    if not (REDDIT_CLIENT_ID and REDDIT_CLIENT_SECRET):
+        return None
+    if _token["value"] and time.time() < _token["expires_at"] - 60:
+        return _token["value"]
+
+    try:
+        response = await get_client().post(
+            "https://www.reddit.com/api/v1/access_token",
+            data={"grant_type": "client_credentials"},
+            auth=(REDDIT_CLIENT_ID, REDDIT_CLIENT_SECRET)
+        )
+        response.raise_for_status()
+        payload = response.json()
+    except (httpx.HTTPError, ValueError) as e:
+        print(f"Error fetching Reddit token: {e}")
+        return None
+
+    _token["value"] = payload["access_token"]
+    _token["expires_at"] = time.time() + payload.get("expires_in", 3600)
+    return _token["value"]
+
+
+def _normalize_post(post: dict) -> dict:
+    """Convert a raw Reddit listing child into an evidence item."""
+    created = datetime.fromtimestamp(post.get("created_utc", 0), tz=timezone.utc)
+    return {
+        "source_type": "reddit",
+        "source_url": f"https://www.reddit.com{post.get('permalink', '')}",
+        "title": post.get("title", ""),
+        "content": post.get("selftext", "")[:2000],
+        "published_at": created.isoformat(),
+        "metadata": {
+            "subreddit": post.get("subreddit"),
+            "score": post.get("score", 0),
+            "num_comments": post.get("num_comments", 0),
+        },
+    }
+
+
+async def search_posts(query: str, time_filter: str = "day", limit: int = 100) -> list[dict]:
+    """Search all of Reddit for recent posts matching `query`."""
+    params = {"q": query, "sort": "new", "t": time_filter, "limit": limit, "type": "link"}
+
+    token = await _get_token()
+    if token:
+        data = await get_json(
+            "https://oauth.reddit.com/search",
+            params=params,
+            headers={"Authorization": f"Bearer {token}"}
+        )
+    else:
+        data = await get_json("https://www.reddit.com/search.json", params=params)
+
+    if not data:
+        return []
+
+    return [_normalize_post(child["data"]) for child in data.get("data", {}).get("children", [])]
@@ -0,0 +1,56 @@
+"""
+Web news search collector.
+
+Queries the Google News RSS search feed, which needs no API key.
+"""
+
+import xml.etree.ElementTree as ET
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+from .http import get_client
+
+NEWS_SEARCH_URL = "https://news.google.com/rss/search"
+
+
+def parse_feed(xml_text: str) -> list[dict]:
+    """Parse an RSS feed into evidence items."""
+    try:
+        root = ET.fromstring(xml_text)
+    except ET.ParseError as e:
+        print(f"Error parsing news feed: {e}")
+        return []
+
+    items = []
+    for item in root.iter("item"):
+        published = item.findtext("pubDate")
+        try:
+            published_at = parsedate_to_datetime(published).isoformat() if published else None
+        except (TypeError, ValueError):
+            published_at = None
+
+        items.append({
+            "source_type": "web",
+            "source_url": item.findtext("link"),
+            "title": item.findtext("title", ""),
+            "content": item.findtext("description", ""),
+            "published_at": published_at,
+            "metadata": {"publisher": item.findtext("source")},
+        })
+    return items
+
+
+async def search_news(query: str, when: str = "1d") -> list[dict]:
+    """Search recent news articles matching `query`."""
+    try:
+        response = await get_client().get(
+            NEWS_SEARCH_URL,
+            params={"q": f"{query} when:{when}", "hl": "en-US", "gl": "US", "ceid": "US:en"}
+        )
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        print(f"Error searching news for {query}: {e}")
+        return []
+
+    return parse_feed(response.text)
@@ -2,11 +2,13 @@
 Flask web interface for viewing pump research results.
 """
 
+import json
 import os
 import re
 from datetime import datetime
 
-from flask import Flask, render_template_string, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request
+from sqlalchemy import case, func
 
 app = Flask(__name__)
 
@@ -16,15 +18,28 @@ app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URL
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
 # Initialize SQLAlchemy
-from .models import db, Pump, Finding, NewsTrigger, AgentRun
+from .models import db, Pump, Finding, NewsTrigger, AgentRun, PumpOutcome, SymbolSummary, run_migrations
+from .models import seed_table_versions
+from .read_model import load_symbol_documents, pump_documents, rebuild_symbol_summaries
+from .caching import run_logs_response, versioned
+from .export import EXPORT_FORMATS, parquet_available, stream_export
 db.init_app(app)
 
-# Create tables on startup
+# Create tables and apply column migrations on startup
 with app.app_context():
     db.create_all()
+    run_migrations(db.engine)
+    seed_table_versions(db.session)
+    # First start with the read model: build it from existing pumps
+    if db.session.query(SymbolSummary).first() is None and db.session.query(Pump).first() is not None:
+        rebuild_symbol_summaries(db.session)
 
 # Celery task import
-from src.worker.tasks import run_pump_agent
+from src.worker.tasks import queue_agent_run, run_pump_agent
+from src.worker.usage import usage_today
+from src.worker.log_archive import LogArchiveUnavailable, iter_run_log_lines
+from src.agents.prioritizer import DAILY_COST_BUDGET_USD, DAILY_TOKEN_BUDGET
+from src.agents.pump_detector import window_label
 
 HTML_TEMPLATE = """
 <!DOCTYPE html>
@@ -81,6 +96,9 @@ HTML_TEMPLATE = """
             border-radius: 4px;
         }
         .change.positive { background: #238636; color: #fff; }
+        .outcome { font-size: 0.85em; margin-left: 10px; }
+        .outcome.up { color: #3fb950; }
+        .outcome.down { color: #f85149; }
         .trigger {
             background: #21262d;
             padding: 15px;
@@ -296,6 +314,33 @@ HTML_TEMPLATE = """
             </div>
         </div>
 
+        {% if stats.outcomes %}
+        <div class="card">
+            <table>
+                <thead>
+                    <tr>
+                        <th>After detection</th>
+                        <th>Checked</th>
+                        <th>Avg return</th>
+                        <th>Continued (&gt;0%)</th>
+                        <th>Retraced (&ge;50% of move)</th>
+                    </tr>
+                </thead>
+                <tbody>
+                    {% for outcome in stats.outcomes %}
+                    <tr>
+                        <td>+{{ outcome.horizon }}</td>
+                        <td>{{ outcome.count }}</td>
+                        <td>{{ "%+.1f"|format(outcome.avg_return) }}%</td>
+                        <td>{{ "%.0f"|format(outcome.continuation_rate * 100) }}%</td>
+                        <td>{{ "%.0f"|format(outcome.retrace_rate * 100) }}%</td>
+                    </tr>
+                    {% endfor %}
+                </tbody>
+            </table>
+        </div>
+        {% endif %}
+
         <div class="tabs">
             <a href="/" class="tab {{ 'active' if tab == 'pumps' else '' }}">Pumps</a>
             <a href="/runs" class="tab {{ 'active' if tab == 'runs' else '' }}">Agent Runs</a>
@@ -304,7 +349,8 @@ HTML_TEMPLATE = """
         {% if tab == 'pumps' %}
             {% if pump_groups %}
                 {% for group in pump_groups %}
-                <div class="card pump-group" data-symbol="{{ group.symbol }}">
+                {% set pump = group.pumps[0] %}
+                <div class="card pump-group" data-symbol="{{ group.symbol }}" data-count="{{ group.count }}">
                     <div class="pump-header">
                         <div>
                             <span class="symbol">{{ group.symbol }}</span>
@@ -318,11 +364,15 @@ HTML_TEMPLATE = """
                         </div>
                     </div>
 
-                    {% for pump in group.pumps %}
-                    <div class="pump-instance" id="pump-{{ group.symbol }}-{{ loop.index0 }}" {% if not loop.first %}style="display:none"{% endif %}>
+                    <!-- Latest pump only; older ones and all findings are fetched on demand -->
+                    <div id="pump-{{ group.symbol }}">
+                    <div class="pump-instance">
                         <div class="pump-meta">
                             <span class="timestamp">{{ pump.detected_at }}</span>
                             <span class="change positive">+{{ "%.1f"|format(pump.price_change_pct) }}%</span>
+                            {% for outcome in pump.outcomes %}
+                            <span class="outcome {{ 'up' if outcome.return_pct > 0 else 'down' }}">+{{ outcome.label }}: {{ "%+.1f"|format(outcome.return_pct) }}%</span>
+                            {% endfor %}
                         </div>
 
                         {% if pump.trigger %}
@@ -335,25 +385,15 @@ HTML_TEMPLATE = """
                         </div>
                         {% endif %}
 
-                        {% if pump.findings %}
-                        <div class="findings">
-                            <strong>Findings ({{ pump.findings|length }})</strong>
-                            {% for finding in pump.findings[:5] %}
-                            <div class="finding">
-                                <div class="finding-source">{{ finding.source_type }}</div>
-                                <div>{{ finding.content[:200] }}{% if finding.content|length > 200 %}...{% endif %}</div>
-                                {% if finding.source_url %}
-                                <a href="{{ finding.source_url }}" target="_blank">View source</a>
-                                {% endif %}
-                            </div>
-                            {% endfor %}
-                            {% if pump.findings|length > 5 %}
-                            <div class="timestamp">... and {{ pump.findings|length - 5 }} more</div>
-                            {% endif %}
+                        {% if pump.findings_count %}
+                        <div class="findings" data-pump="{{ pump.id }}">
+                            <strong>Findings ({{ pump.findings_count }})</strong>
+                            <div class="finding-list"></div>
+                            <button class="nav-btn" onclick="loadFindings(this)">Show findings</button>
                         </div>
                         {% endif %}
                     </div>
-                    {% endfor %}
+                    </div>
                 </div>
                 {% endfor %}
             {% else %}
@@ -363,6 +403,24 @@ HTML_TEMPLATE = """
                 </div>
             {% endif %}
         {% elif tab == 'runs' %}
+            <div class="card">
+                <table>
+                    <thead>
+                        <tr>
+                            <th>Today (UTC)</th>
+                            <th>Tokens</th>
+                            <th>Cost</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+                        <tr>
+                            <td>Model usage</td>
+                            <td>{{ "{:,}".format(budget.tokens) }}{% if budget.token_limit %} / {{ "{:,}".format(budget.token_limit) }}{% endif %}</td>
+                            <td>${{ "%.2f"|format(budget.cost) }}{% if budget.cost_limit %} / ${{ "%.2f"|format(budget.cost_limit) }}{% endif %}</td>
+                        </tr>
+                    </tbody>
+                </table>
+            </div>
             <div class="card">
                 <table>
                     <thead>
@@ -371,6 +429,8 @@ HTML_TEMPLATE = """
                             <th>Status</th>
                             <th>Pumps</th>
                             <th>Findings</th>
+                            <th>Tokens</th>
+                            <th>Cost</th>
                             <th>Duration</th>
                             <th>Logs</th>
                         </tr>
@@ -382,13 +442,15 @@ HTML_TEMPLATE = """
                             <td>{{ run.status }}</td>
                             <td>{{ run.pumps_detected }}</td>
                             <td>{{ run.findings_count }}</td>
+                            <td>{{ "{:,}".format(run.tokens_used) if run.tokens_used else '-' }}</td>
+                            <td>{{ "$%.2f"|format(run.cost_usd) if run.cost_usd else '-' }}</td>
                             <td>{{ run.duration or '-' }}</td>
                             <td><button class="view-logs-btn" onclick="viewRunLogs({{ run.id }})">View</button></td>
                         </tr>
                         {% endfor %}
                         {% if not runs %}
                         <tr>
-                            <td colspan="6" style="text-align: center; color: #8b949e;">No runs yet</td>
+                            <td colspan="8" style="text-align: center; color: #8b949e;">No runs yet</td>
                         </tr>
                         {% endif %}
                     </tbody>
@@ -404,13 +466,112 @@ HTML_TEMPLATE = """
         // Track current pump index for each symbol
         const pumpIndices = {};
 
+        // Pumps fetched per symbol (by index, newest first), a page at a time
+        const PUMPS_PAGE_SIZE = 10;
+        const FINDINGS_PAGE_SIZE = 5;
+        const pumpCache = {};
+
         function getPumpCount(symbol) {
             const card = document.querySelector('[data-symbol="' + symbol + '"]');
             if (!card) return 0;
-            return card.querySelectorAll('.pump-instance').length;
+            return parseInt(card.dataset.count, 10);
+        }
+
+        async function fetchPump(symbol, index) {
+            const cache = pumpCache[symbol] = pumpCache[symbol] || {};
+            if (!(index in cache)) {
+                const page = Math.floor(index / PUMPS_PAGE_SIZE) + 1;
+                const response = await fetch('/api/symbols/' + encodeURIComponent(symbol) +
+                    '/pumps?page=' + page + '&per_page=' + PUMPS_PAGE_SIZE);
+                const data = await response.json();
+                data.pumps.forEach((pump, i) => { cache[(page - 1) * PUMPS_PAGE_SIZE + i] = pump; });
+            }
+            return cache[index];
+        }
+
+        function createElement(tag, className, text) {
+            const el = document.createElement(tag);
+            if (className) el.className = className;
+            if (text !== undefined) el.textContent = text;
+            return el;
+        }
+
+        function renderPump(pump) {
+            const div = createElement('div', 'pump-instance');
+
+            const meta = createElement('div', 'pump-meta');
+            meta.appendChild(createElement('span', 'timestamp', pump.detected_at));
+            meta.appendChild(createElement('span', 'change positive', '+' + pump.price_change_pct.toFixed(1) + '%'));
+            pump.outcomes.forEach(outcome => {
+                const sign = outcome.return_pct >= 0 ? '+' : '';
+                meta.appendChild(createElement('span', 'outcome ' + (outcome.return_pct > 0 ? 'up' : 'down'),
+                    '+' + outcome.label + ': ' + sign + outcome.return_pct.toFixed(1) + '%'));
+            });
+            div.appendChild(meta);
+
+            if (pump.trigger) {
+                const trigger = createElement('div', 'trigger');
+                const confidence = pump.trigger.confidence;
+                trigger.appendChild(createElement('div', 'trigger-type', pump.trigger.trigger_type.replace(/_/g, ' ')));
+                trigger.appendChild(createElement('div', null, pump.trigger.description || ''));
+                trigger.appendChild(createElement('span',
+                    'confidence ' + (confidence > 0.7 ? 'high' : confidence > 0.4 ? 'medium' : 'low'),
+                    Math.round(confidence * 100) + '% confidence'));
+                div.appendChild(trigger);
+            }
+
+            if (pump.findings_count > 0) {
+                const findings = createElement('div', 'findings');
+                findings.dataset.pump = pump.id;
+                findings.appendChild(createElement('strong', null, 'Findings (' + pump.findings_count + ')'));
+                findings.appendChild(createElement('div', 'finding-list'));
+                const button = createElement('button', 'nav-btn', 'Show findings');
+                button.onclick = function() { loadFindings(this); };
+                findings.appendChild(button);
+                div.appendChild(findings);
+            }
+            return div;
+        }
+
+        function renderFinding(finding) {
+            const div = createElement('div', 'finding');
+            div.appendChild(createElement('div', 'finding-source', finding.source_type));
+            const content = finding.content || '';
+            div.appendChild(createElement('div', null, content.length > 200 ? content.slice(0, 200) + '...' : content));
+            if (finding.source_url) {
+                const link = createElement('a', null, 'View source');
+                link.href = finding.source_url;
+                link.target = '_blank';
+                div.appendChild(link);
+            }
+            return div;
+        }
+
+        async function loadFindings(button) {
+            const block = button.closest('.findings');
+            const list = block.querySelector('.finding-list');
+            const page = parseInt(block.dataset.page || '0', 10) + 1;
+            button.disabled = true;
+            try {
+                const response = await fetch('/api/pumps/' + block.dataset.pump +
+                    '/findings?page=' + page + '&per_page=' + FINDINGS_PAGE_SIZE);
+                const data = await response.json();
+                data.findings.forEach(finding => list.appendChild(renderFinding(finding)));
+                block.dataset.page = page;
+                const remaining = data.total - list.children.length;
+                if (remaining > 0 && data.findings.length > 0) {
+                    button.textContent = '... and ' + remaining + ' more';
+                    button.disabled = false;
+                } else {
+                    button.remove();
+                }
+            } catch (e) {
+                button.textContent = 'Error loading findings';
+                button.disabled = false;
+            }
         }
 
-        function showPump(symbol, index) {
+        async function showPump(symbol, index) {
             const count = getPumpCount(symbol);
             if (count === 0) return;
 
@@ -420,11 +581,15 @@ HTML_TEMPLATE = """
 
             pumpIndices[symbol] = index;
 
-            // Hide all, show selected
-            for (let i = 0; i < count; i++) {
-                const el = document.getElementById('pump-' + symbol + '-' + i);
-                if (el) el.style.display = i === index ? 'block' : 'none';
+            let pump;
+            try {
+                pump = await fetchPump(symbol, index);
+            } catch (e) {
+                return;
             }
+            // Ignore responses overtaken by a later click
+            if (!pump || pumpIndices[symbol] !== index) return;
+            document.getElementById('pump-' + symbol).replaceChildren(renderPump(pump));
 
             // Update counter
             const idxEl = document.getElementById('idx-' + symbol);
@@ -625,60 +790,61 @@ HTML_TEMPLATE = """
 </html>
 """
 
+# Parsed and compiled once instead of on every request
+DASHBOARD_TEMPLATE = app.jinja_env.from_string(HTML_TEMPLATE)
+
+# Tables read by the stats bar shown on every page
+STATS_TABLES = ("pumps", "findings", "news_triggers", "agent_runs", "pump_outcomes")
+
 def get_stats():
     """Get dashboard statistics."""
     return {
         "total_pumps": db.session.query(Pump).count(),
         "total_findings": db.session.query(Finding).count(),
         "total_triggers": db.session.query(NewsTrigger).count(),
-        "total_runs": db.session.query(AgentRun).count()
+        "total_runs": db.session.query(AgentRun).count(),
+        "outcomes": get_outcome_stats()
     }
 
+def get_outcome_stats():
+    """Return and retrace statistics per follow-up horizon."""
+    rows = db.session.query(
+        PumpOutcome.horizon_minutes,
+        func.count(PumpOutcome.id),
+        func.avg(PumpOutcome.return_pct),
+        func.sum(case((PumpOutcome.return_pct > 0, 1), else_=0)),
+        func.sum(case((PumpOutcome.retrace_pct >= 50, 1), else_=0))
+    ).filter(
+        PumpOutcome.status == "done"
+    ).group_by(PumpOutcome.horizon_minutes).order_by(PumpOutcome.horizon_minutes).all()
+
+    return [
+        {
+            "horizon": window_label(horizon),
+            "count": count,
+            "avg_return": avg_return or 0.0,
+            "continuation_rate": (continued or 0) / count,
+            "retrace_rate": (retraced or 0) / count
+        }
+        for horizon, count, avg_return, continued, retraced in rows
+    ]
+
 @app.route("/")
+@versioned("symbol_summaries", *STATS_TABLES)
 def index():
     """Show pumps grouped by symbol with their findings and triggers."""
-    grouped_pumps = {}
-
-    pumps = Pump.query.order_by(Pump.detected_at.desc()).limit(100).all()
-
-    for pump in pumps:
-        pump_data = {
-            "id": pump.id,
-            "symbol": pump.symbol,
-            "price_change_pct": pump.price_change_pct,
-            "detected_at": pump.detected_at,
-            "price_at_detection": pump.price_at_detection,
-            "volume_change_pct": pump.volume_change_pct,
-            "market_cap": pump.market_cap,
-            "trigger": pump.trigger,
-            "findings": pump.findings
-        }
-
-        # Group by symbol
-        symbol = pump.symbol
-        if symbol not in grouped_pumps:
-            grouped_pumps[symbol] = []
-        grouped_pumps[symbol].append(pump_data)
-
-    # Convert to list of groups, sorted by most recent pump
-    pump_groups = []
-    for symbol, pumps_list in grouped_pumps.items():
-        pump_groups.append({
-            "symbol": symbol,
-            "pumps": pumps_list,
-            "count": len(pumps_list),
-            "latest": pumps_list[0]  # Already sorted by detected_at DESC
-        })
-
-    # Sort by latest detection
-    pump_groups.sort(key=lambda x: x["latest"]["detected_at"], reverse=True)
-
-    return render_template_string(HTML_TEMPLATE,
-                                  pump_groups=pump_groups,
-                                  stats=get_stats(),
-                                  tab="pumps")
+    # Pre-shaped per-symbol documents, most recently active first (see read_model);
+    # only each symbol's latest pump is rendered, the rest is fetched on demand
+    pump_groups = load_symbol_documents(db.session)
+
+    return render_template(DASHBOARD_TEMPLATE,
+                           pump_groups=pump_groups,
+                           stats=get_stats(),
+                           tab="pumps")
 
+# Keyed by date as well: today's usage card resets at midnight UTC
 @app.route("/runs")
+@versioned("model_usage", *STATS_TABLES, key=lambda: datetime.utcnow().date())
 def runs():
     """Show agent run history."""
     runs_list = []
@@ -693,33 +859,113 @@ def runs():
             "status": run.status,
             "pumps_detected": run.pumps_detected,
             "findings_count": run.findings_count,
+            "tokens_used": run.tokens_used,
+            "cost_usd": run.cost_usd,
             "duration": "completed" if run.completed_at and run.started_at else None
         }
         runs_list.append(run_data)
 
-    return render_template_string(HTML_TEMPLATE,
-                                  runs=runs_list,
-                                  stats=get_stats(),
-                                  tab="runs")
+    tokens_today, cost_today = usage_today(db.session)
+    budget = {
+        "tokens": tokens_today,
+        "cost": cost_today,
+        "token_limit": DAILY_TOKEN_BUDGET,
+        "cost_limit": DAILY_COST_BUDGET_USD
+    }
+
+    return render_template(DASHBOARD_TEMPLATE,
+                           runs=runs_list,
+                           budget=budget,
+                           stats=get_stats(),
+                           tab="runs")
+
+def page_args(default_per_page: int, max_per_page: int = 100) -> tuple[int, int]:
+    """Page number and page size from the query string, clamped."""
+    page = max(1, request.args.get("page", 1, type=int))
+    per_page = min(max(1, request.args.get("per_page", default_per_page, type=int)), max_per_page)
+    return page, per_page
+
+@app.route("/api/symbols/<symbol>/pumps")
+@versioned("pumps", "news_triggers", "findings", "pump_outcomes")
+def symbol_pumps(symbol):
+    """Paginated pumps of one symbol, newest first, with trigger, outcomes and findings count."""
+    page, per_page = page_args(10)
+    query = Pump.query.filter(Pump.symbol == symbol).order_by(Pump.detected_at.desc(), Pump.id.desc())
+
+    pumps = query.offset((page - 1) * per_page).limit(per_page).all()
+    return jsonify({
+        "symbol": symbol,
+        "page": page,
+        "per_page": per_page,
+        "total": query.count(),
+        "pumps": pump_documents(db.session, pumps, findings_per_pump=0)
+    })
+
+@app.route("/api/pumps/<int:pump_id>/findings")
+@versioned("findings")
+def pump_findings(pump_id):
+    """Paginated findings of one pump, most relevant first."""
+    if db.session.get(Pump, pump_id) is None:
+        return jsonify({"error": "Pump not found"}), 404
+
+    page, per_page = page_args(5)
+    query = Finding.query.filter(Finding.pump_id == pump_id).order_by(
+        Finding.relevance_score.desc(), Finding.id
+    )
+
+    findings = query.offset((page - 1) * per_page).limit(per_page).all()
+    return jsonify({
+        "pump_id": pump_id,
+        "page": page,
+        "per_page": per_page,
+        "total": query.count(),
+        "findings": [
+            {
+                "id": f.id,
+                "source_type": f.source_type,
+                "source_url": f.source_url,
+                "content": f.content or "",
+                "relevance_score": f.relevance_score
+            }
+            for f in findings
+        ]
+    })
+
+@app.route("/api/export/<fmt>")
+def export_data(fmt):
+    """Stream pumps with triggers and findings as NDJSON, CSV or Parquet."""
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"error": f"Unknown format, use one of: {', '.join(EXPORT_FORMATS)}"}), 404
+    if fmt == "parquet" and not parquet_available():
+        return jsonify({"error": "Parquet export needs pyarrow"}), 501
+
+    try:
+        since = datetime.fromisoformat(request.args["since"]) if request.args.get("since") else None
+        until = datetime.fromisoformat(request.args["until"]) if request.args.get("until") else None
+    except ValueError:
+        return jsonify({"error": "since/until must be ISO 8601 timestamps"}), 400
+    symbols = [s for value in request.args.getlist("symbol") for s in value.split(",") if s]
+
+    filename = f"pumps-{datetime.utcnow():%Y%m%d-%H%M%S}.{fmt}"
+    return Response(
+        stream_export(db.engine, fmt, since, until, symbols),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
 
 @app.route("/api/run", methods=["POST"])
 def api_run_agent():
     """Trigger agent run via Celery."""
-    # Check if there's already a running task
-    running = AgentRun.query.filter_by(status="running").first()
-    if running:
-        return jsonify({"running": True, "message": "Agent is already running"})
-
-    # Create agent run record
-    agent_run = AgentRun(status="queued")
-    db.session.add(agent_run)
-    db.session.commit()
-    run_id = agent_run.id
+    # The run record only survives if it gets the run lock
+    queued = queue_agent_run(db.session)
+    if queued.get("skipped"):
+        return jsonify({"running": True, "message": "Agent is already queued or running",
+                        "run_id": queued["running_run_id"]})
 
     # Queue the Celery task
-    run_pump_agent.delay(run_id)
+    run_pump_agent.delay(queued["run_id"])
 
-    return jsonify({"success": True, "message": "Agent queued", "run_id": run_id})
+    return jsonify({"success": True, "message": "Agent queued", "run_id": queued["run_id"]})
 
 @app.route("/api/logs")
 def get_logs():
@@ -728,14 +974,19 @@ def get_logs():
 
     # Get the most recent run
     run = AgentRun.query.order_by(AgentRun.started_at.desc()).first()
-    if not run or not run.logs:
+    if not run:
         return jsonify({"logs": [], "index": 0})
 
-    logs_list = run.logs.split('\n') if run.logs else []
+    try:
+        logs_list = list(iter_run_log_lines(run))
+    except LogArchiveUnavailable as e:
+        print(f"Error reading logs: {e}")
+        return jsonify({"error": "Run logs are unavailable"}), 503
     new_logs = logs_list[from_index:] if from_index < len(logs_list) else []
     return jsonify({"logs": new_logs, "index": len(logs_list)})
 
 @app.route("/api/status")
+@versioned("agent_runs")
 def agent_status():
     """Check if agent is running."""
     running = AgentRun.query.filter(AgentRun.status.in_(["running", "queued"])).first() is not None
@@ -744,13 +995,26 @@ def agent_status():
 @app.route("/api/run/<int:run_id>/logs")
 def get_run_logs(run_id):
     """Get logs for a specific agent run."""
-    run = AgentRun.query.get(run_id)
-
-    if not run:
-        return jsonify({"error": "Run not found"}), 404
-
-    logs = run.logs or ""
-    return jsonify({"logs": logs.split('\n') if logs else []})
+    def render():
+        run = db.session.get(AgentRun, run_id)
+
+        if not run:
+            return jsonify({"error": "Run not found"}), 404
+
+        # Streamed while decompressing, never joined into one string
+        try:
+            lines = iter_run_log_lines(run)
+        except LogArchiveUnavailable as e:
+            print(f"Error reading logs: {e}")
+            return jsonify({"error": "Run logs are unavailable"}), 503
+        def generate():
+            yield '{"logs": ['
+            for i, line in enumerate(lines):
+                yield ("," if i else "") + json.dumps(line)
+            yield ']}'
+        return Response(generate(), mimetype="application/json")
+
+    return run_logs_response(run_id, render)
 
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5000, debug=True)
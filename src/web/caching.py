@@ -0,0 +1,112 @@
+"""
+HTTP caching for the dashboard.
+
+Pages and API responses carry an ETag and Last-Modified derived from the
+change versions (table_versions) of the tables they read, and clients must
+revalidate them. A request whose validators still match is answered with
+304 before any page query or rendering runs. Logs of finished runs never
+change again and are served as immutable.
+"""
+
+import hashlib
+from datetime import timezone
+from functools import wraps
+
+from flask import make_response, request
+
+from src.worker.log_archive import FINISHED_RUN_STATUSES
+
+from .models import AgentRun, TableVersion, db
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+
+def _etag(*parts) -> str:
+    return hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+
+
+def _not_modified(etag: str, last_modified=None) -> bool:
+    """Whether the request's validators match (If-None-Match wins over If-Modified-Since)."""
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        return last_modified.replace(microsecond=0) <= request.if_modified_since
+    return False
+
+
+def _conditional_response(etag: str, last_modified, render):
+    """304 if the client's copy is current, else the rendered response, with validators."""
+    if _not_modified(etag, last_modified):
+        response = make_response("", 304)
+    else:
+        response = make_response(render())
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    return response
+
+
+def table_versions(tables) -> tuple[str, object]:
+    """
+    Current change versions of the given tables.
+
+    Returns:
+        (version string, latest change time as aware UTC datetime or None)
+    """
+    rows = db.session.query(TableVersion.table_name, TableVersion.version, TableVersion.changed_at).filter(
+        TableVersion.table_name.in_(tables)
+    ).order_by(TableVersion.table_name).all()
+    version = ",".join(f"{name}:{number}" for name, number, _ in rows)
+    changed = [changed_at for _, _, changed_at in rows if changed_at]
+    last_modified = max(changed).replace(tzinfo=timezone.utc) if changed else None
+    return version, last_modified
+
+
+def versioned(*tables, key=None):
+    """
+    Serve a view with validators from the versions of the tables it reads.
+
+    key: optional callable adding request-independent state to the ETag
+    (e.g. the current day for daily totals).
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            version, last_modified = table_versions(tables)
+            etag = _etag(request.full_path, version, key() if key else "")
+            response = _conditional_response(etag, last_modified, lambda: view(*args, **kwargs))
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
+
+
+def run_logs_response(run_id: int, render):
+    """
+    Serve a run's logs; immutable once the run has finished and stored them.
+
+    An error (e.g. its cold archive file missing on this host) is never
+    cached, so the logs are served once the file is back.
+
+    render: callable producing the full response (only called on a miss)
+    """
+    logs_stored = (AgentRun.logs.isnot(None) | AgentRun.logs_archive.isnot(None) |
+                   AgentRun.logs_archive_path.isnot(None))
+    run = db.session.query(AgentRun.status, AgentRun.completed_at, logs_stored).filter(
+        AgentRun.id == run_id
+    ).first()
+    if run is None or run[0] not in FINISHED_RUN_STATUSES or not run[2]:
+        return versioned("agent_runs")(render)()
+
+    status, completed_at, _ = run
+    last_modified = completed_at.replace(tzinfo=timezone.utc) if completed_at else None
+    response = _conditional_response(_etag("run-logs", run_id, status, completed_at), last_modified, render)
+    if response.status_code >= 400:
+        del response.headers["ETag"]
+        del response.headers["Last-Modified"]
+        response.cache_control.no_store = True
+        return response
+    response.cache_control.public = True
+    response.cache_control.max_age = IMMUTABLE_MAX_AGE
+    response.cache_control.immutable = True
+    return response
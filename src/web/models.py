@@ -2,6 +2,8 @@
 
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm import Session
 
 db = SQLAlchemy()
 
@@ -18,11 +20,20 @@ class Pump(db.Model):
     volume_change_pct = db.Column(db.Float)
     market_cap = db.Column(db.Float)
     source = db.Column(db.String(50), default="coinmarketcap")
+    detection_profile = db.Column(db.String(20))  # e.g. '5%/1h'
 
     # Relationships
     findings = db.relationship("Finding", back_populates="pump", cascade="all, delete-orphan")
     trigger = db.relationship("NewsTrigger", back_populates="pump", uselist=False, cascade="all, delete-orphan")
     notifications = db.relationship("Notification", back_populates="pump", cascade="all, delete-orphan")
+    outcomes = db.relationship("PumpOutcome", back_populates="pump", cascade="all, delete-orphan",
+                               order_by="PumpOutcome.horizon_minutes")
+
+
+# Latest pumps per symbol (window-function grouping in web.read_model)
+PUMPS_SYMBOL_DETECTED_AT_INDEX = db.Index(
+    "ix_pumps_symbol_detected_at", Pump.symbol, Pump.detected_at.desc()
+)
 
 
 class Finding(db.Model):
@@ -79,4 +90,227 @@ class AgentRun(db.Model):
     findings_count = db.Column(db.Integer, default=0)
     status = db.Column(db.String(20), default="running")
     error_message = db.Column(db.Text)
-    logs = db.Column(db.Text)
+    # Plain text while running; finished runs keep them gzip-compressed, then in
+    # a cold archive file (see worker.log_archive). Loaded only when accessed.
+    logs = db.deferred(db.Column(db.Text))
+    logs_archive = db.deferred(db.Column(db.LargeBinary))
+    logs_archive_path = db.Column(db.String(255))  # relative to RUN_LOG_ARCHIVE_DIR
+    heartbeat_at = db.Column(db.DateTime)  # refreshed by the worker while running
+    tokens_used = db.Column(db.Integer, default=0)  # fresh tokens across the run's model calls
+    cost_usd = db.Column(db.Float, default=0.0)
+
+
+class QueuedInvestigation(db.Model):
+    __tablename__ = "investigation_queue"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    symbol = db.Column(db.String(20), nullable=False, index=True)
+    payload = db.Column(db.Text, nullable=False)  # JSON list of cluster pumps, representative first
+    priority = db.Column(db.Float, default=0.0)
+    status = db.Column(db.String(20), default="deferred", index=True)  # 'deferred', 'requeued', 'expired'
+    run_id = db.Column(db.Integer, db.ForeignKey("agent_runs.id"))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+
+class RunCheckpoint(db.Model):
+    __tablename__ = "run_checkpoints"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    run_id = db.Column(db.Integer, db.ForeignKey("agent_runs.id"), nullable=False, index=True)
+    phase = db.Column(db.String(20), nullable=False)  # 'detected', 'investigated', 'notified', 'deferred', 'resumed'
+    symbol = db.Column(db.String(20))  # cluster representative (None for run-level phases)
+    payload = db.Column(db.Text)  # JSON: clusters for 'detected', the investigation for 'investigated'
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class ModelUsage(db.Model):
+    __tablename__ = "model_usage"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    run_id = db.Column(db.Integer, db.ForeignKey("agent_runs.id"), index=True)
+    pump_id = db.Column(db.Integer, db.ForeignKey("pumps.id"), index=True)
+    symbol = db.Column(db.String(20))
+    purpose = db.Column(db.String(20), nullable=False)  # 'investigation', 'notification'
+    input_tokens = db.Column(db.Integer, default=0)
+    output_tokens = db.Column(db.Integer, default=0)
+    cache_read_tokens = db.Column(db.Integer, default=0)
+    cache_creation_tokens = db.Column(db.Integer, default=0)
+    cost_usd = db.Column(db.Float, default=0.0)
+    prompt_template = db.Column(db.String(30))  # see agents.prompts
+    prompt_prefix_chars = db.Column(db.Integer)  # shared, cacheable part of the prompt
+    prompt_suffix_chars = db.Column(db.Integer)  # per-call part
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+
+class SymbolSummary(db.Model):
+    __tablename__ = "symbol_summaries"
+
+    symbol = db.Column(db.String(20), primary_key=True)
+    pump_count = db.Column(db.Integer, default=0)
+    latest_detected_at = db.Column(db.DateTime, index=True)
+    document = db.Column(db.Text, nullable=False)  # JSON, see web.read_model
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class PriceSnapshot(db.Model):
+    __tablename__ = "price_snapshots"
+    __table_args__ = (db.Index("ix_price_snapshots_symbol_captured_at", "symbol", "captured_at"),)
+
+    id = db.Column(db.BigInteger().with_variant(db.Integer, "sqlite"), primary_key=True, autoincrement=True)
+    symbol = db.Column(db.String(20), nullable=False)
+    captured_at = db.Column(db.DateTime, nullable=False, index=True)
+    price = db.Column(db.Float, nullable=False)
+    quote_volume = db.Column(db.Float)  # rolling 24h quote volume
+
+
+class SymbolUniverse(db.Model):
+    __tablename__ = "symbol_universe"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    symbol = db.Column(db.String(20), nullable=False, unique=True)  # canonical base asset
+    name = db.Column(db.String(100))
+    quote = db.Column(db.String(10))  # Binance quote asset, if listed there
+    binance_pair = db.Column(db.String(30))
+    cmc_id = db.Column(db.Integer)
+    cmc_slug = db.Column(db.String(100))
+    aliases = db.Column(db.Text)  # JSON list of exchange-native symbols, e.g. ["1000SATS"]
+    market_cap = db.Column(db.Float)
+    volume_24h = db.Column(db.Float)  # USD
+    exchanges = db.Column(db.Integer, default=0)  # bitmap, see agents.universe
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class PumpOutcome(db.Model):
+    __tablename__ = "pump_outcomes"
+    __table_args__ = (db.UniqueConstraint("pump_id", "horizon_minutes"),)
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    pump_id = db.Column(db.Integer, db.ForeignKey("pumps.id"), nullable=False, index=True)
+    horizon_minutes = db.Column(db.Integer, nullable=False)  # 15, 60, 240, 1440
+    due_at = db.Column(db.DateTime, nullable=False, index=True)
+    status = db.Column(db.String(20), default="pending", index=True)  # 'pending', 'done', 'missed'
+    price = db.Column(db.Float)
+    return_pct = db.Column(db.Float)  # vs price_at_detection
+    retrace_pct = db.Column(db.Float)  # share of the detected move given back (100 = fully retraced)
+    checked_at = db.Column(db.DateTime)
+
+    # Relationships
+    pump = db.relationship("Pump", back_populates="outcomes")
+
+
+class TableVersion(db.Model):
+    __tablename__ = "table_versions"
+
+    table_name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    changed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+# Tables whose writes bump their table_versions row (HTTP validators, see web.caching)
+VERSIONED_TABLES = (
+    "pumps", "findings", "news_triggers", "agent_runs", "pump_outcomes",
+    "model_usage", "symbol_summaries",
+)
+
+# Columns whose updates alone do not bump their table's version: the run heartbeat,
+# and the run totals that record_usage adds to next to a model_usage row (which bumps)
+UNVERSIONED_COLUMNS = {"agent_runs": {"heartbeat_at", "tokens_used", "cost_usd"}}
+
+
+def seed_table_versions(session):
+    """Create the missing table_versions rows."""
+    existing = {name for (name,) in session.query(TableVersion.table_name)}
+    for name in VERSIONED_TABLES:
+        if name not in existing:
+            session.add(TableVersion(table_name=name, version=0))
+    session.commit()
+
+
+def _bump_table_versions(connection, tables):
+    """
+    Add one to the versions of the given tables, in the writer's transaction.
+
+    A table_versions row is a hot spot: the update holds its row lock until
+    the writing transaction commits, so concurrent writers of the same table
+    queue behind each other for that long. Rows are bumped in table name
+    order so two transactions can not deadlock on them; keep transactions
+    that write versioned tables short, and keep frequent bookkeeping writes
+    (UNVERSIONED_COLUMNS, unversioned bulk updates) out of the bump.
+    """
+    tables = sorted(set(tables) & set(VERSIONED_TABLES))
+    if tables:
+        versions = TableVersion.__table__
+        connection.execute(versions.update().where(versions.c.table_name.in_(tables)).values(
+            version=versions.c.version + 1, changed_at=datetime.utcnow()
+        ))
+
+
+@event.listens_for(Session, "after_flush")
+def _version_flushed_tables(session, flush_context):
+    changed = list(session.new) + list(session.deleted) + [
+        obj for obj in session.dirty if session.is_modified(obj) and _versioned_update(obj)
+    ]
+    tables = {obj.__table__.name for obj in changed if hasattr(obj, "__table__")}
+    _bump_table_versions(session.connection(), tables)
+
+
+def _versioned_update(obj) -> bool:
+    """Whether an updated row changed more than its table's UNVERSIONED_COLUMNS."""
+    unversioned = UNVERSIONED_COLUMNS.get(getattr(obj, "__tablename__", None))
+    if not unversioned:
+        return True
+    state = inspect(obj)
+    return any(attr.history.has_changes() for attr in state.attrs if attr.key not in unversioned)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _version_bulk_writes(orm_execute_state):
+    # query.update()/delete() and bulk statements bypass the flush; writes of
+    # UNVERSIONED_COLUMNS opt out with .execution_options(versioned=False)
+    if not orm_execute_state.execution_options.get("versioned", True):
+        return
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None:
+            _bump_table_versions(orm_execute_state.session.connection(), [mapper.local_table.name])
+
+
+# Columns added after the first release: (table, column, DDL or SQLAlchemy type)
+COLUMN_MIGRATIONS = [
+    ("pumps", "detection_profile", "VARCHAR(20)"),
+    ("agent_runs", "heartbeat_at", "TIMESTAMP"),
+    ("agent_runs", "tokens_used", "INTEGER DEFAULT 0"),
+    ("agent_runs", "cost_usd", "FLOAT DEFAULT 0"),
+    ("model_usage", "prompt_template", "VARCHAR(30)"),
+    ("model_usage", "prompt_prefix_chars", "INTEGER"),
+    ("model_usage", "prompt_suffix_chars", "INTEGER"),
+    ("agent_runs", "logs_archive", db.LargeBinary()),
+    ("agent_runs", "logs_archive_path", "VARCHAR(255)"),
+]
+
+
+# Indexes added after the first release (db.create_all() skips existing tables)
+INDEX_MIGRATIONS = [
+    PUMPS_SYMBOL_DETECTED_AT_INDEX,
+]
+
+
+def run_migrations(engine):
+    """Add columns and indexes that db.create_all() cannot add to existing tables."""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table, column, ddl in COLUMN_MIGRATIONS:
+            if not inspector.has_table(table):
+                continue
+            columns = [c["name"] for c in inspector.get_columns(table)]
+            if column not in columns:
+                print(f"Migration: Adding {column} column to {table}")
+                if not isinstance(ddl, str):
+                    ddl = ddl.compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+        for index in INDEX_MIGRATIONS:
+            if not inspector.has_table(index.table.name):
+                continue
+            if index.name not in [i["name"] for i in inspector.get_indexes(index.table.name)]:
+                print(f"Migration: Creating index {index.name}")
+                index.create(conn, checkfirst=True)
@@ -0,0 +1,229 @@
+"""
+Dashboard read model.
+
+One pre-shaped JSON document per symbol (pump count, its most recent pumps
+with trigger, top findings and outcomes) is kept in symbol_summaries. The
+pipeline refreshes a symbol's document whenever it writes a pump, trigger
+or findings for it, and outcome resolution does the same for the outcomes it
+records. A periodic rebuild covers rows written by the MCP-driven
+orchestrator. The dashboard then only reads documents.
+
+Documents are built from one window-function query that returns the most
+recently active symbols with their latest pumps and per-symbol totals, plus
+one batched query each for triggers, top findings and outcomes. Documents
+are written with one INSERT ... ON CONFLICT (symbol) DO UPDATE, so workers
+refreshing the same symbol at once do not race on its row.
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+
+from src.agents.pump_detector import window_label
+
+from .models import Finding, NewsTrigger, Pump, PumpOutcome, SymbolSummary
+
+# Symbols shown on the dashboard and pumps kept per symbol document
+SUMMARY_SYMBOLS = int(os.getenv("SUMMARY_SYMBOLS", "50"))
+SUMMARY_PUMPS_PER_SYMBOL = int(os.getenv("SUMMARY_PUMPS_PER_SYMBOL", "10"))
+SUMMARY_FINDINGS_PER_PUMP = 5
+
+
+# Symbols per batch when rebuilding every document
+REBUILD_BATCH_SYMBOLS = 200
+
+
+def _pump_document(pump: Pump, trigger: Optional[NewsTrigger], findings: list[Finding],
+                   findings_count: int, outcomes: list[PumpOutcome]) -> dict:
+    return {
+        "id": pump.id,
+        "price_change_pct": pump.price_change_pct,
+        "detected_at": str(pump.detected_at),
+        "price_at_detection": pump.price_at_detection,
+        "volume_change_pct": pump.volume_change_pct,
+        "market_cap": pump.market_cap,
+        "trigger": {
+            "trigger_type": trigger.trigger_type,
+            "description": trigger.description,
+            "confidence": trigger.confidence or 0.0,
+        } if trigger else None,
+        "findings_count": findings_count,
+        "findings": [
+            {"source_type": f.source_type, "content": f.content or "", "source_url": f.source_url}
+            for f in findings
+        ],
+        "outcomes": [
+            {"label": window_label(o.horizon_minutes), "return_pct": o.return_pct}
+            for o in outcomes
+        ],
+    }
+
+
+def latest_pumps_by_symbol(db, symbols=None, symbol_limit: Optional[int] = None,
+                           per_symbol: int = SUMMARY_PUMPS_PER_SYMBOL) -> list[dict]:
+    """
+    The most recently active symbols, each with its latest pumps and total count.
+
+    Grouping happens in the database in one query: pumps are ranked within
+    their symbol (served by ix_pumps_symbol_detected_at) and symbols by
+    their latest pump, so symbol_limit symbols always come back with up to
+    per_symbol pumps each however the pumps are spread across symbols.
+
+    Returns:
+        [{"symbol", "count", "pumps": [Pump, ...]}], newest symbol first
+    """
+    ranked = db.query(
+        Pump.id.label("pump_id"),
+        Pump.symbol.label("symbol"),
+        func.row_number().over(
+            partition_by=Pump.symbol, order_by=(Pump.detected_at.desc(), Pump.id.desc())
+        ).label("pump_rank"),
+        func.count().over(partition_by=Pump.symbol).label("pump_count"),
+        func.max(Pump.detected_at).over(partition_by=Pump.symbol).label("latest_at"),
+    )
+    if symbols is not None:
+        ranked = ranked.filter(Pump.symbol.in_(list(symbols)))
+    ranked = ranked.subquery()
+
+    grouped = db.query(
+        ranked.c.pump_id,
+        ranked.c.pump_rank,
+        ranked.c.pump_count,
+        func.dense_rank().over(
+            order_by=(ranked.c.latest_at.desc(), ranked.c.symbol)
+        ).label("symbol_rank"),
+    ).filter(ranked.c.pump_rank <= per_symbol).subquery()
+
+    query = db.query(Pump, grouped.c.pump_count).join(grouped, Pump.id == grouped.c.pump_id)
+    if symbol_limit is not None:
+        query = query.filter(grouped.c.symbol_rank <= symbol_limit)
+
+    groups = {}
+    for pump, count in query.order_by(grouped.c.symbol_rank, grouped.c.pump_rank):
+        group = groups.setdefault(pump.symbol, {"symbol": pump.symbol, "count": count, "pumps": []})
+        group["pumps"].append(pump)
+    return list(groups.values())
+
+
+def _top_findings(db, pump_ids: list[int], limit: int) -> tuple[dict, dict]:
+    """Up to limit most relevant findings and the total, per pump."""
+    ranked = db.query(
+        Finding.id.label("finding_id"),
+        Finding.pump_id.label("pump_id"),
+        func.row_number().over(
+            partition_by=Finding.pump_id, order_by=(Finding.relevance_score.desc(), Finding.id)
+        ).label("finding_rank"),
+        func.count().over(partition_by=Finding.pump_id).label("finding_count"),
+    ).filter(Finding.pump_id.in_(pump_ids)).subquery()
+
+    findings, counts = {}, {}
+    # The first-ranked row is always read so pumps shown without findings still get their count
+    rows = db.query(Finding, ranked.c.finding_rank, ranked.c.finding_count).join(
+        ranked, Finding.id == ranked.c.finding_id
+    ).filter(
+        ranked.c.finding_rank <= max(limit, 1)
+    ).order_by(ranked.c.pump_id, ranked.c.finding_rank)
+    for finding, rank, count in rows:
+        counts[finding.pump_id] = count
+        if rank <= limit:
+            findings.setdefault(finding.pump_id, []).append(finding)
+    return findings, counts
+
+
+def pump_documents(db, pumps: list[Pump], findings_per_pump: int = SUMMARY_FINDINGS_PER_PUMP) -> list[dict]:
+    """Shape pumps with their trigger, top findings and outcomes, in one batch."""
+    pump_ids = [pump.id for pump in pumps]
+    if not pump_ids:
+        return []
+
+    triggers = {
+        t.pump_id: t for t in db.query(NewsTrigger).filter(NewsTrigger.pump_id.in_(pump_ids))
+    }
+    findings, findings_counts = _top_findings(db, pump_ids, findings_per_pump)
+    outcomes = {}
+    for outcome in db.query(PumpOutcome).filter(
+        PumpOutcome.pump_id.in_(pump_ids), PumpOutcome.status == "done"
+    ).order_by(PumpOutcome.pump_id, PumpOutcome.horizon_minutes):
+        outcomes.setdefault(outcome.pump_id, []).append(outcome)
+
+    return [
+        _pump_document(pump, triggers.get(pump.id), findings.get(pump.id, []),
+                       findings_counts.get(pump.id, 0), outcomes.get(pump.id, []))
+        for pump in pumps
+    ]
+
+
+def build_symbol_documents(db, symbols=None, symbol_limit: Optional[int] = None) -> list[dict]:
+    """
+    Shape dashboard documents for the given (or the most recently active) symbols.
+
+    A fixed number of queries however many symbols: grouped pumps, then
+    their triggers, top findings and resolved outcomes in batches.
+    """
+    groups = latest_pumps_by_symbol(db, symbols, symbol_limit)
+    documents = iter(pump_documents(db, [pump for group in groups for pump in group["pumps"]]))
+    return [
+        {
+            "symbol": group["symbol"],
+            "count": group["count"],
+            "pumps": [next(documents) for _ in group["pumps"]],
+        }
+        for group in groups
+    ]
+
+
+def _upsert(dialect_name: str, rows: list[dict]):
+    """INSERT ... ON CONFLICT (symbol) DO UPDATE of summary rows, for postgresql or sqlite."""
+    dialect = postgresql if dialect_name == "postgresql" else sqlite
+    statement = dialect.insert(SymbolSummary).values(rows)
+    return statement.on_conflict_do_update(
+        index_elements=[SymbolSummary.symbol],
+        set_={name: statement.excluded[name] for name in rows[0] if name != "symbol"}
+    )
+
+
+def refresh_symbol_summaries(db, symbols) -> int:
+    """Rebuild the documents of the given symbols (after their rows changed)."""
+    symbols = set(symbols)
+    documents = {document["symbol"]: document for document in build_symbol_documents(db, symbols)}
+    gone = symbols - set(documents)
+    if gone:
+        db.query(SymbolSummary).filter(SymbolSummary.symbol.in_(gone)).delete(synchronize_session=False)
+
+    if documents:
+        now = datetime.utcnow()
+        db.execute(_upsert(db.get_bind().dialect.name, [
+            {
+                "symbol": symbol,
+                "pump_count": document["count"],
+                "latest_detected_at": datetime.fromisoformat(document["pumps"][0]["detected_at"]),
+                "document": json.dumps(document),
+                "updated_at": now,
+            }
+            for symbol, document in sorted(documents.items())
+        ]))
+    db.commit()
+    return len(documents)
+
+
+def rebuild_symbol_summaries(db) -> int:
+    """Rebuild every symbol's document, in batches, and drop those without pumps."""
+    symbols = sorted({symbol for (symbol,) in db.query(Pump.symbol).distinct()})
+    stale = {symbol for (symbol,) in db.query(SymbolSummary.symbol)} - set(symbols)
+    symbols += sorted(stale)
+    refreshed = 0
+    for i in range(0, len(symbols), REBUILD_BATCH_SYMBOLS):
+        refreshed += refresh_symbol_summaries(db, symbols[i:i + REBUILD_BATCH_SYMBOLS])
+    return refreshed
+
+
+def load_symbol_documents(db, limit: int = SUMMARY_SYMBOLS) -> list[dict]:
+    """The most recently active symbols' documents, newest first."""
+    rows = db.query(SymbolSummary.document).order_by(
+        SymbolSummary.latest_detected_at.desc()
+    ).limit(limit).all()
+    return [json.loads(document) for (document,) in rows]
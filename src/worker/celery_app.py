@@ -1,6 +1,9 @@
 """Celery application configuration."""
 
 from celery import Celery
+from celery.signals import celeryd_after_setup, worker_shutdown
+from kombu import Exchange, Queue
+import json
 import os
 
 redis_url = os.getenv("REDIS_URL", "redis://redis:6379/0")
@@ -12,6 +15,37 @@ celery_app = Celery(
     include=["src.worker.tasks"]
 )
 
+# Each queue gets its own workers (`celery worker -Q <queue> --concurrency N`),
+# so a long investigation never holds up detection ticks or alerts. Add
+# capacity by starting more workers on a queue, on any node.
+QUEUES = ("detection", "investigation", "notifications", "maintenance")
+
+# Task -> queue and priority (Redis: 0 is served first, 9 last)
+TASK_ROUTES = {
+    "src.worker.tasks.record_price_snapshot": {"queue": "detection", "priority": 0},
+    "src.worker.tasks.run_pump_agent_scheduled": {"queue": "detection", "priority": 3},
+    "src.worker.tasks.run_pump_agent": {"queue": "investigation", "priority": 5},
+    "src.worker.tasks.send_pump_alert": {"queue": "notifications", "priority": 1},
+    "src.worker.tasks.reap_stuck_agent_runs": {"queue": "maintenance", "priority": 2},
+    "src.worker.tasks.refresh_symbol_universe": {"queue": "maintenance", "priority": 6},
+    "src.worker.tasks.rebuild_dashboard_summaries": {"queue": "maintenance", "priority": 7},
+    "src.worker.tasks.archive_agent_run_logs": {"queue": "maintenance", "priority": 8},
+}
+# Optional JSON overrides, e.g. {"src.worker.tasks.send_pump_alert": {"queue": "investigation"}}
+TASK_ROUTES.update(json.loads(os.getenv("CELERY_TASK_ROUTES", "{}")))
+
+# Per-task (soft, hard) time limits in seconds; the soft limit leaves time to record the outcome
+TASK_TIME_LIMITS = {
+    "src.worker.tasks.record_price_snapshot": (45, 55),
+    "src.worker.tasks.run_pump_agent_scheduled": (30, 60),
+    "src.worker.tasks.run_pump_agent": (840, 900),
+    "src.worker.tasks.send_pump_alert": (240, 270),
+    "src.worker.tasks.reap_stuck_agent_runs": (30, 60),
+    "src.worker.tasks.refresh_symbol_universe": (240, 300),
+    "src.worker.tasks.rebuild_dashboard_summaries": (240, 300),
+    "src.worker.tasks.archive_agent_run_logs": (840, 900),
+}
+
 celery_app.conf.update(
     task_serializer="json",
     accept_content=["json"],
@@ -20,14 +54,83 @@ celery_app.conf.update(
     enable_utc=True,
     task_track_started=True,
     task_time_limit=900,  # 15 minutes max
+    task_soft_time_limit=840,
+    task_queues=[Queue(name, Exchange(name), routing_key=name) for name in QUEUES],
+    task_default_queue="investigation",
+    task_routes=TASK_ROUTES,
+    task_default_priority=5,
+    task_annotations={
+        name: {"soft_time_limit": soft, "time_limit": hard}
+        for name, (soft, hard) in TASK_TIME_LIMITS.items()
+    },
+    broker_transport_options={
+        "priority_steps": list(range(10)),
+        "sep": ":",
+        "queue_order_strategy": "priority",
+    },
     worker_prefetch_multiplier=1,
     worker_concurrency=2,
 )
 
 # Schedule for periodic tasks
 celery_app.conf.beat_schedule = {
-    "run-pump-detection-hourly": {
+    "run-pump-detection-adaptive": {
         "task": "src.worker.tasks.run_pump_agent_scheduled",
-        "schedule": 3600.0,  # Every hour
+        # Checks whether a run is due; the interval follows market volatility (see scheduling.py)
+        "schedule": float(os.getenv("DETECTION_CHECK_SECONDS", "60")),
+        "options": {"expires": 55},
+    },
+    "record-price-snapshot": {
+        "task": "src.worker.tasks.record_price_snapshot",
+        "schedule": 60.0,  # Every minute (feeds multi-window detection)
+        "options": {"expires": 55},  # a late tick is superseded by the next one
+    },
+    "reap-stuck-agent-runs": {
+        "task": "src.worker.tasks.reap_stuck_agent_runs",
+        "schedule": 60.0,
+    },
+    "rebuild-dashboard-summaries": {
+        "task": "src.worker.tasks.rebuild_dashboard_summaries",
+        "schedule": float(os.getenv("SUMMARY_REBUILD_SECONDS", "900")),
+    },
+    "archive-agent-run-logs": {
+        "task": "src.worker.tasks.archive_agent_run_logs",
+        "schedule": float(os.getenv("RUN_LOG_ARCHIVE_SECONDS", "86400")),  # Daily
+    },
+    "refresh-symbol-universe": {
+        "task": "src.worker.tasks.refresh_symbol_universe",
+        "schedule": float(os.getenv("UNIVERSE_REFRESH_SECONDS", "21600")),  # Every 6 hours
     },
 }
+
+
+# Pre-warmed MCP servers, started once per worker and shared by all runs
+mcp_pool = None
+
+# Only workers consuming these queues call claude with MCP tools (alerts via telegram;
+# investigations analyze pre-gathered evidence without tools)
+MCP_QUEUES = {"notifications"}
+
+
+@celeryd_after_setup.connect
+def start_mcp_pool(sender, instance, **kwargs):
+    global mcp_pool
+    if os.getenv("MCP_POOL_ENABLED", "true").lower() != "true":
+        return
+    if not MCP_QUEUES & set(instance.app.amqp.queues.consume_from):
+        return
+    from .mcp_pool import MCPPool, pool_server_names
+    from .pipeline import TELEGRAM_MCP_TOOLS
+    # Only the servers the worker's claude calls may use (alerts go through telegram)
+    pool = MCPPool(only=pool_server_names(TELEGRAM_MCP_TOOLS))
+    if pool.servers:
+        pool.start()
+        mcp_pool = pool
+    else:
+        print("MCP pool: no servers to start, claude calls use the project MCP config")
+
+
+@worker_shutdown.connect
+def stop_mcp_pool(**kwargs):
+    if mcp_pool is not None:
+        mcp_pool.stop()
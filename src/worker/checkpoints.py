@@ -0,0 +1,94 @@
+"""
+Run checkpoints.
+
+Each pipeline phase is recorded as it completes: the detected clusters,
+every finished investigation and every alert handed to the notifications
+queue. The next run takes over whatever a failed or timed-out run left
+unfinished, so completed investigations are never thrown away; when the
+reaper fails a dead worker's run it queues that take-over run right away.
+Alerts are checkpointed as notified only once sent, so alerts of completed
+runs that were lost from the queue or ran out of retries are taken over
+too, once their sends can no longer be in flight.
+"""
+
+import json
+from datetime import datetime, timedelta
+from typing import Optional
+
+from src.web.models import AgentRun, RunCheckpoint
+
+RESUMABLE_STATUSES = ("timeout", "failed")
+# A completed run's unsent alerts are taken over this long after it finished: by then
+# every send_pump_alert attempt (retries a minute apart, 270s limit each) is over
+ALERT_SETTLE_MINUTES = 30
+
+
+def checkpoint(db, run_id: Optional[int], phase: str, symbol: str = None, payload=None):
+    """
+    Record a completed phase, committing it with the session's pending changes.
+
+    Runs without an id only commit the pending changes.
+    """
+    if run_id is not None:
+        db.add(RunCheckpoint(
+            run_id=run_id,
+            phase=phase,
+            symbol=symbol,
+            payload=json.dumps(payload, default=str) if payload is not None else None
+        ))
+    db.commit()
+
+
+def _unfinished(rows: list[RunCheckpoint]) -> tuple[list[list[dict]], list[tuple[list[dict], dict]]]:
+    """Split one run's checkpoints into clusters still to investigate and alerts still to queue."""
+    detected = next((r for r in rows if r.phase == "detected"), None)
+    if detected is None:
+        return [], []
+
+    investigated = {r.symbol: json.loads(r.payload) for r in rows if r.phase == "investigated"}
+    settled = {r.symbol for r in rows if r.phase in ("notified", "deferred")}
+
+    pending, to_notify = [], []
+    for cluster in json.loads(detected.payload):
+        symbol = cluster[0]["symbol"]
+        if symbol in investigated:
+            # Pumps saved without an analysis are not alerted on
+            if symbol not in settled and not investigated[symbol].get("skipped"):
+                to_notify.append((cluster, investigated[symbol]))
+        elif symbol not in settled:
+            pending.append(cluster)
+    return pending, to_notify
+
+
+def take_over(db, run_id: Optional[int], max_age_hours: int) -> tuple[list[list[dict]], list[tuple[list[dict], dict]]]:
+    """
+    Claim the unfinished work of recent runs.
+
+    Failed or timed-out runs hand over their unfinished investigations and
+    unsent alerts; completed runs (ALERT_SETTLE_MINUTES after finishing)
+    their unsent alerts. Each run is taken over once: a 'resumed'
+    checkpoint marks it as claimed.
+    """
+    now = datetime.utcnow()
+    claimed = db.query(RunCheckpoint.run_id).filter(RunCheckpoint.phase == "resumed")
+    runs = db.query(AgentRun.id, AgentRun.status).filter(
+        AgentRun.status.in_(RESUMABLE_STATUSES) | (
+            (AgentRun.status == "completed")
+            & (AgentRun.completed_at < now - timedelta(minutes=ALERT_SETTLE_MINUTES))
+        ),
+        AgentRun.started_at > now - timedelta(hours=max_age_hours),
+        AgentRun.id != run_id,
+        ~AgentRun.id.in_(claimed)
+    ).all()
+
+    pending, to_notify = [], []
+    for earlier_run_id, status in runs:
+        rows = db.query(RunCheckpoint).filter(RunCheckpoint.run_id == earlier_run_id).all()
+        run_pending, run_notify = _unfinished(rows)
+        if status in RESUMABLE_STATUSES:
+            pending += run_pending
+        to_notify += run_notify
+        db.add(RunCheckpoint(run_id=earlier_run_id, phase="resumed",
+                             payload=json.dumps({"by": run_id})))
+    db.commit()
+    return pending, to_notify
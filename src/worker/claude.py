@@ -0,0 +1,171 @@
+"""Helpers for running Claude Code in headless mode."""
+
+import asyncio
+import json
+import os
+from typing import Callable, Optional
+
+from .mcp_pool import pool_config_path
+from .supervisor import ProcessSupervisor
+
+CLAUDE_CWD = os.getenv("CLAUDE_CWD", "/app")
+CLAUDE_TIMEOUT_SECONDS = int(os.getenv("CLAUDE_TIMEOUT_SECONDS", "600"))
+
+# stream-json usage field -> our name
+USAGE_FIELDS = {
+    "input_tokens": "input_tokens",
+    "output_tokens": "output_tokens",
+    "cache_read_input_tokens": "cache_read_tokens",
+    "cache_creation_input_tokens": "cache_creation_tokens",
+}
+
+# USD per million tokens, for calls that end without Claude's own cost (killed or
+# timed out) and for pricing a call before it runs
+TOKEN_PRICES_USD = {
+    "input_tokens": float(os.getenv("PRICE_INPUT_PER_MTOK", "3.0")),
+    "output_tokens": float(os.getenv("PRICE_OUTPUT_PER_MTOK", "15.0")),
+    "cache_read_tokens": float(os.getenv("PRICE_CACHE_READ_PER_MTOK", "0.3")),
+    "cache_creation_tokens": float(os.getenv("PRICE_CACHE_WRITE_PER_MTOK", "3.75")),
+}
+
+
+class BudgetExceeded(Exception):
+    """A call used more tokens than its limit and was stopped."""
+
+
+def _usage(raw: dict) -> dict:
+    return {ours: int(raw.get(theirs) or 0) for theirs, ours in USAGE_FIELDS.items()}
+
+
+def usage_tokens(usage: dict) -> int:
+    """Fresh tokens of a call (cache reads are cheap and only show up in cost)."""
+    return usage["input_tokens"] + usage["cache_creation_tokens"] + usage["output_tokens"]
+
+
+def estimate_cost(usage: dict) -> float:
+    """Cost of token counts at TOKEN_PRICES_USD (missing counts are 0)."""
+    return sum(usage.get(name, 0) * price for name, price in TOKEN_PRICES_USD.items()) / 1_000_000
+
+
+class UsageMeter:
+    """
+    Token usage of one call, read from stream-json events as they arrive.
+
+    Assistant events carry per-turn usage, so a call that is killed still
+    reports what it used, priced at TOKEN_PRICES_USD; the final result
+    event replaces the running total with Claude's own totals and cost.
+    """
+
+    def __init__(self, token_limit: int = 0):
+        self.token_limit = token_limit
+        self._turns: dict[str, dict] = {}
+        self._final: Optional[dict] = None
+
+    @property
+    def usage(self) -> dict:
+        if self._final is not None:
+            return self._final
+        total = {name: 0 for name in USAGE_FIELDS.values()}
+        for turn in self._turns.values():
+            for name, value in turn.items():
+                total[name] += value
+        return {**total, "cost_usd": estimate_cost(total)}
+
+    @property
+    def tokens(self) -> int:
+        return usage_tokens(self.usage)
+
+    def feed(self, line: str):
+        """Account one output line; raises BudgetExceeded past the limit."""
+        try:
+            event = json.loads(line)
+        except json.JSONDecodeError:
+            return
+        if not isinstance(event, dict):
+            return
+        if event.get("type") == "assistant":
+            message = event.get("message") or {}
+            # One message is streamed as several events repeating its usage
+            if message.get("usage"):
+                self._turns[message.get("id") or str(len(self._turns))] = _usage(message["usage"])
+        elif event.get("type") == "result" and event.get("usage"):
+            final = _usage(event["usage"])
+            cost = event.get("total_cost_usd")
+            self._final = {**final, "cost_usd": float(cost) if cost is not None else estimate_cost(final)}
+
+        if self.token_limit and self.tokens > self.token_limit:
+            raise BudgetExceeded(f"used {self.tokens} tokens, limit {self.token_limit}")
+
+
+def _command(prompt: str, allowed_tools: Optional[str] = None) -> list[str]:
+    cmd = ["claude", "-p", prompt, "--output-format", "stream-json", "--verbose"]
+    if allowed_tools:
+        cmd += ["--allowedTools", allowed_tools]
+    # Connect to the worker's running MCP servers instead of starting new ones; without
+    # a running pool the CLI falls back to the project MCP config
+    pool_config = pool_config_path()
+    if pool_config:
+        cmd += ["--mcp-config", pool_config, "--strict-mcp-config"]
+    return cmd
+
+
+def parse_stream(lines: list[str], returncode: int) -> dict:
+    """Pick the final result and usage out of stream-json output lines."""
+    result = {"result": "", "is_error": returncode != 0, "returncode": returncode}
+    meter = UsageMeter()
+    for line in lines:
+        meter.feed(line)
+        try:
+            event = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(event, dict) and event.get("type") == "result":
+            result["result"] = event.get("result", "")
+            result["is_error"] = bool(event.get("is_error")) or result["is_error"]
+    result["usage"] = meter.usage
+    return result
+
+
+async def run_claude_async(prompt: str, allowed_tools: Optional[str] = None,
+                           timeout: int = CLAUDE_TIMEOUT_SECONDS,
+                           on_line: Optional[Callable[[str], None]] = None,
+                           supervisor: Optional[ProcessSupervisor] = None,
+                           meter: Optional[UsageMeter] = None) -> dict:
+    """
+    Run a single Claude Code call on the running event loop.
+
+    Args:
+        prompt: Prompt text passed to `claude -p`
+        allowed_tools: Value for --allowedTools (None allows no extra tools)
+        timeout: Seconds before the process is terminated
+        on_line: Optional callback receiving each raw stream-json line as it arrives
+        supervisor: Shared supervisor bounding concurrent processes (a private one if None)
+        meter: Usage meter fed while the call runs; it keeps the usage of a
+            call that times out or is stopped, and its token limit stops the call
+
+    Returns:
+        dict with "result" (final text), "is_error", "returncode" and "usage"
+
+    Raises:
+        subprocess.TimeoutExpired: if the process does not finish in time
+        BudgetExceeded: if the call goes over the meter's token limit
+    """
+    supervisor = supervisor or ProcessSupervisor(max_concurrent=1)
+    meter = meter or UsageMeter()
+
+    def feed(line: str):
+        meter.feed(line)
+        if on_line:
+            on_line(line)
+
+    returncode, lines = await supervisor.run(
+        _command(prompt, allowed_tools), timeout, cwd=CLAUDE_CWD, on_line=feed
+    )
+    return parse_stream(lines, returncode)
+
+
+def run_claude(prompt: str, allowed_tools: Optional[str] = None,
+               timeout: int = CLAUDE_TIMEOUT_SECONDS,
+               on_line: Optional[Callable[[str], None]] = None) -> dict:
+    """Blocking wrapper around run_claude_async for callers outside an event loop."""
+    return asyncio.run(run_claude_async(prompt, allowed_tools, timeout, on_line))
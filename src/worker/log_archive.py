@@ -0,0 +1,134 @@
+"""
+Agent run log archive.
+
+A finished run's logs are gzip-compressed into agent_runs.logs_archive, a
+deferred column that is only loaded when the logs are read, so listing runs
+no longer pulls the transcripts along. After RUN_LOG_RETENTION_DAYS the
+compressed logs move out of the database into cold archive files under
+RUN_LOG_ARCHIVE_DIR. Reads decompress from whichever tier holds the logs,
+line by line.
+
+RUN_LOG_ARCHIVE_DIR is a plain directory: every process that archives or
+reads logs (the maintenance worker and the web app) must see the same
+one, so with containers on several hosts it has to be shared storage
+(e.g. an NFS mount), not a node-local volume.
+"""
+
+import gzip
+import io
+import itertools
+import os
+from datetime import datetime, timedelta
+from typing import Iterator
+
+from src.web.models import AgentRun
+
+RUN_LOG_ARCHIVE_DIR = os.getenv("RUN_LOG_ARCHIVE_DIR", "data/run-logs")
+RUN_LOG_RETENTION_DAYS = int(os.getenv("RUN_LOG_RETENTION_DAYS", "30"))
+# Runs compressed or moved per commit
+ARCHIVE_BATCH_RUNS = 100
+
+# Runs in these states are never written again once their logs are stored
+FINISHED_RUN_STATUSES = ("completed", "failed", "timeout", "skipped")
+
+
+class LogArchiveUnavailable(Exception):
+    """A run's logs are in a cold archive file that is missing or unreadable here."""
+
+
+def store_run_logs(run: AgentRun, logs: str):
+    """Store a finished run's logs compressed instead of as plain text."""
+    run.logs_archive = gzip.compress(logs.encode(), compresslevel=6) if logs else None
+    run.logs = None
+
+
+def _archive_path(run: AgentRun) -> str:
+    """Cold archive file of a run, relative to RUN_LOG_ARCHIVE_DIR."""
+    finished = run.completed_at or run.started_at or datetime.utcnow()
+    return os.path.join(f"{finished:%Y}", f"{finished:%m}", f"run-{run.id}.log.gz")
+
+
+def _decompressed_lines(stream, first: bytes = b"") -> Iterator[str]:
+    with stream:
+        for line in itertools.chain([first] if first else [], stream):
+            yield line.decode(errors="replace").rstrip("\n")
+
+
+def iter_run_log_lines(run: AgentRun) -> Iterator[str]:
+    """
+    A run's log lines, from plain text, the compressed column or the cold archive.
+
+    The stored logs are fetched right away (while the run's session is
+    open); decompression happens lazily as the lines are consumed. A cold
+    archive file is opened and its first line read up front, so a missing
+    or corrupt file raises LogArchiveUnavailable before anything is served.
+    """
+    if run.logs:
+        return iter(run.logs.split("\n"))
+    if run.logs_archive is not None:
+        return _decompressed_lines(gzip.GzipFile(fileobj=io.BytesIO(run.logs_archive)))
+    if run.logs_archive_path:
+        path = os.path.join(RUN_LOG_ARCHIVE_DIR, run.logs_archive_path)
+        stream = None
+        try:
+            stream = gzip.open(path, "rb")
+            first = stream.readline()
+        except (OSError, EOFError) as e:
+            if stream is not None:
+                stream.close()
+            raise LogArchiveUnavailable(f"log archive {path} of run #{run.id}: {e}") from e
+        return _decompressed_lines(stream, first)
+    return iter([])
+
+
+def archive_run_logs(db, now: datetime = None) -> dict:
+    """
+    Apply the log retention policy.
+
+    Finished runs still holding plain-text logs are compressed, and
+    compressed logs of runs finished more than RUN_LOG_RETENTION_DAYS ago
+    are written to cold archive files and dropped from the database.
+
+    Returns:
+        dict with the number of runs compressed and moved to cold storage
+    """
+    now = now or datetime.utcnow()
+    stats = {"compressed": 0, "archived": 0}
+
+    while True:
+        runs = db.query(AgentRun).filter(
+            AgentRun.status.in_(FINISHED_RUN_STATUSES),
+            AgentRun.completed_at.isnot(None),
+            AgentRun.logs.isnot(None)
+        ).order_by(AgentRun.id).limit(ARCHIVE_BATCH_RUNS).all()
+        if not runs:
+            break
+        for run in runs:
+            store_run_logs(run, run.logs)
+        db.commit()
+        stats["compressed"] += len(runs)
+
+    cutoff = now - timedelta(days=RUN_LOG_RETENTION_DAYS)
+    while True:
+        runs = db.query(AgentRun).filter(
+            AgentRun.completed_at < cutoff,
+            AgentRun.logs_archive.isnot(None)
+        ).order_by(AgentRun.id).limit(ARCHIVE_BATCH_RUNS).all()
+        if not runs:
+            break
+        for run in runs:
+            relative = _archive_path(run)
+            path = os.path.join(RUN_LOG_ARCHIVE_DIR, relative)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Already gzip data: written as-is, renamed into place once complete
+            with open(path + ".tmp", "wb") as f:
+                f.write(run.logs_archive)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(path + ".tmp", path)
+            run.logs_archive_path = relative
+            run.logs_archive = None
+        db.commit()
+        stats["archived"] += len(runs)
+
+    return stats
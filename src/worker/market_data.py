@@ -0,0 +1,158 @@
+"""
+Stored market snapshots.
+
+A bulk Binance ticker snapshot is recorded every minute and compacted into
+coarser resolutions as it ages (1m for 2h, 15m for 26h, 1h up to
+PRICE_HISTORY_DAYS), matching the levels of MultiResolutionHistory.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+
+import redis
+from sqlalchemy import func
+
+from src.agents.anomaly import SymbolStats
+from src.agents.rolling import RESOLUTIONS, MultiResolutionHistory
+from src.agents.universe import SymbolIndex
+from src.web.models import PriceSnapshot, SymbolUniverse
+
+PRICE_HISTORY_DAYS = int(os.getenv("PRICE_HISTORY_DAYS", "7"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
+SYMBOL_STATS_KEY = "pump-researcher:symbol-stats"
+
+UNIVERSE_COLUMNS = ["symbol", "name", "quote", "binance_pair", "cmc_id", "cmc_slug",
+                    "aliases", "market_cap", "volume_24h", "exchanges"]
+
+
+def record_snapshot(db, tickers: list[dict], captured_at: datetime = None) -> int:
+    """Store one snapshot row per ticker, aligned to the minute."""
+    captured_at = (captured_at or datetime.utcnow()).replace(second=0, microsecond=0)
+    db.bulk_insert_mappings(PriceSnapshot, [
+        {
+            "symbol": t["symbol"],
+            "captured_at": captured_at,
+            "price": t["price"],
+            "quote_volume": t["quote_volume"],
+        }
+        for t in tickers
+    ])
+    db.commit()
+    return len(tickers)
+
+
+def compact_snapshots(db, now: datetime = None) -> int:
+    """Thin aged snapshots down to the next coarser resolution and drop expired ones."""
+    now = now or datetime.utcnow()
+    minute = func.extract("minute", PriceSnapshot.captured_at)
+    deleted = 0
+
+    (fine, fine_count), (medium, medium_count), _ = RESOLUTIONS
+    fine_cutoff = now - timedelta(minutes=fine * fine_count)
+    medium_cutoff = now - timedelta(minutes=medium * medium_count)
+
+    deleted += db.query(PriceSnapshot).filter(
+        PriceSnapshot.captured_at < fine_cutoff,
+        PriceSnapshot.captured_at >= medium_cutoff,
+        minute % medium != 0
+    ).delete(synchronize_session=False)
+    deleted += db.query(PriceSnapshot).filter(
+        PriceSnapshot.captured_at < medium_cutoff,
+        minute != 0
+    ).delete(synchronize_session=False)
+    deleted += db.query(PriceSnapshot).filter(
+        PriceSnapshot.captured_at < now - timedelta(days=PRICE_HISTORY_DAYS)
+    ).delete(synchronize_session=False)
+
+    db.commit()
+    return deleted
+
+
+def load_history(db, max_window_minutes: int, now: datetime = None) -> MultiResolutionHistory:
+    """Load enough snapshots to evaluate windows up to max_window_minutes."""
+    now = now or datetime.utcnow()
+    since = now - timedelta(minutes=max_window_minutes + RESOLUTIONS[-1][0])
+    rows = db.query(
+        PriceSnapshot.symbol, PriceSnapshot.captured_at,
+        PriceSnapshot.price, PriceSnapshot.quote_volume
+    ).filter(PriceSnapshot.captured_at >= since).all()
+
+    return MultiResolutionHistory(
+        [r[0] for r in rows],
+        [r[1] for r in rows],
+        [r[2] for r in rows],
+        [r[3] or 0.0 for r in rows],
+        now=now
+    )
+
+
+def _decode_symbol_stats(data) -> SymbolStats:
+    try:
+        return SymbolStats.from_bytes(data)
+    except (ValueError, KeyError, OSError) as e:
+        # e.g. a blob from before stats were stored without pickle
+        print(f"Error decoding symbol stats, starting over: {e}")
+        return SymbolStats()
+
+
+def load_symbol_stats() -> SymbolStats:
+    """Load the running per-symbol statistics from Redis (empty if missing)."""
+    try:
+        return _decode_symbol_stats(redis.Redis.from_url(REDIS_URL).get(SYMBOL_STATS_KEY))
+    except redis.RedisError as e:
+        print(f"Error loading symbol stats: {e}")
+        return SymbolStats()
+
+
+def update_symbol_stats(tickers: list[dict]) -> SymbolStats:
+    """
+    Fold a ticker snapshot into the running statistics and save them.
+
+    The read-modify-write runs as a WATCH/MULTI transaction on the stats
+    key, retried if another snapshot task saved in between, so overlapping
+    ticks never overwrite each other's updates.
+    """
+    def update(pipe) -> SymbolStats:
+        stats = _decode_symbol_stats(pipe.get(SYMBOL_STATS_KEY))
+        stats.update(
+            [t["symbol"] for t in tickers],
+            [t["price"] for t in tickers],
+            [t["quote_volume"] for t in tickers]
+        )
+        pipe.multi()
+        pipe.set(SYMBOL_STATS_KEY, stats.to_bytes())
+        return stats
+
+    try:
+        return redis.Redis.from_url(REDIS_URL).transaction(update, SYMBOL_STATS_KEY,
+                                                          value_from_callable=True)
+    except redis.RedisError as e:
+        print(f"Error saving symbol stats: {e}")
+        return SymbolStats()
+
+
+def refresh_universe(db, entries: list[dict]) -> int:
+    """Replace the stored symbol universe with freshly built entries."""
+    if not entries:
+        return 0
+
+    now = datetime.utcnow()
+    db.query(SymbolUniverse).delete(synchronize_session=False)
+    db.bulk_insert_mappings(SymbolUniverse, [
+        {**entry, "aliases": json.dumps(entry["aliases"]), "updated_at": now}
+        for entry in entries
+    ])
+    db.commit()
+    return len(entries)
+
+
+def load_universe(db) -> SymbolIndex:
+    """Load the stored symbol universe into an in-memory index."""
+    rows = db.query(*(getattr(SymbolUniverse, c) for c in UNIVERSE_COLUMNS)).all()
+    entries = []
+    for row in rows:
+        entry = dict(zip(UNIVERSE_COLUMNS, row))
+        entry["aliases"] = json.loads(entry["aliases"] or "[]")
+        entries.append(entry)
+    return SymbolIndex(entries)
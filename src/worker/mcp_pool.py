@@ -0,0 +1,241 @@
+"""
+Pre-warmed MCP server pool.
+
+Starts the stdio MCP servers the worker's `claude` calls use (e.g. only
+telegram for alerts) once per worker, each behind a local SSE bridge
+(mcp-proxy), and keeps them alive with periodic heartbeats. Server
+definitions come from the same project config the CLI loads (.mcp.json or
+.claude/settings.json in CLAUDE_CWD, or MCP_CONFIG_PATH). Agent runs
+connect to the running servers over localhost through a generated config
+instead of cold-starting (and re-logging into Telegram) on every call.
+"""
+
+import json
+import os
+import re
+import shlex
+import signal
+import socket
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+CLAUDE_CWD = os.getenv("CLAUDE_CWD", "/app")
+# Explicit server config; by default the project config the CLI itself loads
+MCP_CONFIG_PATH = os.getenv("MCP_CONFIG_PATH", "")
+MCP_CONFIG_CANDIDATES = (".mcp.json", ".claude/settings.json")
+# Comma-separated servers to pool (default: those of the worker's allowed MCP tools)
+MCP_POOL_SERVERS = os.getenv("MCP_POOL_SERVERS", "")
+MCP_POOL_CONFIG_PATH = os.getenv("MCP_POOL_CONFIG_PATH", "/tmp/pump-researcher-mcp-pool.json")
+MCP_POOL_HOST = "127.0.0.1"
+MCP_POOL_BASE_PORT = int(os.getenv("MCP_POOL_BASE_PORT", "8700"))
+MCP_PROXY_COMMAND = os.getenv("MCP_PROXY_COMMAND", "mcp-proxy")
+MCP_HEARTBEAT_SECONDS = int(os.getenv("MCP_HEARTBEAT_SECONDS", "15"))
+# Restart backoff doubles per consecutive failure, capped here
+MCP_MAX_BACKOFF_SECONDS = 300
+
+
+def server_config_path() -> Optional[str]:
+    """MCP_CONFIG_PATH, else the first project MCP config present in CLAUDE_CWD."""
+    if MCP_CONFIG_PATH:
+        return MCP_CONFIG_PATH
+    for candidate in MCP_CONFIG_CANDIDATES:
+        path = os.path.join(CLAUDE_CWD, candidate)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _expand(value):
+    """Expand ${VAR} references the way the CLI does for .mcp.json."""
+    if isinstance(value, str):
+        return os.path.expandvars(value)
+    if isinstance(value, list):
+        return [_expand(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _expand(v) for k, v in value.items()}
+    return value
+
+
+def load_server_config(path: Optional[str] = None) -> dict[str, dict]:
+    """Read stdio server definitions ({"mcpServers": {name: {command, args, env}}})."""
+    path = path or server_config_path()
+    if path is None:
+        print(f"Error reading MCP config: none of {', '.join(MCP_CONFIG_CANDIDATES)} in {CLAUDE_CWD}")
+        return {}
+    try:
+        servers = json.loads(Path(path).read_text()).get("mcpServers", {})
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Error reading MCP config {path}: {e}")
+        return {}
+    return {name: _expand(spec) for name, spec in servers.items() if spec.get("command")}
+
+
+def tool_servers(allowed_tools: str) -> list[str]:
+    """Servers named by --allowedTools patterns, e.g. "mcp__telegram__*" -> ["telegram"]."""
+    return sorted(set(re.findall(r"mcp__([A-Za-z0-9_-]+?)__", allowed_tools or "")))
+
+
+def pool_server_names(allowed_tools: Optional[str] = None) -> Optional[list[str]]:
+    """MCP_POOL_SERVERS, else the servers of allowed_tools (None: every configured server)."""
+    names = [name.strip() for name in MCP_POOL_SERVERS.split(",") if name.strip()]
+    if names:
+        return names
+    return tool_servers(allowed_tools) if allowed_tools is not None else None
+
+
+def pool_config_path() -> Optional[str]:
+    """Path of the pool's client config, if a pool is running with healthy servers."""
+    try:
+        servers = json.loads(Path(MCP_POOL_CONFIG_PATH).read_text()).get("mcpServers")
+    except (OSError, json.JSONDecodeError):
+        return None
+    return MCP_POOL_CONFIG_PATH if servers else None
+
+
+class PooledServer:
+    """One MCP server process behind its local SSE bridge."""
+
+    def __init__(self, name: str, spec: dict, port: int):
+        self.name = name
+        self.spec = spec
+        self.port = port
+        self.process: Optional[subprocess.Popen] = None
+        self.failures = 0
+        self.next_start = 0.0
+
+    @property
+    def url(self) -> str:
+        return f"http://{MCP_POOL_HOST}:{self.port}/sse"
+
+    def start(self):
+        cmd = shlex.split(MCP_PROXY_COMMAND) + [
+            f"--port={self.port}", f"--host={MCP_POOL_HOST}", "--pass-environment",
+            "--", self.spec["command"], *self.spec.get("args", [])
+        ]
+        env = {**os.environ, **{k: str(v) for k, v in (self.spec.get("env") or {}).items()}}
+        try:
+            self.process = subprocess.Popen(
+                cmd, env=env, cwd=self.spec.get("cwd"),
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                start_new_session=True
+            )
+        except OSError as e:
+            print(f"Error starting MCP server {self.name}: {e}")
+            self.process = None
+
+    def healthy(self) -> bool:
+        """Heartbeat: the bridge process is alive and accepting connections."""
+        if self.process is None or self.process.poll() is not None:
+            return False
+        try:
+            with socket.create_connection((MCP_POOL_HOST, self.port), timeout=2):
+                return True
+        except OSError:
+            return False
+
+    def stop(self):
+        """Stop the bridge and the server it spawned (its own process group)."""
+        if self.process and self.process.poll() is None:
+            os.killpg(self.process.pid, signal.SIGTERM)
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                os.killpg(self.process.pid, signal.SIGKILL)
+                self.process.wait()
+        self.process = None
+
+
+class MCPPool:
+    """Long-lived MCP servers shared by every agent run in this worker."""
+
+    def __init__(self, servers: dict[str, dict] = None, only: list[str] = None):
+        """
+        servers: server definitions (default: the project MCP config)
+        only: names of the servers to start (default: all of them)
+        """
+        servers = load_server_config() if servers is None else servers
+        if only is not None:
+            missing = sorted(set(only) - set(servers))
+            if missing:
+                print(f"MCP pool: no config for {', '.join(missing)}")
+            servers = {name: spec for name, spec in servers.items() if name in only}
+        self.servers = [
+            PooledServer(name, spec, MCP_POOL_BASE_PORT + i)
+            for i, (name, spec) in enumerate(sorted(servers.items()))
+        ]
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start every server and the heartbeat thread."""
+        # Drop a config left behind by a previous worker until servers answer
+        self.write_client_config([])
+        for server in self.servers:
+            server.start()
+        self._thread = threading.Thread(target=self._heartbeat, name="mcp-pool", daemon=True)
+        self._thread.start()
+        print(f"MCP pool: started {len(self.servers)} servers")
+
+    def _heartbeat(self):
+        # First check soon after start so runs pick up servers as they come up
+        interval = 2
+        while not self._stop.wait(interval):
+            self.check()
+            interval = MCP_HEARTBEAT_SECONDS
+
+    def check(self) -> list[str]:
+        """Restart dead servers (with backoff) and publish the healthy ones."""
+        now = time.monotonic()
+        healthy = []
+        for server in self.servers:
+            if server.healthy():
+                server.failures = 0
+                healthy.append(server)
+                continue
+            # A bridge still booting is not a failure yet
+            if server.process is not None and server.process.poll() is None and server.failures == 0:
+                server.failures = 1
+                continue
+            if now >= server.next_start:
+                print(f"MCP pool: restarting {server.name}")
+                server.stop()
+                server.start()
+                server.failures += 1
+                server.next_start = now + min(MCP_MAX_BACKOFF_SECONDS, 2 ** server.failures)
+        self.write_client_config(healthy)
+        return [s.name for s in healthy]
+
+    def write_client_config(self, servers: list[PooledServer]):
+        """Atomically write the config `claude --mcp-config` uses to reach the pool."""
+        config = {"mcpServers": {s.name: {"type": "sse", "url": s.url} for s in servers}}
+        tmp = f"{MCP_POOL_CONFIG_PATH}.tmp"
+        Path(tmp).write_text(json.dumps(config, indent=2))
+        os.replace(tmp, MCP_POOL_CONFIG_PATH)
+
+    def stop(self):
+        """Stop the heartbeat and every server, and withdraw the client config."""
+        self._stop.set()
+        for server in self.servers:
+            server.stop()
+        if os.path.exists(MCP_POOL_CONFIG_PATH):
+            os.remove(MCP_POOL_CONFIG_PATH)
+
+
+def main():
+    """Run the pool in the foreground (for run_agent.sh / local use)."""
+    pool = MCPPool(only=pool_server_names())
+    pool.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Post-pump outcome tracking.
+
+Every saved pump gets follow-up checks at fixed horizons after detection.
+Due checks are resolved from the bulk Binance ticker the minute snapshot
+already fetches, so tracking costs no extra requests however many pumps
+are pending. Pumps only seen on CoinMarketCap are tracked only when the
+symbol universe lists them on Binance too.
+"""
+
+import os
+from datetime import datetime, timedelta
+
+from src.agents.merge import price_scale
+from src.web.models import Pump, PumpOutcome, SymbolUniverse
+from src.web.read_model import refresh_symbol_summaries
+
+from .market_data import load_universe
+
+OUTCOME_HORIZONS = [15, 60, 240, 1440]  # minutes after detection
+# Checks not resolved within this long after they were due are marked missed
+OUTCOME_GRACE_MINUTES = int(os.getenv("OUTCOME_GRACE_MINUTES", "30"))
+
+
+def trades_on_binance(db, pump_row: Pump) -> bool:
+    """Whether the pump's price can be read from the Binance tickers."""
+    if pump_row.source != "coinmarketcap":
+        return True
+    pair = db.query(SymbolUniverse.binance_pair).filter(SymbolUniverse.symbol == pump_row.symbol).scalar()
+    return pair is not None
+
+
+def schedule_outcomes(db, pump_row: Pump) -> int:
+    """Create the pending follow-up checks for a newly saved pump."""
+    if not pump_row.price_at_detection or not trades_on_binance(db, pump_row):
+        return 0
+
+    detected_at = pump_row.detected_at or datetime.utcnow()
+    for horizon in OUTCOME_HORIZONS:
+        db.add(PumpOutcome(
+            pump_id=pump_row.id,
+            horizon_minutes=horizon,
+            due_at=detected_at + timedelta(minutes=horizon)
+        ))
+    return len(OUTCOME_HORIZONS)
+
+
+def resolve_outcomes(db, tickers: list[dict], now: datetime = None) -> tuple[int, int]:
+    """
+    Fill in every due check from one bulk ticker snapshot.
+
+    Returns:
+        (resolved, missed) counts
+    """
+    now = now or datetime.utcnow()
+    due = db.query(PumpOutcome, Pump).join(Pump, PumpOutcome.pump_id == Pump.id).filter(
+        PumpOutcome.status == "pending",
+        PumpOutcome.due_at <= now
+    ).all()
+    if not due or not tickers:
+        return 0, 0
+
+    # Pumps are keyed by canonical symbol with per-unit prices (1000SATS -> SATS)
+    universe = load_universe(db)
+    prices = {}
+    for ticker in tickers:
+        symbol = universe.canonical_binance(ticker["symbol"])
+        prices[symbol] = ticker["price"] / price_scale(ticker["symbol"], symbol)
+    resolved = missed = 0
+    changed = set()
+    grace = timedelta(minutes=OUTCOME_GRACE_MINUTES)
+    for outcome, pump in due:
+        price = prices.get(pump.symbol)
+        if now - outcome.due_at > grace:
+            # Too late for today's price to stand in for the horizon price
+            outcome.status = "missed"
+            outcome.checked_at = now
+            missed += 1
+            continue
+        if price is None:
+            continue
+
+        detected_price = pump.price_at_detection
+        move = detected_price - detected_price / (1 + pump.price_change_pct / 100)
+        outcome.price = price
+        outcome.return_pct = round((price / detected_price - 1) * 100, 2)
+        outcome.retrace_pct = round((detected_price - price) / move * 100, 1) if move > 0 else None
+        outcome.status = "done"
+        outcome.checked_at = now
+        resolved += 1
+        changed.add(pump.symbol)
+
+    db.commit()
+    refresh_symbol_summaries(db, changed)
+    return resolved, missed
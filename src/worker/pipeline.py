@@ -0,0 +1,670 @@
+"""
+Direct-API research pipeline.
+
+Detection and evidence gathering run in Python through src.collectors, so
+the model is only called once per pump to analyze a pre-gathered evidence
+bundle instead of fetching every source itself one tool call at a time.
+"""
+
+import asyncio
+import json
+import math
+import os
+import subprocess
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from src.agents.anomaly import ANOMALY_PRICE_Z, SymbolStats, is_anomalous
+from src.agents.clustering import cluster_pumps
+from src.agents.merge import merge_sources
+from src.agents.news_investigator import get_evidence_prompt, parse_investigation_results
+from src.agents.prioritizer import (DAILY_COST_BUDGET_USD, DAILY_TOKEN_BUDGET, PUMP_TOKEN_BUDGET,
+                                    RunBudget, estimate_tokens, prioritize_clusters)
+from src.agents.pump_detector import profile_name, window_label
+from src.agents.reporter import get_telegram_report_prompt
+from src.agents.rolling import MultiResolutionHistory
+from src.agents.trigger_rules import fast_path
+from src.agents.universe import SymbolIndex
+from src.collectors import binance, coinmarketcap
+from src.collectors.evidence import format_bundle, gather_evidence
+from src.collectors.http import close_client
+from src.collectors.ranking import rank_bundle
+from src.web.models import Finding, NewsTrigger, Notification, Pump, QueuedInvestigation
+from src.web.read_model import refresh_symbol_summaries
+
+from .checkpoints import checkpoint, take_over
+from .claude import BudgetExceeded, UsageMeter, estimate_cost, run_claude_async
+from .market_data import load_history, load_symbol_stats, load_universe
+from .outcomes import schedule_outcomes
+from .supervisor import ProcessSupervisor
+from .usage import record_usage, usage_today
+
+TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID", "")
+TELEGRAM_MCP_TOOLS = os.getenv("TELEGRAM_MCP_TOOLS", "mcp__telegram__*")
+ANALYSIS_TIMEOUT_SECONDS = int(os.getenv("ANALYSIS_TIMEOUT_SECONDS", "180"))
+DEFERRED_MAX_AGE_HOURS = int(os.getenv("DEFERRED_MAX_AGE_HOURS", "6"))
+
+# Expected size of the model's JSON answer, added to prompt size for budgeting
+ANALYSIS_OUTPUT_TOKENS = 1500
+
+# Model findings shorter than this are usually placeholders, not real content
+MIN_FINDING_LENGTH = 50
+
+
+def _add_hit(pumps: dict, symbol: str, profile: str, window: int, change: float,
+             source: str, price: float = None, coin: dict = None, volume_change: float = None,
+             zscores: tuple = None, volume_24h: float = None):
+    """Record a profile hit, merging it into the source's existing pump for the symbol."""
+    pump = pumps.get(symbol)
+    if pump is None:
+        pump = pumps[symbol] = {
+            "symbol": symbol,
+            "price_change_pct": change,
+            "price_at_detection": price,
+            "volume_change_pct": volume_change,
+            "market_cap": None,
+            "volume_24h": volume_24h,
+            "source": source,
+            "time_window_minutes": window,
+            "profile": profile,
+            "profiles": [],
+        }
+
+    if profile not in pump["profiles"]:
+        pump["profiles"].append(profile)
+    if zscores and "price_z" not in pump:
+        pump["price_z"], pump["volume_z"] = zscores
+    if coin:
+        pump["cmc_id"] = coin["id"]
+        pump["name"] = coin["name"]
+        pump["tags"] = coin["tags"]
+        pump["market_cap"] = coin["market_cap"]
+        pump["volume_24h"] = coin["volume_24h"]
+        if pump["volume_change_pct"] is None:
+            pump["volume_change_pct"] = coin["volume_change_pct"]
+        if pump["price_at_detection"] is None:
+            pump["price_at_detection"] = coin["price"]
+
+
+async def scan_market(profiles: list[tuple[float, int]],
+                      history: Optional[MultiResolutionHistory] = None,
+                      stats: Optional[SymbolStats] = None,
+                      universe: Optional[SymbolIndex] = None) -> list[dict]:
+    """
+    Find pumps matching any detection profile on Binance and CoinMarketCap.
+
+    Binance windows are read from the shared multi-resolution history when
+    it covers them, falling back to Binance rolling-window tickers. Profiles
+    are checked shortest window first, so each pump is tagged with the
+    fastest profile it matched. With running symbol stats, a move that is
+    below the threshold but anomalous for that symbol (price z > k AND
+    volume z > m) is reported too, tagged e.g. "z>4/1h".
+
+    Each source is scanned on its own and the two are then joined on
+    canonical symbols from the symbol universe (see agents.merge), so
+    "both" means the same asset on both sources.
+    """
+    universe = universe or SymbolIndex([])
+    cmc_windows = sorted({w for _, w in profiles if w in coinmarketcap.CHANGE_FIELDS})
+    tickers, *gainer_lists = await asyncio.gather(
+        binance.fetch_tickers(),
+        *(coinmarketcap.fetch_gainers(w) for w in cmc_windows)
+    )
+    gainers = dict(zip(cmc_windows, gainer_lists))
+    prices = {t["symbol"]: t["price"] for t in tickers}
+    quote_volumes = {t["symbol"]: t["quote_volume"] for t in tickers}
+
+    changes = {}  # window -> {symbol: (price_change_pct, volume_change_pct)}
+    zscores = {}  # window -> {symbol: (price_z, volume_z)}
+    api_windows = []
+    for _, window in profiles:
+        if history is not None and history.covers(window):
+            price_change, volume_change = history.window_changes(window)
+            changes[window] = {
+                symbol: (float(p), None if math.isnan(v) else float(v))
+                for symbol, p, v in zip(history.symbols, price_change, volume_change)
+                if not math.isnan(p)
+            }
+            if stats is not None:
+                volumes = [quote_volumes.get(s, 0.0) for s in history.symbols]
+                price_z, volume_z = stats.zscores(history.symbols, price_change, window, volumes)
+                zscores[window] = {
+                    symbol: (round(float(pz), 2), round(float(vz), 2))
+                    for symbol, pz, vz, flag in zip(history.symbols, price_z, volume_z,
+                                                    is_anomalous(price_z, volume_z))
+                    if flag
+                }
+        elif window == 1440:
+            changes[window] = {t["symbol"]: (t["price_change_pct"], None) for t in tickers}
+        elif binance.window_size(window) and window not in api_windows:
+            api_windows.append(window)
+
+    pairs = [t["pair"] for t in tickers]
+    window_results = await asyncio.gather(
+        *(binance.fetch_window_tickers(pairs, w) for w in api_windows)
+    )
+    for window, window_tickers in zip(api_windows, window_results):
+        changes[window] = {t["symbol"]: (t["price_change_pct"], None) for t in window_tickers}
+
+    binance_pumps, cmc_pumps = {}, {}
+    for threshold, window in profiles:
+        profile = profile_name(threshold, window)
+        anomalies = zscores.get(window, {})
+        for symbol, (change, volume_change) in changes.get(window, {}).items():
+            if change >= threshold:
+                hit_profile = profile
+            elif symbol in anomalies and change > 0:
+                hit_profile = f"z>{ANOMALY_PRICE_Z:g}/{window_label(window)}"
+            else:
+                continue
+            _add_hit(binance_pumps, symbol, hit_profile, window, change, "binance",
+                     price=prices.get(symbol), volume_change=volume_change,
+                     zscores=anomalies.get(symbol), volume_24h=quote_volumes.get(symbol))
+        for coin in gainers.get(window, []):
+            if (coin["price_change_pct"] or 0) >= threshold:
+                _add_hit(cmc_pumps, coin["symbol"], profile, window, coin["price_change_pct"],
+                         "coinmarketcap", coin=coin)
+
+    pumps = merge_sources(list(binance_pumps.values()), list(cmc_pumps.values()), universe)
+    detected_at = datetime.utcnow().isoformat()
+    for pump in pumps:
+        pump["detected_at"] = detected_at
+        entry = universe.get(pump["symbol"])
+        if entry:
+            pump["market_cap"] = pump["market_cap"] or entry["market_cap"]
+            pump["name"] = pump.get("name") or entry["name"]
+            pump["aliases"] = entry.get("aliases") or []
+
+    return pumps
+
+
+async def detect(profiles: list[tuple[float, int]],
+                 history: Optional[MultiResolutionHistory] = None,
+                 stats: Optional[SymbolStats] = None,
+                 universe: Optional[SymbolIndex] = None) -> tuple[list[list[dict]], int]:
+    """
+    Detect pumps for all profiles in one pass and cluster co-moving ones.
+
+    Returns:
+        (clusters, number of pumps dropped by the liquidity floors)
+    """
+    universe = universe or SymbolIndex([])
+    try:
+        detected = await scan_market(profiles, history, stats, universe)
+        pumps = [
+            p for p in detected
+            if universe.is_liquid(p["symbol"], p["market_cap"], p["volume_24h"])
+        ]
+        # Correlate over the longest window any detected pump matched
+        window = max((p["time_window_minutes"] for p in pumps), default=60)
+        closes = await binance.fetch_closes([p.get("binance_symbol") or p["symbol"] for p in pumps], window)
+        histories = {p["symbol"]: closes.get(p.get("binance_symbol") or p["symbol"], []) for p in pumps}
+    finally:
+        await close_client()
+    return cluster_pumps(pumps, histories), len(detected) - len(pumps)
+
+
+async def collect_evidence(cluster: list[dict]) -> dict:
+    """
+    Gather a ranked evidence bundle for a cluster's representative.
+
+    Items are matched against the symbol's universe aliases too, and their
+    recency is measured from when the pump was detected, not from when the
+    evidence was gathered (a deferred cluster may be hours older).
+    """
+    pump = cluster[0]
+    return rank_bundle(await gather_evidence(pump), aliases=pump.get("aliases") or ())
+
+
+def recent_pump_counts(db, symbols: list[str], hours: int = 24) -> dict[str, int]:
+    """Count pumps per symbol over the last `hours` (used for novelty)."""
+    if not symbols:
+        return {}
+    rows = db.query(Pump.symbol, func.count(Pump.id)).filter(
+        Pump.symbol.in_(symbols),
+        Pump.detected_at > datetime.utcnow() - timedelta(hours=hours)
+    ).group_by(Pump.symbol).all()
+    return dict(rows)
+
+
+def load_deferred(db) -> list[list[dict]]:
+    """
+    Read clusters deferred by earlier runs from the queue, expiring stale ones.
+
+    The rows stay queued: each cluster's representative carries its row id
+    as "queued_id", and the row is only marked taken (consume_queued) in the
+    same transaction as the cluster's investigation checkpoint, so a run
+    that dies first leaves it for the next one.
+    """
+    cutoff = datetime.utcnow() - timedelta(hours=DEFERRED_MAX_AGE_HOURS)
+    clusters = []
+    for row in db.query(QueuedInvestigation).filter(QueuedInvestigation.status == "deferred").all():
+        if row.created_at < cutoff:
+            row.status = "expired"
+            continue
+        cluster = json.loads(row.payload)
+        cluster[0]["queued_id"] = row.id
+        clusters.append(cluster)
+    db.commit()
+    return clusters
+
+
+def consume_queued(db, clusters: list[list[dict]]):
+    """Mark the queue rows clusters were loaded from as taken; committed by the caller."""
+    ids = [cluster[0]["queued_id"] for cluster in clusters if cluster[0].get("queued_id")]
+    if ids:
+        db.query(QueuedInvestigation).filter(
+            QueuedInvestigation.id.in_(ids), QueuedInvestigation.status == "deferred"
+        ).update({"status": "requeued"}, synchronize_session=False)
+
+
+def defer(db, clusters: list[list[dict]], run_id: Optional[int]):
+    """Put clusters that did not fit in this run's budget on the queue."""
+    for cluster in clusters:
+        queued_id = cluster[0].get("queued_id")
+        row = db.get(QueuedInvestigation, queued_id) if queued_id else None
+        # Still queued from an earlier run: keep the row (and its age)
+        if row is None or row.status != "deferred":
+            db.add(QueuedInvestigation(
+                symbol=cluster[0]["symbol"],
+                payload=json.dumps(cluster, default=str),
+                priority=max(p.get("priority", 0.0) for p in cluster),
+                run_id=run_id
+            ))
+        checkpoint(db, run_id, "deferred", cluster[0]["symbol"])
+    db.commit()
+
+
+def build_prompt(pump: dict, bundle: dict, co_moving: list[str] = None) -> str:
+    """Build the analysis prompt for a pump (or a cluster's representative)."""
+    return get_evidence_prompt(pump["symbol"], pump["price_change_pct"],
+                               format_bundle(bundle), co_moving)
+
+
+async def investigate(pump: dict, prompt: str, supervisor: ProcessSupervisor,
+                      meter: Optional[UsageMeter] = None) -> dict:
+    """Run the single model analysis call for a pump."""
+    response = await run_claude_async(prompt, timeout=ANALYSIS_TIMEOUT_SECONDS,
+                                      supervisor=supervisor, meter=meter)
+    investigation = parse_investigation_results(response["result"])
+    investigation["symbol"] = pump["symbol"]
+    return investigation
+
+
+def save_investigation(db, pump: dict, investigation: dict, include_findings: bool = True) -> Pump:
+    """Save a pump with its findings and trigger, reusing a pump seen in the last hour."""
+    pump_row = db.query(Pump).filter(
+        Pump.symbol == pump["symbol"],
+        Pump.detected_at > datetime.utcnow() - timedelta(hours=1)
+    ).first()
+
+    if not pump_row:
+        pump_row = Pump(
+            symbol=pump["symbol"],
+            price_change_pct=pump["price_change_pct"],
+            time_window_minutes=pump.get("time_window_minutes", 60),
+            price_at_detection=pump.get("price_at_detection"),
+            volume_change_pct=pump.get("volume_change_pct"),
+            market_cap=pump.get("market_cap"),
+            source=pump.get("source", "unknown"),
+            detection_profile=pump.get("profile")
+        )
+        db.add(pump_row)
+        db.flush()
+        schedule_outcomes(db, pump_row)
+
+    from_rules = investigation.get("classified_by") == "rules"
+    for finding in investigation.get("findings", []) if include_findings else []:
+        content = finding.get("content") or ""
+        if not from_rules and len(content) <= MIN_FINDING_LENGTH:
+            continue
+        db.add(Finding(
+            pump_id=pump_row.id,
+            source_type=finding.get("source_type", "web"),
+            source_url=finding.get("source_url"),
+            content=content,
+            relevance_score=finding.get("relevance_score", 0.5),
+            sentiment=finding.get("sentiment", "neutral")
+        ))
+
+    trigger = investigation.get("likely_trigger") or {}
+    confidence = trigger.get("confidence", 0.0)
+    existing = db.query(NewsTrigger).filter(NewsTrigger.pump_id == pump_row.id).first()
+    if existing is None or confidence > (existing.confidence or 0.0):
+        if existing is not None:
+            db.delete(existing)
+            db.flush()
+        db.add(NewsTrigger(
+            pump_id=pump_row.id,
+            trigger_type=trigger.get("trigger_type", "unknown"),
+            description=trigger.get("description", ""),
+            confidence=confidence
+        ))
+
+    db.commit()
+    refresh_symbol_summaries(db, [pump_row.symbol])
+    return pump_row
+
+
+def member_investigation(investigation: dict, representative: str) -> dict:
+    """
+    The investigation saved for a co-moving cluster member.
+
+    The specific trigger explains the representative's move; a member only
+    moved with it, so it is recorded as following the cluster and points
+    to the representative for the trigger.
+    """
+    trigger = investigation.get("likely_trigger") or {}
+    description = f"Moved together with {representative} (co-moving cluster)"
+    if trigger.get("trigger_type", "unknown") != "unknown":
+        description += f"; see {representative} for the likely trigger ({trigger['trigger_type']})"
+    return {
+        "likely_trigger": {
+            "trigger_type": "market_trend",
+            "description": description,
+            "confidence": trigger.get("confidence", 0.0),
+        },
+        "findings": [],
+    }
+
+
+def unanalyzed_investigation(reason: str) -> dict:
+    """
+    The investigation saved for a pump the model did not get to analyze.
+
+    The pump is still recorded (trigger unknown, with the reason) so it
+    shows up on the dashboard, but it is not alerted on.
+    """
+    return {
+        "likely_trigger": {"trigger_type": "unknown", "description": reason, "confidence": 0.0},
+        "findings": [],
+        "summary": reason,
+        "skipped": True,
+    }
+
+
+async def notify(db, pump_row: Pump, pump: dict, investigation: dict,
+                 supervisor: Optional[ProcessSupervisor] = None, run_id: Optional[int] = None) -> bool:
+    """Send the Telegram alert for a pump and record the notification and its usage."""
+    prompt = get_telegram_report_prompt(pump, investigation)
+    meter = UsageMeter()
+    try:
+        response = await run_claude_async(prompt, allowed_tools=TELEGRAM_MCP_TOOLS,
+                                          timeout=ANALYSIS_TIMEOUT_SECONDS,
+                                          supervisor=supervisor, meter=meter)
+        sent = not response["is_error"]
+    except subprocess.TimeoutExpired:
+        sent = False
+    record_usage(db, meter.usage, "notification", run_id, pump_row.id, pump_row.symbol, prompt)
+
+    db.add(Notification(
+        pump_id=pump_row.id,
+        channel="telegram",
+        message=prompt,
+        status="sent" if sent else "failed"
+    ))
+    db.commit()
+    return sent
+
+
+def queue_alert(pump_row: Pump, pump: dict, investigation: dict, run_id: Optional[int] = None):
+    """
+    Hand a pump's Telegram alert to the notifications queue.
+
+    The alert is checkpointed as notified by send_pump_alert once it is
+    sent, so an alert lost from the queue or out of retries is queued again
+    by a later run (see checkpoints.take_over), whether or not its own run
+    completed.
+    """
+    from .tasks import send_pump_alert
+    payload = json.loads(json.dumps({"pump": pump, "investigation": investigation}, default=str))
+    send_pump_alert.delay(pump_row.id, payload["pump"], payload["investigation"], run_id)
+
+
+def save_cluster(db, cluster: list[dict], investigation: dict, usage_row=None,
+                 run_id: Optional[int] = None) -> Pump:
+    """Save a cluster's investigation and checkpoint it (with its queue row, if any)."""
+    pump, members = cluster[0], cluster[1:]
+    # Findings and the specific trigger belong to the representative
+    pump_row = save_investigation(db, pump, investigation)
+    for member in members:
+        save_investigation(db, member, member_investigation(investigation, pump["symbol"]),
+                           include_findings=False)
+    if usage_row is not None:
+        usage_row.pump_id = pump_row.id
+    consume_queued(db, [cluster])
+    checkpoint(db, run_id, "investigated", pump["symbol"], investigation)
+    return pump_row
+
+
+async def investigate_cluster(db, log: Callable[[str], None], cluster: list[dict], bundle: dict,
+                              investigation: Optional[dict], prompt: Optional[str],
+                              budget: RunBudget, supervisor: ProcessSupervisor, stats: dict,
+                              run_id: Optional[int] = None, reserved_tokens: int = 0,
+                              reserved_cost: float = 0.0):
+    """
+    Analyze (unless already classified), save and report one cluster.
+
+    db must be this cluster's own session: its blocking database work runs
+    in a worker thread so the event loop keeps driving the other
+    investigations meanwhile.
+    """
+    pump, members = cluster[0], cluster[1:]
+    co_moving = [m["symbol"] for m in members]
+
+    item_count = sum(len(items) for items in bundle["items"].values())
+    log(f"→ Investigating {pump['symbol']} (+{pump['price_change_pct']:.1f}% {pump.get('profile', '')}, "
+        f"priority {pump.get('priority', 0):.2f}, {item_count} evidence items)"
+        + (f" for cluster of {len(cluster)}: {', '.join(co_moving)}" if members else ""))
+
+    usage_row = None
+    if investigation:
+        log(f"Fast path: {pump['symbol']} classified by rules, skipping model analysis")
+        stats["fast_path"] += 1
+    else:
+        started = time.monotonic()
+        meter = UsageMeter(PUMP_TOKEN_BUDGET)
+        try:
+            investigation = await investigate(pump, prompt, supervisor, meter)
+        except subprocess.TimeoutExpired:
+            log(f"⚠ Analysis of {pump['symbol']} timed out, saving it without a trigger")
+            investigation = unanalyzed_investigation(
+                f"Analysis timed out after {ANALYSIS_TIMEOUT_SECONDS}s")
+        except BudgetExceeded:
+            log(f"⚠ Analysis of {pump['symbol']} stopped at {meter.tokens} tokens "
+                f"(per-pump limit {PUMP_TOKEN_BUDGET}), saving it without a trigger")
+            investigation = unanalyzed_investigation(
+                f"Analysis stopped at {meter.tokens} tokens (per-pump limit {PUMP_TOKEN_BUDGET})")
+        finally:
+            usage = meter.usage
+            budget.record(time.monotonic() - started, meter.tokens or reserved_tokens,
+                          usage["cost_usd"] or reserved_cost, reserved_tokens, reserved_cost)
+            usage_row = await asyncio.to_thread(record_usage, db, usage, "investigation", run_id,
+                                                symbol=pump["symbol"], prompt=prompt)
+
+    if members:
+        investigation["summary"] = (
+            f"{investigation.get('summary', '')} Moved together with: {', '.join(co_moving)}."
+        ).strip()
+
+    pump_row = await asyncio.to_thread(save_cluster, db, cluster, investigation, usage_row, run_id)
+    if investigation.get("skipped"):
+        return
+    stats["findings_count"] += len(investigation.get("findings", []))
+
+    trigger = investigation.get("likely_trigger") or {}
+    log(f"✓ {pump['symbol']}: {trigger.get('trigger_type', 'unknown')} "
+        f"({trigger.get('confidence', 0) * 100:.0f}% confidence)")
+
+    if TELEGRAM_CHAT_ID:
+        await asyncio.to_thread(queue_alert, pump_row, pump, investigation, run_id)
+        stats["notifications_queued"] += 1
+
+
+def queue_pending_alerts(db, log: Callable[[str], None], to_notify: list[tuple[list[dict], dict]],
+                         stats: dict, run_id: Optional[int] = None):
+    """Queue alerts for investigations an earlier run finished but never got sent."""
+    if not TELEGRAM_CHAT_ID:
+        return
+    for cluster, investigation in to_notify:
+        pump = cluster[0]
+        pump_row = db.query(Pump).filter(Pump.symbol == pump["symbol"]).order_by(Pump.detected_at.desc()).first()
+        if pump_row is None:
+            continue
+        checkpoint(db, run_id, "investigated", pump["symbol"], investigation)
+        queue_alert(pump_row, pump, investigation, run_id)
+        log(f"✓ Queued pending alert for {pump['symbol']}")
+        stats["notifications_queued"] += 1
+
+
+async def investigate_all(db, log: Callable[[str], None], clusters: list[list[dict]],
+                          stats: dict, run_id: Optional[int] = None):
+    """
+    Investigate clusters concurrently, highest priority first.
+
+    Up to CLAUDE_MAX_CONCURRENCY clusters are worked on at once on this
+    event loop, each with its own database session. Evidence is only gathered for a cluster once it gets a
+    slot, and the budget (run time, run tokens and cost, and what the
+    daily ceilings leave) is checked as each slot frees up and again
+    against the cluster's prompt before its model call; everything not
+    yet started when it runs out is deferred to the next run. Model calls
+    reserve their estimated tokens and cost while they run; a cluster whose
+    prompt alone is over PUMP_TOKEN_BUDGET is saved with an unknown trigger.
+    """
+    tokens_today, cost_today = usage_today(db)
+    budget = RunBudget(
+        daily_tokens_left=DAILY_TOKEN_BUDGET - tokens_today if DAILY_TOKEN_BUDGET else None,
+        daily_cost_left=DAILY_COST_BUDGET_USD - cost_today if DAILY_COST_BUDGET_USD else None
+    )
+    supervisor = ProcessSupervisor()
+    slots = asyncio.Semaphore(supervisor.max_concurrent)
+    tasks = []
+    over_budget = []  # clusters that got a slot but whose prompt no longer fit
+
+    async def run(cluster: list[dict]):
+        # Each cluster gets its own session; they are only used from worker threads
+        task_db = Session(bind=db.get_bind())
+        try:
+            pump, members = cluster[0], cluster[1:]
+            bundle = await collect_evidence(cluster)
+            investigation = fast_path(bundle)
+            prompt = None if investigation else build_prompt(pump, bundle, [m["symbol"] for m in members])
+            estimated_tokens, estimated_cost = 0, 0.0
+            if prompt:
+                prompt_tokens = estimate_tokens(prompt)
+                estimated_tokens = prompt_tokens + ANALYSIS_OUTPUT_TOKENS
+                # Priced from the prompt until a call of this run has finished
+                estimated_cost = budget.estimated_cost(estimate_cost(
+                    {"input_tokens": prompt_tokens, "output_tokens": ANALYSIS_OUTPUT_TOKENS}))
+            if PUMP_TOKEN_BUDGET and estimated_tokens > PUMP_TOKEN_BUDGET:
+                log(f"⚠ Skipping analysis of {pump['symbol']}: its prompt alone needs ~{estimated_tokens} "
+                    f"tokens (per-pump limit {PUMP_TOKEN_BUDGET})")
+                await asyncio.to_thread(save_cluster, task_db, cluster, unanalyzed_investigation(
+                    f"Not analyzed: prompt needs ~{estimated_tokens} tokens (per-pump limit {PUMP_TOKEN_BUDGET})"
+                ), None, run_id)
+                return
+            if over_budget or not budget.can_afford(estimated_tokens, prompt is not None, estimated_cost):
+                over_budget.append(cluster)
+                return
+
+            budget.reserve(estimated_tokens, estimated_cost)
+            await investigate_cluster(task_db, log, cluster, bundle, investigation, prompt, budget,
+                                      supervisor, stats, run_id, estimated_tokens, estimated_cost)
+        finally:
+            await asyncio.to_thread(task_db.close)
+            slots.release()
+
+    remaining = []
+    try:
+        for index, cluster in enumerate(clusters):
+            await slots.acquire()
+            if over_budget or not budget.can_afford(model_call=False):
+                slots.release()
+                remaining = clusters[index:]
+                break
+            tasks.append(asyncio.create_task(run(cluster)))
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        await supervisor.shutdown()
+        await close_client()
+
+    remaining = over_budget + remaining
+    if remaining:
+        defer(db, remaining, run_id)
+        stats["deferred"] = sum(len(c) for c in remaining)
+        log(f"⚠ Run budget spent after {budget.elapsed:.0f}s ({budget.tokens_used} tokens, "
+            f"${budget.cost_used:.2f}), deferring {len(remaining)} investigations to the next run")
+
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+
+def detect_phase(db, log: Callable[[str], None],
+                 profiles: list[tuple[float, int]]) -> tuple[list[list[dict]], int]:
+    """Detect and cluster this run's pumps; returns (clusters, pumps detected)."""
+    log("Scanning Binance and CoinMarketCap...")
+    history = load_history(db, max(w for _, w in profiles))
+    covered = [profile_name(t, w) for t, w in profiles if history.covers(w)]
+    if covered:
+        log(f"Using stored price history for {', '.join(covered)}")
+    stats = load_symbol_stats()
+    universe = load_universe(db)
+    clusters, illiquid = asyncio.run(detect(profiles, history, stats, universe))
+    pumps_detected = sum(len(cluster) for cluster in clusters)
+    if illiquid:
+        log(f"Skipped {illiquid} pumps below the liquidity floors")
+    log(f"Detected {pumps_detected} pumps in {len(clusters)} distinct events")
+    return clusters, pumps_detected
+
+
+def run_pipeline(db, log: Callable[[str], None], profiles: list[tuple[float, int]],
+                 run_id: Optional[int] = None) -> dict:
+    """
+    Run detection, investigation and reporting for one agent run.
+
+    Clusters are investigated highest priority first until the run budget
+    is spent; the rest are deferred to the next run. Every phase is
+    checkpointed, so the next run takes over what failed or timed-out runs
+    left behind (the reaper queues one right away for a dead worker's run).
+
+    Returns:
+        dict with pumps_detected, findings_count, notifications_queued,
+        fast_path (pumps classified without a model call) and deferred
+    """
+    clusters, pumps_detected = detect_phase(db, log, profiles)
+    detected = {p["symbol"] for cluster in clusters for p in cluster}
+
+    carried_over, superseded = [], []
+    for cluster in load_deferred(db):
+        (superseded if detected & {p["symbol"] for p in cluster} else carried_over).append(cluster)
+    if carried_over:
+        log(f"Resuming {len(carried_over)} deferred investigations from earlier runs")
+
+    unfinished, to_notify = take_over(db, run_id, DEFERRED_MAX_AGE_HOURS)
+    # Pumps detected again are investigated (and alerted) afresh; a cluster
+    # an interrupted run had taken off the queue is still queued
+    queued = detected | {p["symbol"] for cluster in carried_over for p in cluster}
+    unfinished = [c for c in unfinished if not queued & {p["symbol"] for p in c}]
+    to_notify = [(c, inv) for c, inv in to_notify if not detected & {p["symbol"] for p in c}]
+    if unfinished or to_notify:
+        log(f"Taking over {len(unfinished)} investigations and {len(to_notify)} alerts "
+            "from earlier runs")
+    clusters += carried_over + unfinished
+
+    symbols = [p["symbol"] for cluster in clusters for p in cluster]
+    clusters = prioritize_clusters(clusters, recent_pump_counts(db, symbols))
+    # Queue rows of deferred clusters detected again are replaced by the fresh ones
+    consume_queued(db, superseded)
+    checkpoint(db, run_id, "detected", payload=clusters)
+
+    stats = {"pumps_detected": pumps_detected, "findings_count": 0, "notifications_queued": 0,
+             "fast_path": 0, "deferred": 0}
+    queue_pending_alerts(db, log, to_notify, stats, run_id)
+    asyncio.run(investigate_all(db, log, clusters, stats, run_id))
+    return stats
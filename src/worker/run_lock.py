@@ -0,0 +1,189 @@
+"""
+Agent run lock and heartbeats.
+
+Only one agent run may be queued or running at a time. The lock is a Redis
+key holding the owning run id: it is taken when a run is enqueued, kept
+alive by the worker's heartbeat while the run executes and released when
+it finishes. A worker that dies stops heartbeating; the reaper then fails
+its run and frees the lock instead of leaving a ghost "running" row.
+
+Alert sends take a short per-pump lock the same way, so two copies of one
+pump's alert (e.g. a retry and the copy a take-over run queued) never
+send at the same time.
+"""
+
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Optional
+
+import redis
+from sqlalchemy import func
+
+from src.web.models import AgentRun
+
+from .log_archive import store_run_logs
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
+RUN_LOCK_KEY = "pump-researcher:run-lock"
+# Covers queue wait plus the task time limit; heartbeats extend it while running
+RUN_LOCK_TTL_SECONDS = int(os.getenv("RUN_LOCK_TTL_SECONDS", "1800"))
+RUN_HEARTBEAT_SECONDS = int(os.getenv("RUN_HEARTBEAT_SECONDS", "30"))
+# A running run without a heartbeat for this long belongs to a dead worker
+RUN_HEARTBEAT_STALE_SECONDS = int(os.getenv("RUN_HEARTBEAT_STALE_SECONDS", "300"))
+# A queued run no worker picked up within this long is abandoned
+RUN_QUEUED_MAX_SECONDS = int(os.getenv("RUN_QUEUED_MAX_SECONDS", "1800"))
+
+ALERT_LOCK_KEY = "pump-researcher:alert-lock:{pump_id}"
+# Outlasts one send_pump_alert attempt (270s hard time limit)
+ALERT_LOCK_TTL_SECONDS = 300
+
+# Only the owner may extend or delete the lock
+_REFRESH_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def _client() -> redis.Redis:
+    return redis.Redis.from_url(REDIS_URL)
+
+
+def acquire_run_lock(run_id: int) -> bool:
+    """Take the run lock for run_id (False if another run holds it or Redis is down)."""
+    try:
+        return bool(_client().set(RUN_LOCK_KEY, str(run_id), nx=True, ex=RUN_LOCK_TTL_SECONDS))
+    except redis.RedisError as e:
+        print(f"Error acquiring run lock: {e}")
+        return False
+
+
+def lock_holder() -> Optional[int]:
+    """Id of the run holding the lock, if any."""
+    try:
+        holder = _client().get(RUN_LOCK_KEY)
+    except redis.RedisError as e:
+        print(f"Error reading run lock: {e}")
+        return None
+    return int(holder) if holder else None
+
+
+def refresh_run_lock(run_id: int) -> bool:
+    """Extend the lock's TTL; False if run_id no longer owns it."""
+    try:
+        return bool(_client().eval(_REFRESH_SCRIPT, 1, RUN_LOCK_KEY, str(run_id), RUN_LOCK_TTL_SECONDS))
+    except redis.RedisError as e:
+        print(f"Error refreshing run lock: {e}")
+        return False
+
+
+def release_run_lock(run_id: int) -> bool:
+    """Release the lock if run_id still owns it."""
+    try:
+        return bool(_client().eval(_RELEASE_SCRIPT, 1, RUN_LOCK_KEY, str(run_id)))
+    except redis.RedisError as e:
+        print(f"Error releasing run lock: {e}")
+        return False
+
+
+def acquire_alert_lock(pump_id: int, owner: str) -> bool:
+    """Take the send lock of a pump's alert (False if another send holds it or Redis is down)."""
+    try:
+        return bool(_client().set(ALERT_LOCK_KEY.format(pump_id=pump_id), owner,
+                                  nx=True, ex=ALERT_LOCK_TTL_SECONDS))
+    except redis.RedisError as e:
+        print(f"Error acquiring alert lock of pump #{pump_id}: {e}")
+        return False
+
+
+def release_alert_lock(pump_id: int, owner: str) -> bool:
+    """Release a pump's alert send lock if owner still holds it."""
+    try:
+        return bool(_client().eval(_RELEASE_SCRIPT, 1, ALERT_LOCK_KEY.format(pump_id=pump_id), owner))
+    except redis.RedisError as e:
+        print(f"Error releasing alert lock of pump #{pump_id}: {e}")
+        return False
+
+
+class RunHeartbeat:
+    """Background thread stamping a run's heartbeat and extending its lock."""
+
+    def __init__(self, run_id: int, session_factory, interval: int = RUN_HEARTBEAT_SECONDS):
+        self.run_id = run_id
+        self.session_factory = session_factory
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._beat, name=f"heartbeat-{run_id}", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _beat(self):
+        while not self._stop.wait(self.interval):
+            self.beat()
+
+    def beat(self):
+        # Own session: the run's session belongs to the task thread
+        db = self.session_factory()
+        try:
+            # Not a change the dashboard shows: leaves the agent_runs version alone
+            db.query(AgentRun).filter(AgentRun.id == self.run_id).execution_options(versioned=False).update(
+                {AgentRun.heartbeat_at: datetime.utcnow()}, synchronize_session=False
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"Error recording heartbeat for run #{self.run_id}: {e}")
+        finally:
+            db.close()
+        refresh_run_lock(self.run_id)
+
+
+def reap_stuck_runs(db, now: datetime = None) -> list[int]:
+    """
+    Fail runs whose worker died and release their lock.
+
+    Running runs are stuck once their heartbeat (or start, if they never
+    beat) is older than RUN_HEARTBEAT_STALE_SECONDS; queued runs once no
+    worker picked them up within RUN_QUEUED_MAX_SECONDS. The worker's logs
+    died with it, so each reaped run gets a one-line log saying why it failed.
+
+    Returns:
+        Ids of the runs marked failed
+    """
+    now = now or datetime.utcnow()
+    last_seen = func.coalesce(AgentRun.heartbeat_at, AgentRun.started_at)
+    stuck = db.query(AgentRun).filter(
+        ((AgentRun.status == "running") &
+         (last_seen < now - timedelta(seconds=RUN_HEARTBEAT_STALE_SECONDS))) |
+        ((AgentRun.status == "queued") &
+         (AgentRun.started_at < now - timedelta(seconds=RUN_QUEUED_MAX_SECONDS)))
+    ).all()
+
+    for run in stuck:
+        if run.status == "running":
+            seen = run.heartbeat_at or run.started_at
+            run.error_message = (f"Worker heartbeat lost: none since {seen:%Y-%m-%d %H:%M:%S} UTC, "
+                                 f"marked failed by the reaper")
+        else:
+            run.error_message = (f"Never picked up by a worker within {RUN_QUEUED_MAX_SECONDS}s, "
+                                 f"marked failed by the reaper")
+        run.status = "failed"
+        run.completed_at = now
+        store_run_logs(run, "\n".join(filter(None, [run.logs, f"Run #{run.id} failed: {run.error_message}"])))
+        release_run_lock(run.id)
+    db.commit()
+    return [run.id for run in stuck]
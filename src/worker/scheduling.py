@@ -0,0 +1,115 @@
+"""
+Adaptive detection schedule.
+
+Instead of a fixed hourly run, beat checks every DETECTION_CHECK_SECONDS
+whether a run is due. The interval shrinks as the market heats up: it is
+derived from market-wide volatility (median absolute return across all
+symbols) and breadth (share of symbols moving by at least
+BREADTH_MOVE_PCT) over the last VOLATILITY_WINDOW_MINUTES of stored price
+snapshots, and interpolated between DETECTION_MAX_INTERVAL_SECONDS for a
+flat market and DETECTION_MIN_INTERVAL_SECONDS for a hot one. Snapshots
+older than SNAPSHOT_STALE_SECONDS (a few missed one-minute snapshot ticks)
+give no signal, so a stalled snapshot task falls back to the slowest
+interval instead of scheduling from old prices.
+"""
+
+import os
+from datetime import datetime, timedelta
+from statistics import median
+from typing import Optional
+
+from sqlalchemy import func
+
+from src.web.models import AgentRun, PriceSnapshot
+
+DETECTION_CHECK_SECONDS = int(os.getenv("DETECTION_CHECK_SECONDS", "60"))
+DETECTION_MIN_INTERVAL_SECONDS = int(os.getenv("DETECTION_MIN_INTERVAL_SECONDS", "300"))
+DETECTION_MAX_INTERVAL_SECONDS = int(os.getenv("DETECTION_MAX_INTERVAL_SECONDS", "7200"))
+VOLATILITY_WINDOW_MINUTES = int(os.getenv("VOLATILITY_WINDOW_MINUTES", "60"))
+# Snapshots are recorded every minute (celery_app beat); three missed ticks mean they stalled
+SNAPSHOT_STALE_SECONDS = int(os.getenv("SNAPSHOT_STALE_SECONDS", "180"))
+
+# Median absolute return (%) over the window for a flat and for a hot market
+VOLATILITY_QUIET_PCT = float(os.getenv("VOLATILITY_QUIET_PCT", "0.3"))
+VOLATILITY_HOT_PCT = float(os.getenv("VOLATILITY_HOT_PCT", "2.0"))
+# Share of symbols moving at least BREADTH_MOVE_PCT for a flat and for a hot market
+BREADTH_MOVE_PCT = float(os.getenv("BREADTH_MOVE_PCT", "2.0"))
+BREADTH_QUIET = float(os.getenv("BREADTH_QUIET", "0.02"))
+BREADTH_HOT = float(os.getenv("BREADTH_HOT", "0.15"))
+
+
+def _scale(value: float, quiet: float, hot: float) -> float:
+    """Position of value between quiet (0) and hot (1), clipped."""
+    if hot <= quiet:
+        return 0.0
+    return min(1.0, max(0.0, (value - quiet) / (hot - quiet)))
+
+
+def market_heat(db, now: datetime = None) -> Optional[dict]:
+    """
+    Volatility and breadth of the whole market over the last window.
+
+    Returns:
+        dict with volatility_pct, breadth, symbols and heat (0 flat .. 1 hot),
+        or None when there are not enough snapshots yet
+    """
+    now = now or datetime.utcnow()
+    latest = db.query(func.max(PriceSnapshot.captured_at)).filter(
+        PriceSnapshot.captured_at <= now
+    ).scalar()
+    if latest is None:
+        return None
+    start = db.query(func.max(PriceSnapshot.captured_at)).filter(
+        PriceSnapshot.captured_at <= latest - timedelta(minutes=VOLATILITY_WINDOW_MINUTES)
+    ).scalar()
+    # Stale or too short history says nothing about the market right now
+    if start is None or latest < now - timedelta(seconds=SNAPSHOT_STALE_SECONDS):
+        return None
+
+    rows = db.query(PriceSnapshot.symbol, PriceSnapshot.captured_at, PriceSnapshot.price).filter(
+        PriceSnapshot.captured_at.in_([start, latest])
+    ).all()
+    opens = {symbol: price for symbol, at, price in rows if at == start and price}
+    returns = [
+        abs(price / opens[symbol] - 1) * 100
+        for symbol, at, price in rows
+        if at == latest and symbol in opens
+    ]
+    if not returns:
+        return None
+
+    volatility = median(returns)
+    breadth = sum(r >= BREADTH_MOVE_PCT for r in returns) / len(returns)
+    heat = max(_scale(volatility, VOLATILITY_QUIET_PCT, VOLATILITY_HOT_PCT),
+               _scale(breadth, BREADTH_QUIET, BREADTH_HOT))
+    return {"volatility_pct": volatility, "breadth": breadth, "symbols": len(returns), "heat": heat}
+
+
+def detection_interval(heat: Optional[float]) -> int:
+    """
+    Seconds between detection runs for a market heat.
+
+    Interpolated geometrically, so each step of heat shortens the interval
+    by the same factor. Without a signal the slowest interval applies.
+    """
+    if heat is None:
+        return DETECTION_MAX_INTERVAL_SECONDS
+    ratio = DETECTION_MIN_INTERVAL_SECONDS / DETECTION_MAX_INTERVAL_SECONDS
+    return round(DETECTION_MAX_INTERVAL_SECONDS * ratio ** heat)
+
+
+def detection_due(db, now: datetime = None) -> tuple[bool, int, Optional[dict]]:
+    """
+    Whether a scheduled detection run should start now.
+
+    Returns:
+        (due, current interval in seconds, market signal or None)
+    """
+    now = now or datetime.utcnow()
+    signal = market_heat(db, now)
+    interval = detection_interval(signal["heat"] if signal else None)
+    last_started = db.query(func.max(AgentRun.started_at)).filter(
+        AgentRun.status != "skipped"
+    ).scalar()
+    due = last_started is None or (now - last_started).total_seconds() >= interval
+    return due, interval, signal
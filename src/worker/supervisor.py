@@ -0,0 +1,93 @@
+"""
+Asyncio subprocess supervisor.
+
+Runs many `claude` processes from one worker process: output is read
+without blocking a thread per process, each process has its own timeout,
+and overdue or abandoned processes get SIGTERM, then SIGKILL after a grace
+period.
+"""
+
+import asyncio
+import os
+import subprocess
+from typing import Callable, Optional
+
+MAX_CONCURRENT_PROCESSES = int(os.getenv("CLAUDE_MAX_CONCURRENCY", "4"))
+KILL_GRACE_SECONDS = float(os.getenv("CLAUDE_KILL_GRACE_SECONDS", "5"))
+
+# stream-json lines can carry whole tool results; asyncio's default limit is 64 KiB
+STREAM_LIMIT = 16 * 1024 * 1024
+
+
+class ProcessSupervisor:
+    """Bounded pool of concurrently running subprocesses on the current event loop."""
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_PROCESSES):
+        self.max_concurrent = max_concurrent
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._processes: set[asyncio.subprocess.Process] = set()
+
+    @property
+    def running(self) -> int:
+        return len(self._processes)
+
+    async def run(self, cmd: list[str], timeout: float, cwd: str = None,
+                  on_line: Optional[Callable[[str], None]] = None) -> tuple[int, list[str]]:
+        """
+        Run a command once a slot is free and collect its output lines.
+
+        Returns:
+            (returncode, output lines)
+
+        Raises:
+            subprocess.TimeoutExpired: if the process does not finish in time
+        """
+        async with self._semaphore:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                cwd=cwd,
+                limit=STREAM_LIMIT
+            )
+            self._processes.add(process)
+            lines = []
+            try:
+                await asyncio.wait_for(self._read(process, lines, on_line), timeout)
+            except asyncio.TimeoutError:
+                raise subprocess.TimeoutExpired(cmd, timeout, output="\n".join(lines))
+            finally:
+                # Also reached when the caller is cancelled
+                await asyncio.shield(self.terminate(process))
+                self._processes.discard(process)
+
+        return process.returncode, lines
+
+    async def _read(self, process: asyncio.subprocess.Process, lines: list[str],
+                    on_line: Optional[Callable[[str], None]]):
+        while True:
+            raw = await process.stdout.readline()
+            if not raw:
+                break
+            line = raw.decode(errors="replace").rstrip("\n")
+            lines.append(line)
+            if on_line:
+                on_line(line)
+        await process.wait()
+
+    async def terminate(self, process: asyncio.subprocess.Process):
+        """Stop a process: SIGTERM, then SIGKILL if it outlives the grace period."""
+        if process.returncode is not None:
+            return
+        try:
+            process.terminate()
+            await asyncio.wait_for(process.wait(), KILL_GRACE_SECONDS)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+        except ProcessLookupError:
+            pass
+
+    async def shutdown(self):
+        """Terminate every process still running."""
+        await asyncio.gather(*(self.terminate(p) for p in list(self._processes)))
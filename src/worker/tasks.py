@@ -2,11 +2,10 @@
 
 import subprocess
 import os
-import re
 from datetime import datetime
-from pathlib import Path
 from contextlib import contextmanager
 
+from celery.exceptions import MaxRetriesExceededError, SoftTimeLimitExceeded
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
@@ -18,11 +17,16 @@ engine = create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Import models after engine setup to avoid circular imports
-from src.web.models import AgentRun
+from src.web.models import AgentRun, Notification, Pump, RunCheckpoint
+from src.agents.pump_detector import get_detection_profiles, profile_name
+from .log_archive import archive_run_logs, store_run_logs
+from .run_lock import (RunHeartbeat, acquire_alert_lock, acquire_run_lock, lock_holder, reap_stuck_runs,
+                       release_alert_lock, release_run_lock)
 
-# Settings from environment
-PUMP_THRESHOLD_PCT = float(os.getenv("PUMP_THRESHOLD_PCT", "5.0"))
-PUMP_TIME_WINDOW_MINUTES = int(os.getenv("PUMP_TIME_WINDOW_MINUTES", "60"))
+# CoinMarketCap listings fetched per universe refresh (one credit per 200)
+UNIVERSE_CMC_LIMIT = int(os.getenv("UNIVERSE_CMC_LIMIT", "1000"))
+# Failed Telegram sends are retried this many times, a minute apart
+ALERT_MAX_RETRIES = int(os.getenv("ALERT_MAX_RETRIES", "3"))
 
 
 @contextmanager
@@ -39,122 +43,256 @@ def get_db_session():
         db.close()
 
 
+def queue_agent_run(db) -> dict:
+    """Create a queued run holding the run lock; the caller starts it once committed."""
+    run = AgentRun(status="queued")
+    db.add(run)
+    db.flush()
+    run_id = run.id
+    if not acquire_run_lock(run_id):
+        db.rollback()
+        return {"skipped": True, "running_run_id": lock_holder()}
+    db.commit()
+    return {"run_id": run_id, "status": "queued"}
+
+
 @celery_app.task(bind=True)
 def run_pump_agent(self, run_id: int):
     """Run the pump research agent for a specific run."""
+    # Released however the run ends (the release is a no-op unless this run holds the lock)
+    try:
+        with get_db_session() as db:
+            run = db.query(AgentRun).filter(AgentRun.id == run_id).first()
+            if not run:
+                return {"error": "Run not found"}
 
-    with get_db_session() as db:
-        run = db.query(AgentRun).filter(AgentRun.id == run_id).first()
-        if not run:
-            return {"error": "Run not found"}
-
-        run.status = "running"
-        run.started_at = datetime.utcnow()
-        db.commit()
-
-        logs = []
-        pumps_detected = 0
-        findings_count = 0
+            # The lock was taken when the run was queued; retake it if it expired meanwhile
+            if lock_holder() != run_id and not acquire_run_lock(run_id):
+                run.status = "skipped"
+                run.error_message = "Another agent run holds the run lock"
+                run.completed_at = datetime.utcnow()
+                db.commit()
+                return {"run_id": run_id, "status": run.status}
 
-        try:
-            logs.append(f"Starting pump research agent (run #{run_id})")
-            logs.append(f"Threshold: {PUMP_THRESHOLD_PCT}%")
-            logs.append(f"Time window: {PUMP_TIME_WINDOW_MINUTES} minutes")
-
-            # Generate the orchestrator prompt
-            from src.agents.orchestrator import generate_full_prompt
-            prompt = generate_full_prompt(
-                PUMP_THRESHOLD_PCT,
-                PUMP_TIME_WINDOW_MINUTES
-            )
-            logs.append(f"Prompt generated ({len(prompt)} bytes)")
-
-            # Write prompt to temp file
-            prompt_file = Path(f"/tmp/pump_prompt_{run_id}.txt")
-            prompt_file.write_text(prompt)
-
-            # Run Claude Code
-            logs.append("Starting Claude Code...")
-
-            # Only allow MCP tools - no file access, no bash
-            cmd = [
-                "claude",
-                prompt,
-                "--allowedTools", "mcp__*",
-                "--output-format", "stream-json",
-                "--verbose"
-            ]
-
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                cwd="/app"
-            )
+            run.status = "running"
+            run.started_at = run.heartbeat_at = datetime.utcnow()
+            db.commit()
 
-            # Stream output
-            for line in iter(process.stdout.readline, ''):
-                if line:
-                    logs.append(line.rstrip())
+            logs = []
+            pumps_detected = 0
+            findings_count = 0
 
-                    # Extract stats from JSON output
-                    if '"pumps_detected":' in line:
-                        match = re.search(r'"pumps_detected":\s*(\d+)', line)
-                        if match:
-                            pumps_detected = int(match.group(1))
-                    if '"findings_count":' in line:
-                        match = re.search(r'"findings_count":\s*(\d+)', line)
-                        if match:
-                            findings_count = int(match.group(1))
+            try:
+                logs.append(f"Starting pump research agent (run #{run_id})")
+                profiles = get_detection_profiles()
+                logs.append("Detection profiles: " + ", ".join(profile_name(t, w) for t, w in profiles))
 
-            process.wait(timeout=600)
+                # Detection and evidence gathering run in Python; the model only
+                # analyzes each pump's pre-gathered evidence bundle
+                from .pipeline import run_pipeline
+                with RunHeartbeat(run_id, SessionLocal):
+                    stats = run_pipeline(db, logs.append, profiles, run_id)
+                pumps_detected = stats["pumps_detected"]
+                findings_count = stats["findings_count"]
 
-            if process.returncode == 0:
                 run.status = "completed"
+                logs.append(f"Fast-path classifications: {stats['fast_path']}")
+                logs.append(f"Notifications queued: {stats['notifications_queued']}")
+                if stats["deferred"]:
+                    logs.append(f"Deferred to next run: {stats['deferred']} pumps")
                 logs.append("Agent completed successfully")
-            else:
+
+            except (subprocess.TimeoutExpired, SoftTimeLimitExceeded):
+                # Checkpointed work is picked up by the next run
+                run.status = "timeout"
+                logs.append("Agent timed out")
+            except Exception as e:
+                # The session may hold a failed transaction; the run row is reloaded
+                db.rollback()
                 run.status = "failed"
-                logs.append(f"Agent exited with code {process.returncode}")
-
-            # Cleanup
-            prompt_file.unlink(missing_ok=True)
-
-        except subprocess.TimeoutExpired:
-            run.status = "timeout"
-            logs.append("Agent timed out after 10 minutes")
-            if process:
-                process.kill()
-        except Exception as e:
-            run.status = "failed"
-            run.error_message = str(e)
-            logs.append(f"Error: {str(e)}")
-
-        # Update run record
-        run.completed_at = datetime.utcnow()
-        run.pumps_detected = pumps_detected
-        run.findings_count = findings_count
-        run.logs = '\n'.join(logs)
-        db.commit()
+                run.error_message = str(e)
+                logs.append(f"Error: {str(e)}")
 
-        return {
-            "run_id": run_id,
-            "status": run.status,
-            "pumps_detected": pumps_detected,
-            "findings_count": findings_count
-        }
+            # Update run record
+            run.completed_at = datetime.utcnow()
+            run.pumps_detected = pumps_detected
+            run.findings_count = findings_count
+            store_run_logs(run, '\n'.join(logs))
+            db.commit()
+
+            return {
+                "run_id": run_id,
+                "status": run.status,
+                "pumps_detected": pumps_detected,
+                "findings_count": findings_count
+            }
+    finally:
+        release_run_lock(run_id)
 
 
 @celery_app.task
 def run_pump_agent_scheduled():
-    """Scheduled task to run pump detection."""
+    """Scheduled check: queue a detection run if the adaptive interval has elapsed."""
+    from .scheduling import detection_due
+
     with get_db_session() as db:
-        run = AgentRun(status="queued")
-        db.add(run)
-        db.commit()
-        run_id = run.id
+        due, interval, signal = detection_due(db)
+        if not due:
+            return {"due": False, "interval": interval, "market": signal}
+
+        queued = queue_agent_run(db)
+        if "run_id" not in queued:
+            return queued
 
     # Queue the actual task
-    run_pump_agent.delay(run_id)
-    return {"run_id": run_id, "status": "queued"}
+    run_pump_agent.delay(queued["run_id"])
+    return {**queued, "interval": interval, "market": signal}
+
+
+@celery_app.task(bind=True, max_retries=ALERT_MAX_RETRIES, default_retry_delay=60)
+def send_pump_alert(self, pump_id: int, pump: dict, investigation: dict, run_id: int = None):
+    """
+    Send one pump's Telegram alert (queued by the pipeline).
+
+    Idempotent: a pump that already has a sent Telegram notification (e.g.
+    the alert was queued again by a run taking over) is not sent twice, and
+    a per-pump Redis lock keeps two copies from checking and sending at the
+    same time. The queuing run's "notified" checkpoint is recorded once it
+    is sent; an alert still unsent after its last retry is recorded as a
+    "gave_up" notification.
+    """
+    import asyncio
+    from .checkpoints import checkpoint
+    from .pipeline import notify
+
+    owner = self.request.id or f"pump-{pump_id}"
+    if not acquire_alert_lock(pump_id, owner):
+        # Another copy is sending right now; by the retry it has sent or failed
+        return _retry_alert(self, pump_id, pump, "its send lock was held by another copy (or Redis was down)")
+
+    try:
+        with get_db_session() as db:
+            pump_row = db.query(Pump).filter(Pump.id == pump_id).first()
+            if not pump_row:
+                return {"error": "Pump not found"}
+            already_sent = db.query(Notification.id).filter(
+                Notification.pump_id == pump_id,
+                Notification.channel == "telegram",
+                Notification.status == "sent"
+            ).first() is not None
+            sent = already_sent or asyncio.run(notify(db, pump_row, pump, investigation, run_id=run_id))
+            if sent:
+                checkpoint(db, run_id, "notified", pump["symbol"])
+    finally:
+        release_alert_lock(pump_id, owner)
+
+    if not sent:
+        return _retry_alert(self, pump_id, pump, "the Telegram send failed")
+    return {"pump_id": pump_id, "sent": sent, "already_sent": already_sent}
+
+
+def _retry_alert(task, pump_id: int, pump: dict, reason: str) -> dict:
+    """Retry an unsent alert, recording it as given up once the retries are spent."""
+    try:
+        raise task.retry()
+    except MaxRetriesExceededError:
+        print(f"Error sending alert for {pump['symbol']} (pump #{pump_id}): giving up, {reason}")
+        with get_db_session() as db:
+            db.add(Notification(
+                pump_id=pump_id,
+                channel="telegram",
+                message=f"Not sent after {task.request.retries + 1} attempts: {reason}",
+                status="gave_up"
+            ))
+        return {"pump_id": pump_id, "sent": False, "gave_up": True}
+
+
+@celery_app.task
+def record_price_snapshot():
+    """Store a bulk Binance ticker snapshot, update anomaly stats, resolve due pump outcomes and compact older snapshots."""
+    import asyncio
+    from src.collectors import binance
+    from src.collectors.http import close_client
+    from .market_data import compact_snapshots, record_snapshot, update_symbol_stats
+    from .outcomes import resolve_outcomes
+
+    async def fetch():
+        try:
+            return await binance.fetch_tickers()
+        finally:
+            await close_client()
+
+    tickers = asyncio.run(fetch())
+    update_symbol_stats(tickers)
+    with get_db_session() as db:
+        recorded = record_snapshot(db, tickers)
+        resolved, missed = resolve_outcomes(db, tickers)
+        compacted = compact_snapshots(db)
+
+    return {"recorded": recorded, "outcomes_resolved": resolved, "outcomes_missed": missed,
+            "compacted": compacted}
+
+
+@celery_app.task
+def refresh_symbol_universe():
+    """Rebuild the symbol universe from Binance tickers and CoinMarketCap listings."""
+    import asyncio
+    from src.agents.universe import build_universe
+    from src.collectors import binance, coinmarketcap
+    from src.collectors.http import close_client
+    from .market_data import refresh_universe
+
+    async def fetch():
+        try:
+            return await asyncio.gather(
+                binance.fetch_tickers(),
+                coinmarketcap.fetch_listings(UNIVERSE_CMC_LIMIT)
+            )
+        finally:
+            await close_client()
+
+    tickers, listings = asyncio.run(fetch())
+    with get_db_session() as db:
+        stored = refresh_universe(db, build_universe(tickers, listings))
+
+    return {"symbols": stored, "binance": len(tickers), "coinmarketcap": len(listings)}
+
+
+@celery_app.task
+def rebuild_dashboard_summaries():
+    """Rebuild every symbol's dashboard document (covers rows written outside the pipeline)."""
+    from src.web.read_model import rebuild_symbol_summaries
+
+    with get_db_session() as db:
+        rebuilt = rebuild_symbol_summaries(db)
+    return {"symbols": rebuilt}
+
+
+@celery_app.task
+def archive_agent_run_logs():
+    """Compress finished runs' logs and move old ones to cold archive files."""
+    with get_db_session() as db:
+        stats = archive_run_logs(db)
+    return stats
+
+
+@celery_app.task
+def reap_stuck_agent_runs():
+    """
+    Fail runs whose worker stopped heartbeating and release their run lock.
+
+    If a reaped run got past detection, a run is queued right away to take
+    over its unfinished investigations and alerts instead of waiting for
+    the next scheduled detection.
+    """
+    take_over = None
+    with get_db_session() as db:
+        reaped = reap_stuck_runs(db)
+        if reaped and db.query(RunCheckpoint.id).filter(
+            RunCheckpoint.run_id.in_(reaped), RunCheckpoint.phase == "detected"
+        ).first():
+            take_over = queue_agent_run(db)
+
+    if take_over and "run_id" in take_over:
+        run_pump_agent.delay(take_over["run_id"])
+    return {"reaped": reaped, "take_over": take_over}
@@ -0,0 +1,61 @@
+"""
+Model usage accounting.
+
+Every claude call's token usage and cost (from its stream-json events) is
+stored per run and per pump in model_usage, together with the size of its
+shared prompt prefix and per-call suffix, and added to the run's running
+totals shown on the runs page. Daily totals feed the daily ceilings in
+RunBudget.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func
+
+from src.agents.prompts import prompt_metrics
+from src.web.models import AgentRun, ModelUsage
+
+from .claude import usage_tokens
+
+
+def record_usage(db, usage: dict, purpose: str, run_id: Optional[int] = None,
+                 pump_id: Optional[int] = None, symbol: str = None,
+                 prompt: Optional[str] = None) -> ModelUsage:
+    """Store one call's usage and prompt size, and add it to its run's totals."""
+    metrics = prompt_metrics(prompt) if prompt is not None else {}
+    row = ModelUsage(
+        run_id=run_id,
+        pump_id=pump_id,
+        symbol=symbol,
+        purpose=purpose,
+        input_tokens=usage["input_tokens"],
+        output_tokens=usage["output_tokens"],
+        cache_read_tokens=usage["cache_read_tokens"],
+        cache_creation_tokens=usage["cache_creation_tokens"],
+        cost_usd=usage["cost_usd"],
+        prompt_template=metrics.get("template"),
+        prompt_prefix_chars=metrics.get("prefix_chars"),
+        prompt_suffix_chars=metrics.get("suffix_chars")
+    )
+    db.add(row)
+    if run_id is not None:
+        # The model_usage row bumps its version; the run totals do not bump agent_runs
+        db.query(AgentRun).filter(AgentRun.id == run_id).execution_options(versioned=False).update({
+            AgentRun.tokens_used: func.coalesce(AgentRun.tokens_used, 0) + usage_tokens(usage),
+            AgentRun.cost_usd: func.coalesce(AgentRun.cost_usd, 0.0) + usage["cost_usd"],
+        }, synchronize_session=False)
+    db.commit()
+    return row
+
+
+def usage_today(db, now: datetime = None) -> tuple[int, float]:
+    """Fresh tokens and cost of all model calls since midnight UTC."""
+    midnight = (now or datetime.utcnow()).replace(hour=0, minute=0, second=0, microsecond=0)
+    tokens, cost = db.query(
+        func.coalesce(func.sum(
+            ModelUsage.input_tokens + ModelUsage.cache_creation_tokens + ModelUsage.output_tokens
+        ), 0),
+        func.coalesce(func.sum(ModelUsage.cost_usd), 0.0)
+    ).filter(ModelUsage.created_at >= midnight).one()
+    return int(tokens), float(cost)
@@ -0,0 +1,102 @@
+"""
+Shared test helpers.
+
+Collector tests never touch the network: every request goes through an
+httpx.MockTransport installed with http.set_transport(), answering from the
+recorded responses in tests/fixtures. Database tests run against a
+fresh SQLite database with the app's tables.
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.collectors import http  # noqa: E402
+from src.web.models import db as models_db, seed_table_versions  # noqa: E402
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def fixture_text(name: str) -> str:
+    return (FIXTURES / name).read_text()
+
+
+def fixture_json(name: str):
+    return json.loads(fixture_text(name))
+
+
+def run(coro):
+    """Run a collector coroutine on a fresh loop and close the pooled client after."""
+    async def main():
+        try:
+            return await coro
+        finally:
+            await http.close_client()
+    return asyncio.run(main())
+
+
+@pytest.fixture
+def mock_http():
+    """
+    Install a request handler as the collectors' transport.
+
+    Call it with handler(request) -> httpx.Response; returns the list the
+    handled requests are recorded in.
+    """
+    requests = []
+
+    def install(handler):
+        def record(request):
+            requests.append(request)
+            return handler(request)
+        http.set_transport(httpx.MockTransport(record))
+        return requests
+
+    yield install
+    http.set_transport(None)
+
+
+@pytest.fixture
+def db(tmp_path):
+    """
+    Session on a fresh SQLite database with all tables and their version rows.
+
+    The database is a file, so sessions opened from other threads (the
+    pipeline's per-investigation sessions) get their own connections.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'research.db'}")
+    models_db.metadata.create_all(engine)
+    with Session(engine) as session:
+        seed_table_versions(session)
+        yield session
+    engine.dispose()
+
+
+def routes(mapping: dict):
+    """Handler answering by URL path; unknown paths get a 404."""
+    def handler(request):
+        response = mapping.get(request.url.path)
+        if callable(response):
+            return response(request)
+        return response or httpx.Response(404, json={"error": "not found"})
+    return handler
+
+
+def rate_limited(request):
+    return httpx.Response(429, json={"code": -1003, "msg": "Too many requests."})
+
+
+def invalid_json(request):
+    return httpx.Response(200, text="<html>Service Unavailable</html>")
+
+
+def timeout(request):
+    raise httpx.ReadTimeout("timed out", request=request)
@@ -0,0 +1,35 @@
+import io
+
+import numpy as np
+import pytest
+
+from src.agents.anomaly import SymbolStats
+
+
+def test_stats_round_trip_without_pickle():
+    stats = SymbolStats(alpha=0.01)
+    stats.update(["PEPE", "WIF"], [1.0, 2.0], [1e6, 2e6])
+    stats.update(["PEPE", "WIF"], [1.1, 1.9], [1.2e6, 1.8e6])
+
+    restored = SymbolStats.from_bytes(stats.to_bytes())
+
+    assert restored.symbols == ["PEPE", "WIF"]
+    assert all(type(s) is str for s in restored.symbols)
+    assert restored.index == {"PEPE": 0, "WIF": 1}
+    assert restored.alpha == 0.01
+    for name in SymbolStats.FIELDS:
+        np.testing.assert_array_equal(getattr(restored, name), getattr(stats, name))
+
+
+def test_empty_stats_round_trip():
+    restored = SymbolStats.from_bytes(SymbolStats().to_bytes())
+    assert restored.symbols == []
+    assert SymbolStats.from_bytes(None).symbols == []
+
+
+def test_pickled_objects_are_rejected():
+    buffer = io.BytesIO()
+    np.savez(buffer, symbols=np.array(["PEPE"], dtype=object), alpha=0.01,
+             **{name: np.zeros(1) for name in SymbolStats.FIELDS})
+    with pytest.raises(ValueError):
+        SymbolStats.from_bytes(buffer.getvalue())
@@ -0,0 +1,131 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from src.web.models import AgentRun, Finding, NewsTrigger, Pump, PumpOutcome  # noqa: E402
+from src.worker import tasks  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    from src.web.app import app, db
+
+    with app.app_context():
+        yield app.test_client(), db
+        db.session.rollback()
+
+
+@pytest.fixture
+def run_lock(monkeypatch):
+    """An in-memory run lock and a record of the dispatched runs."""
+    state = {"holder": None, "dispatched": []}
+
+    def acquire(run_id):
+        if state["holder"] is not None:
+            return False
+        state["holder"] = run_id
+        return True
+
+    monkeypatch.setattr(tasks, "acquire_run_lock", acquire)
+    monkeypatch.setattr(tasks, "lock_holder", lambda: state["holder"])
+    monkeypatch.setattr(tasks.run_pump_agent, "delay", state["dispatched"].append)
+    return state
+
+
+def test_run_agent_queues_and_dispatches_a_run(client, run_lock):
+    client, db = client
+
+    response = client.post("/api/run")
+
+    run_id = response.get_json()["run_id"]
+    assert response.get_json()["success"] is True
+    assert run_lock["dispatched"] == [run_id]
+    assert db.session.get(AgentRun, run_id).status == "queued"
+
+
+def test_run_agent_while_a_run_holds_the_lock(client, run_lock):
+    client, db = client
+    run_lock["holder"] = 42
+    runs_before = db.session.query(AgentRun).count()
+
+    response = client.post("/api/run")
+
+    assert response.get_json() == {"running": True, "message": "Agent is already queued or running", "run_id": 42}
+    assert run_lock["dispatched"] == []
+    assert db.session.query(AgentRun).count() == runs_before
+
+
+@pytest.fixture
+def lazy_symbol(client):
+    """Twelve pumps of one symbol, the newest with a trigger, an outcome and seven findings."""
+    _, db = client
+    start = datetime(2024, 5, 1)
+    pumps = [Pump(symbol="LAZY", price_change_pct=10.0 + i, detected_at=start + timedelta(hours=i),
+                  source="binance") for i in range(12)]
+    db.session.add_all(pumps)
+    db.session.flush()
+    newest = pumps[-1]
+    db.session.add(NewsTrigger(pump_id=newest.id, trigger_type="listing", description="Binance listing",
+                               confidence=0.9))
+    db.session.add(PumpOutcome(pump_id=newest.id, horizon_minutes=60, due_at=newest.detected_at,
+                               status="done", return_pct=4.5))
+    db.session.add_all(Finding(pump_id=newest.id, source_type="web", source_url=f"https://news.com/{i}",
+                               content=f"finding {i}", relevance_score=i / 10) for i in range(7))
+    db.session.commit()
+    yield newest.id
+
+    # The app database outlives the test
+    for pump in Pump.query.filter(Pump.symbol == "LAZY"):
+        db.session.delete(pump)
+    db.session.commit()
+
+
+def test_symbol_pumps_are_paginated_newest_first(client, lazy_symbol):
+    client, _ = client
+
+    first = client.get("/api/symbols/LAZY/pumps?page=1&per_page=10").get_json()
+    second = client.get("/api/symbols/LAZY/pumps?page=2&per_page=10").get_json()
+
+    assert (first["total"], first["page"], first["per_page"]) == (12, 1, 10)
+    assert [p["price_change_pct"] for p in first["pumps"]] == [21.0 - i for i in range(10)]
+    assert [p["price_change_pct"] for p in second["pumps"]] == [11.0, 10.0]
+    newest = first["pumps"][0]
+    assert newest["id"] == lazy_symbol
+    assert newest["trigger"] == {"trigger_type": "listing", "description": "Binance listing", "confidence": 0.9}
+    assert newest["outcomes"] == [{"label": "1h", "return_pct": 4.5}]
+    # Findings are fetched separately; only their count comes along
+    assert newest["findings_count"] == 7 and newest["findings"] == []
+    assert first["pumps"][1]["trigger"] is None
+
+
+def test_page_arguments_are_clamped(client, lazy_symbol):
+    client, _ = client
+
+    data = client.get("/api/symbols/LAZY/pumps?page=0&per_page=1000").get_json()
+
+    assert (data["page"], data["per_page"], len(data["pumps"])) == (1, 100, 12)
+    assert client.get("/api/symbols/NOSUCH/pumps").get_json()["pumps"] == []
+
+
+def test_pump_findings_are_paginated_by_relevance(client, lazy_symbol):
+    client, _ = client
+
+    first = client.get(f"/api/pumps/{lazy_symbol}/findings?page=1&per_page=5")
+    second = client.get(f"/api/pumps/{lazy_symbol}/findings?page=2&per_page=5").get_json()
+
+    data = first.get_json()
+    assert data["total"] == 7
+    assert [f["content"] for f in data["findings"]] == [f"finding {i}" for i in (6, 5, 4, 3, 2)]
+    assert set(data["findings"][0]) == {"id", "source_type", "source_url", "content", "relevance_score"}
+    assert [f["content"] for f in second["findings"]] == ["finding 1", "finding 0"]
+    assert client.get(f"/api/pumps/{lazy_symbol}/findings?page=1&per_page=5",
+                      headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+
+
+def test_findings_of_a_missing_pump(client):
+    client, _ = client
+
+    assert client.get("/api/pumps/999999/findings").status_code == 404
@@ -0,0 +1,104 @@
+import json
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.agents import backtest
+from src.web.models import PriceSnapshot, db as models_db
+
+
+def test_load_snapshots_fills_minute_columns(tmp_path):
+    url = f"sqlite:///{tmp_path / 'snapshots.db'}"
+    engine = create_engine(url)
+    models_db.metadata.create_all(engine)
+    start = datetime(2024, 1, 1, 12, 0)
+    with Session(engine) as session:
+        for minute in range(60):
+            session.add(PriceSnapshot(symbol="PEPE", captured_at=start + timedelta(minutes=minute),
+                                      price=1.0 + minute / 100, quote_volume=1e6))
+        # Compacted history: one snapshot every 15 minutes
+        for minute in range(0, 60, 15):
+            session.add(PriceSnapshot(symbol="WIF", captured_at=start + timedelta(minutes=minute),
+                                      price=2.0, quote_volume=1e6))
+        session.commit()
+
+    data_dir = tmp_path / "backtest"
+    assert backtest.load_snapshots(data_dir, url) == 64
+
+    meta = backtest.load_meta(data_dir)
+    assert meta["symbols"] == ["PEPE", "WIF"]
+    assert meta["start_minute"] == int((start - datetime(1970, 1, 1)).total_seconds() // 60)
+    prices = np.load(data_dir / backtest.PRICES_FILE)
+    assert prices.shape == (2, 60)
+    assert prices[0, 59] == np.float32(1.59)
+    assert np.flatnonzero(~np.isnan(prices[1])).tolist() == [0, 15, 30, 45]
+
+
+def test_load_snapshots_without_rows(tmp_path):
+    url = f"sqlite:///{tmp_path / 'empty.db'}"
+    models_db.metadata.create_all(create_engine(url))
+    assert backtest.load_snapshots(tmp_path / "backtest", url) == 0
+
+
+def write_prices(data_dir, prices: np.ndarray):
+    data_dir.mkdir(parents=True, exist_ok=True)
+    np.save(data_dir / backtest.PRICES_FILE, prices.astype(np.float32))
+    (data_dir / backtest.META_FILE).write_text(
+        json.dumps({"symbols": [f"S{i}" for i in range(len(prices))], "start_minute": 0}))
+
+
+def two_moves() -> np.ndarray:
+    """One symbol with a 10% move at minute 100 that peaks at 105, and a 6% move at 200."""
+    prices = np.ones((2, 300))
+    prices[0, 100:105] = 1.1
+    prices[0, 105:110] = 1.2
+    prices[0, 200:] = 1.06
+    # A flat symbol with gaps, forward-filled
+    prices[1] = 2.0
+    prices[1, 50:80] = np.nan
+    return prices
+
+
+def test_evaluate_chunk_reports_each_move_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(backtest, "_prices", None)
+    write_prices(tmp_path, two_moves())
+    backtest._init_worker(str(tmp_path / backtest.PRICES_FILE))
+
+    results = backtest.evaluate_chunk(0, 2, window=5, thresholds=[5.0, 8.0], horizons=[5, 10])
+
+    # The 10% move stays above 5% for ten minutes but alerts once
+    assert results[5.0]["alerts"] == 2
+    assert results[8.0]["alerts"] == 1
+    first = results[8.0]
+    assert first["returns"][5][0] == pytest.approx((1.2 / 1.1 - 1) * 100, rel=1e-5)
+    assert first["returns"][10][0] == pytest.approx((1.0 / 1.1 - 1) * 100, rel=1e-5)
+    assert first["lead"].tolist() == [5]
+    assert first["peak"][0] == pytest.approx((1.2 / 1.1 - 1) * 100, rel=1e-5)
+
+
+def test_run_grid_matches_serial_evaluation(tmp_path, monkeypatch):
+    rng = np.random.default_rng(7)
+    prices = np.exp(np.cumsum(rng.normal(0, 0.02, size=(60, 600)), axis=1))
+    prices[rng.random(prices.shape) < 0.05] = np.nan
+    prices[:, 0] = 1.0
+    write_prices(tmp_path, prices)
+    monkeypatch.setattr(backtest, "SYMBOLS_PER_TASK", 25)
+    monkeypatch.setattr(backtest, "_prices", None)
+    thresholds, windows, horizons = [2.0, 5.0], [5, 15], [5, 15, 60]
+
+    report = backtest.run_grid(tmp_path, thresholds, windows, workers=2, horizons=horizons)
+
+    backtest._init_worker(str(tmp_path / backtest.PRICES_FILE))
+    expected = []
+    for window in windows:
+        chunk = backtest.evaluate_chunk(0, 60, window, thresholds, horizons)
+        for threshold in thresholds:
+            result = chunk[threshold]
+            expected.append({"threshold_pct": threshold, "window_minutes": window, **backtest.summarize(
+                result["alerts"], {h: [r] for h, r in result["returns"].items()},
+                [result["lead"]], [result["peak"]], 600 / 1440)})
+    assert report == expected
+    assert all(row["alerts"] > 0 for row in report)
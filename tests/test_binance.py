@@ -0,0 +1,70 @@
+import json
+
+import httpx
+import pytest
+
+from conftest import fixture_json, invalid_json, rate_limited, routes, run, timeout
+from src.collectors import binance
+
+
+def test_fetch_tickers_keeps_live_quote_pairs(mock_http):
+    mock_http(routes({"/api/v3/ticker/24hr": httpx.Response(200, json=fixture_json("binance_ticker_24hr.json"))}))
+
+    tickers = run(binance.fetch_tickers())
+
+    assert [t["symbol"] for t in tickers] == ["BTC", "PEPE"]
+    pepe = tickers[1]
+    assert pepe["pair"] == "PEPEUSDT"
+    assert pepe["price"] == pytest.approx(0.00001327)
+    assert pepe["price_change_pct"] == pytest.approx(12.552)
+    assert pepe["quote_volume"] == pytest.approx(677656987.89)
+    assert pepe["open_price"] == pytest.approx(0.00001179)
+
+
+def test_fetch_ticker_requests_one_pair(mock_http):
+    pepe = fixture_json("binance_ticker_24hr.json")[1]
+    requests = mock_http(routes({"/api/v3/ticker/24hr": httpx.Response(200, json=pepe)}))
+
+    ticker = run(binance.fetch_ticker("pepe"))
+
+    assert ticker["symbol"] == "PEPE"
+    assert requests[0].url.params["symbol"] == "PEPEUSDT"
+
+
+def test_fetch_window_tickers_batches_pairs(mock_http):
+    requests = mock_http(routes({"/api/v3/ticker": httpx.Response(200, json=fixture_json("binance_ticker_window.json"))}))
+    pairs = [f"C{i}USDT" for i in range(binance.WINDOW_BATCH_SIZE + 1)]
+
+    tickers = run(binance.fetch_window_tickers(pairs, 60))
+
+    assert len(requests) == 2
+    assert [len(json.loads(r.url.params["symbols"])) for r in requests] == [binance.WINDOW_BATCH_SIZE, 1]
+    assert {r.url.params["windowSize"] for r in requests} == {"1h"}
+    assert [t["symbol"] for t in tickers] == ["PEPE", "WIF", "PEPE", "WIF"]
+
+
+def test_fetch_window_tickers_skips_unsupported_window(mock_http):
+    requests = mock_http(routes({}))
+
+    assert run(binance.fetch_window_tickers(["PEPEUSDT"], 90)) == []
+    assert requests == []
+
+
+def test_fetch_klines_and_closes(mock_http):
+    requests = mock_http(routes({"/api/v3/klines": httpx.Response(200, json=fixture_json("binance_klines.json"))}))
+
+    closes = run(binance.fetch_closes(["PEPE"], 60))
+
+    assert closes == {"PEPE": [pytest.approx(0.00001322), pytest.approx(0.00001325), pytest.approx(0.00001327)]}
+    assert requests[0].url.params["interval"] == "1m"
+    assert requests[0].url.params["limit"] == "61"
+
+
+@pytest.mark.parametrize("handler", [rate_limited, invalid_json, timeout])
+def test_errors_return_empty_results(mock_http, handler):
+    mock_http(handler)
+
+    assert run(binance.fetch_tickers()) == []
+    assert run(binance.fetch_ticker("PEPE")) is None
+    assert run(binance.fetch_window_tickers(["PEPEUSDT"], 60)) == []
+    assert run(binance.fetch_closes(["PEPE"], 60)) == {}
@@ -0,0 +1,95 @@
+import os
+from datetime import datetime
+
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from src.web.models import AgentRun, TableVersion  # noqa: E402
+from src.worker.log_archive import store_run_logs  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    from src.web.app import app, db
+
+    with app.app_context():
+        yield app.test_client(), db
+        db.session.rollback()
+
+
+def agent_runs_version(db) -> int:
+    db.session.expire_all()
+    return db.session.get(TableVersion, "agent_runs").version
+
+
+def test_matching_etag_is_answered_with_304(client):
+    client, _ = client
+
+    first = client.get("/api/status")
+    assert first.status_code == 200 and first.headers["ETag"]
+    assert "no-cache" in first.headers["Cache-Control"]
+
+    again = client.get("/api/status", headers={"If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304
+    assert again.data == b""
+    assert again.headers["ETag"] == first.headers["ETag"]
+
+
+def test_orm_write_changes_the_etag(client):
+    client, db = client
+    etag = client.get("/api/status").headers["ETag"]
+    before = agent_runs_version(db)
+
+    db.session.add(AgentRun(status="completed", started_at=datetime.utcnow(), completed_at=datetime.utcnow()))
+    db.session.commit()
+
+    assert agent_runs_version(db) == before + 1
+    response = client.get("/api/status", headers={"If-None-Match": etag})
+    assert response.status_code == 200 and response.headers["ETag"] != etag
+
+
+def test_bulk_update_changes_the_etag(client):
+    client, db = client
+    run = AgentRun(status="failed", started_at=datetime.utcnow())
+    db.session.add(run)
+    db.session.commit()
+    etag = client.get("/api/status").headers["ETag"]
+    before = agent_runs_version(db)
+
+    db.session.query(AgentRun).filter(AgentRun.id == run.id).update({"status": "completed"})
+    db.session.commit()
+
+    assert agent_runs_version(db) == before + 1
+    assert client.get("/api/status", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_unversioned_bulk_update_keeps_the_etag(client):
+    client, db = client
+    run = AgentRun(status="running", started_at=datetime.utcnow())
+    db.session.add(run)
+    db.session.commit()
+    etag = client.get("/api/status").headers["ETag"]
+    before = agent_runs_version(db)
+
+    db.session.query(AgentRun).filter(AgentRun.id == run.id).execution_options(versioned=False).update(
+        {"heartbeat_at": datetime.utcnow()})
+    db.session.commit()
+
+    assert agent_runs_version(db) == before
+    assert client.get("/api/status", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_finished_run_logs_are_immutable_and_revalidate_with_304(client):
+    client, db = client
+    run = AgentRun(id=8001, status="completed", started_at=datetime(2024, 1, 1), completed_at=datetime(2024, 1, 1, 0, 5))
+    store_run_logs(run, "first\nsecond")
+    db.session.add(run)
+    db.session.commit()
+
+    response = client.get("/api/run/8001/logs")
+    assert response.get_json() == {"logs": ["first", "second"]}
+    assert "immutable" in response.headers["Cache-Control"]
+
+    again = client.get("/api/run/8001/logs", headers={"If-None-Match": response.headers["ETag"]})
+    assert again.status_code == 304
@@ -0,0 +1,51 @@
+import json
+from datetime import datetime, timedelta
+
+from src.web.models import AgentRun, RunCheckpoint
+from src.worker.checkpoints import ALERT_SETTLE_MINUTES, take_over
+
+WIF = [{"symbol": "WIF", "price_change_pct": 25.0}]
+PEPE = [{"symbol": "PEPE", "price_change_pct": 18.0}]
+INVESTIGATION = {"likely_trigger": {"trigger_type": "exchange_listing", "confidence": 0.8}}
+
+
+def earlier_run(db, status: str, finished_minutes_ago: int, notified: bool = False) -> int:
+    finished = datetime.utcnow() - timedelta(minutes=finished_minutes_ago)
+    run = AgentRun(status=status, started_at=finished - timedelta(minutes=5), completed_at=finished)
+    db.add(run)
+    db.flush()
+    db.add(RunCheckpoint(run_id=run.id, phase="detected", payload=json.dumps([WIF, PEPE])))
+    db.add(RunCheckpoint(run_id=run.id, phase="investigated", symbol="WIF",
+                         payload=json.dumps(INVESTIGATION)))
+    if notified:
+        db.add(RunCheckpoint(run_id=run.id, phase="notified", symbol="WIF"))
+    db.commit()
+    return run.id
+
+
+def test_failed_run_hands_over_investigations_and_alerts(db):
+    earlier_run(db, "failed", finished_minutes_ago=1)
+
+    pending, to_notify = take_over(db, None, max_age_hours=6)
+
+    assert pending == [PEPE]
+    assert to_notify == [(WIF, INVESTIGATION)]
+
+
+def test_completed_run_hands_over_unsent_alerts_once_settled(db):
+    recent = earlier_run(db, "completed", finished_minutes_ago=ALERT_SETTLE_MINUTES - 5)
+    settled = earlier_run(db, "completed", finished_minutes_ago=ALERT_SETTLE_MINUTES + 5)
+
+    pending, to_notify = take_over(db, None, max_age_hours=6)
+
+    # Only alerts: a completed run investigated or deferred everything it detected
+    assert pending == [] and to_notify == [(WIF, INVESTIGATION)]
+    claimed = {run_id for (run_id,) in db.query(RunCheckpoint.run_id).filter(RunCheckpoint.phase == "resumed")}
+    assert claimed == {settled}
+    assert recent not in claimed
+    assert take_over(db, None, max_age_hours=6) == ([], [])
+
+
+def test_sent_alerts_are_not_taken_over(db):
+    earlier_run(db, "completed", finished_minutes_ago=ALERT_SETTLE_MINUTES + 5, notified=True)
+    assert take_over(db, None, max_age_hours=6) == ([], [])
@@ -0,0 +1,78 @@
+import math
+
+from src.agents import clustering
+
+BASE = [0.01, -0.02, 0.03, 0.01, -0.01, 0.02, 0.04, -0.03]
+NOISE = [0.02, 0.01, -0.03, 0.02, 0.03, -0.02, 0.01, 0.01]
+
+
+def closes(returns: list[float]) -> list[float]:
+    prices = [1.0]
+    for r in returns:
+        prices.append(prices[-1] * math.exp(r))
+    return prices
+
+
+def mix(weight: float) -> list[float]:
+    """Returns correlated with BASE by an amount that grows with weight."""
+    return [weight * b + (1 - weight) * n for b, n in zip(BASE, NOISE)]
+
+
+def pump(symbol: str, change: float = 20.0, market_cap: float = None, tags=()) -> dict:
+    return {"symbol": symbol, "price_change_pct": change, "market_cap": market_cap, "tags": list(tags)}
+
+
+def symbols(clusters) -> list[list[str]]:
+    return [[p["symbol"] for p in cluster] for cluster in clusters]
+
+
+def test_pumps_link_exactly_at_the_threshold():
+    histories = {"A": closes(BASE), "B": closes(mix(0.7))}
+    r = clustering.correlation(clustering.log_returns(histories["A"]), clustering.log_returns(histories["B"]))
+    pumps = [pump("A", 30.0), pump("B", 20.0)]
+
+    assert symbols(clustering.cluster_pumps(pumps, histories, min_correlation=r)) == [["A", "B"]]
+    assert symbols(clustering.cluster_pumps(pumps, histories, min_correlation=r + 1e-9)) == [["A"], ["B"]]
+
+
+def test_links_are_transitive():
+    # A-B and B-C correlate strongly, A-C does not reach the bar
+    histories = {"A": closes(BASE), "B": closes(mix(0.5)), "C": closes(NOISE)}
+    returns = {s: clustering.log_returns(h) for s, h in histories.items()}
+    a_b = clustering.correlation(returns["A"], returns["B"])
+    b_c = clustering.correlation(returns["B"], returns["C"])
+    a_c = clustering.correlation(returns["A"], returns["C"])
+    threshold = min(a_b, b_c)
+    assert a_c < threshold
+
+    clusters = clustering.cluster_pumps([pump("A", 30.0), pump("B", 20.0), pump("C", 10.0)], histories,
+                                        min_correlation=threshold)
+    assert [sorted(c) for c in symbols(clusters)] == [["A", "B", "C"]]
+
+
+def test_shared_sector_tag_lowers_the_bar():
+    histories = {"A": closes(BASE), "B": closes(mix(0.6))}
+    r = clustering.correlation(clustering.log_returns(histories["A"]), clustering.log_returns(histories["B"]))
+    sector = pump("A", 30.0, tags=["ai-big-data"])
+
+    same_sector = [sector, pump("B", 20.0, tags=["ai-big-data", "memes"])]
+    assert symbols(clustering.cluster_pumps(same_sector, histories, min_correlation=0.99,
+                                            sector_correlation=r)) == [["A", "B"]]
+    other_sector = [sector, pump("B", 20.0, tags=["memes"])]
+    assert symbols(clustering.cluster_pumps(other_sector, histories, min_correlation=0.99,
+                                            sector_correlation=r)) == [["A"], ["B"]]
+
+
+def test_representative_is_the_largest_coin_and_clusters_follow_its_move():
+    histories = {"SMALL": closes(BASE), "LARGE": closes(BASE), "SOLO": closes(NOISE)}
+    pumps = [pump("SMALL", 40.0, market_cap=1e7), pump("LARGE", 15.0, market_cap=1e9), pump("SOLO", 25.0)]
+
+    clusters = clustering.cluster_pumps(pumps, histories, min_correlation=0.9)
+
+    assert symbols(clusters) == [["SOLO"], ["LARGE", "SMALL"]]
+
+
+def test_short_histories_never_link():
+    histories = {"A": closes(BASE[:2]), "B": closes(BASE[:2])}
+
+    assert symbols(clustering.cluster_pumps([pump("A"), pump("B")], histories, min_correlation=0.01)) == [["A"], ["B"]]
@@ -0,0 +1,73 @@
+import httpx
+import pytest
+
+from conftest import fixture_json, invalid_json, rate_limited, routes, run, timeout
+from src.collectors import coinmarketcap
+
+
+@pytest.fixture(autouse=True)
+def api_key(monkeypatch):
+    monkeypatch.setattr(coinmarketcap, "CMC_API_KEY", "test-key")
+
+
+def test_fetch_gainers_sorts_by_window_field(mock_http):
+    requests = mock_http(routes({
+        "/v1/cryptocurrency/listings/latest": httpx.Response(200, json=fixture_json("cmc_listings.json"))
+    }))
+
+    gainers = run(coinmarketcap.fetch_gainers(60))
+
+    assert requests[0].url.params["sort"] == "percent_change_1h"
+    assert requests[0].headers["X-CMC_PRO_API_KEY"] == "test-key"
+    assert [c["symbol"] for c in gainers] == ["PEPE", "WIF"]
+    assert gainers[0]["price_change_pct"] == pytest.approx(3.118)
+    assert gainers[0]["market_cap"] == pytest.approx(5581812201.33)
+    assert gainers[0]["tags"] == ["memes", "ethereum-ecosystem"]
+
+
+def test_fetch_listings_uses_24h_change(mock_http):
+    mock_http(routes({
+        "/v1/cryptocurrency/listings/latest": httpx.Response(200, json=fixture_json("cmc_listings.json"))
+    }))
+
+    listings = run(coinmarketcap.fetch_listings())
+
+    assert listings[1]["symbol"] == "WIF"
+    assert listings[1]["price_change_pct"] == pytest.approx(9.0122)
+
+
+def test_fetch_quote_picks_highest_ranked_match(mock_http):
+    mock_http(routes({
+        "/v2/cryptocurrency/quotes/latest": httpx.Response(200, json=fixture_json("cmc_quotes.json"))
+    }))
+
+    quote = run(coinmarketcap.fetch_quote("pepe"))
+
+    assert quote["id"] == 24478
+    assert quote["rank"] == 22
+
+
+def test_fetch_quote_unknown_symbol(mock_http):
+    mock_http(routes({
+        "/v2/cryptocurrency/quotes/latest": httpx.Response(200, json={"status": {"error_code": 0}, "data": {}})
+    }))
+
+    assert run(coinmarketcap.fetch_quote("NOPE")) is None
+
+
+def test_without_api_key_nothing_is_requested(mock_http, monkeypatch):
+    monkeypatch.setattr(coinmarketcap, "CMC_API_KEY", "")
+    requests = mock_http(routes({}))
+
+    assert run(coinmarketcap.fetch_gainers()) == []
+    assert run(coinmarketcap.fetch_quote("PEPE")) is None
+    assert requests == []
+
+
+@pytest.mark.parametrize("handler", [rate_limited, invalid_json, timeout])
+def test_errors_return_empty_results(mock_http, handler):
+    mock_http(handler)
+
+    assert run(coinmarketcap.fetch_gainers()) == []
+    assert run(coinmarketcap.fetch_listings()) == []
+    assert run(coinmarketcap.fetch_quote("PEPE")) is None
@@ -0,0 +1,94 @@
+import re
+from pathlib import Path
+
+import yaml
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def service_env(service: str) -> dict:
+    """A docker-compose service's environment as a dict (list or mapping form)."""
+    compose = yaml.safe_load((ROOT / "docker-compose.yml").read_text())
+    env = compose["services"][service].get("environment") or {}
+    if isinstance(env, list):
+        env = dict(item.split("=", 1) for item in env)
+    return env
+
+
+def test_detection_worker_gets_the_schedule_settings():
+    env = service_env("worker-detection")
+    for name in ("DETECTION_MIN_INTERVAL_SECONDS", "DETECTION_MAX_INTERVAL_SECONDS",
+                 "VOLATILITY_HOT_PCT", "BREADTH_HOT", "SNAPSHOT_STALE_SECONDS", "DATABASE_URL"):
+        assert name in env
+    assert env["DETECTION_MIN_INTERVAL_SECONDS"] == "${DETECTION_MIN_INTERVAL_SECONDS:-300}"
+
+
+def test_beat_gets_the_task_intervals():
+    env = service_env("beat")
+    for name in ("DETECTION_CHECK_SECONDS", "SUMMARY_REBUILD_SECONDS",
+                 "UNIVERSE_REFRESH_SECONDS", "RUN_LOG_ARCHIVE_SECONDS"):
+        assert name in env
+
+
+# Which service reads which settings (docker-compose.yml merges the x-*-env groups)
+SERVICE_SETTINGS = {
+    "worker": ["PUMP_DETECTION_PROFILES", "ANOMALY_PRICE_Z", "UNIVERSE_MIN_VOLUME_USD",
+               "EVIDENCE_TOP_K", "FAST_PATH_CONFIDENCE", "RUN_TOKEN_BUDGET", "RUN_COST_BUDGET_USD",
+               "PUMP_TOKEN_BUDGET", "DAILY_TOKEN_BUDGET", "DAILY_COST_BUDGET_USD",
+               "RUN_TIME_BUDGET_SECONDS", "PRICE_INPUT_PER_MTOK", "CLAUDE_MAX_CONCURRENCY",
+               "SUMMARY_SYMBOLS", "MCP_POOL_SERVERS", "TELEGRAM_CHAT_ID"],
+    "worker-notifications": ["CLAUDE_MAX_CONCURRENCY", "PRICE_INPUT_PER_MTOK", "MCP_POOL_ENABLED",
+                             "MCP_CONFIG_PATH", "ALERT_MAX_RETRIES", "TELEGRAM_CHAT_ID"],
+    "worker-detection": ["ANOMALY_EWMA_ALPHA", "PRICE_HISTORY_DAYS", "SUMMARY_SYMBOLS",
+                         "DETECTION_MAX_INTERVAL_SECONDS"],
+    "worker-maintenance": ["COINMARKETCAP_API_KEY", "RUN_LOG_RETENTION_DAYS", "RUN_LOG_ARCHIVE_DIR",
+                           "RUN_HEARTBEAT_STALE_SECONDS", "SUMMARY_PUMPS_PER_SYMBOL"],
+    "web": ["DAILY_TOKEN_BUDGET", "DAILY_COST_BUDGET_USD", "SUMMARY_SYMBOLS", "EXPORT_BATCH_ROWS",
+            "RUN_LOG_ARCHIVE_DIR"],
+}
+
+# .env.example entries not handed to a container's environment
+NOT_PASSED = {
+    "SERVER_IP", "SERVER_USER", "SERVER_DOMAIN", "CERTBOT_EMAIL",  # deploy scripts
+    "POSTGRES_PASSWORD", "DATABASE_URL", "REDIS_URL",  # built into the service URLs
+    "TWITTER_API_KEY", "TWITTER_API_SECRET", "TWITTER_ACCESS_TOKEN", "TWITTER_ACCESS_TOKEN_SECRET",
+    "EXPORT_DATABASE_URL",  # command line export only
+}
+
+
+def env_example_names() -> set[str]:
+    names = set()
+    for line in (ROOT / ".env.example").read_text().splitlines():
+        match = re.match(r"#?\s*([A-Z][A-Z0-9_]+)=", line)
+        if match:
+            names.add(match.group(1))
+    return names
+
+
+def code_defaults() -> dict:
+    defaults = {}
+    for path in (ROOT / "src").rglob("*.py"):
+        for name, default in re.findall(r'os\.(?:getenv|environ\.get)\("([A-Z0-9_]+)", "([^"]*)"\)',
+                                        path.read_text()):
+            defaults[name] = default
+    return defaults
+
+
+def test_services_get_the_settings_they_read():
+    for service, names in SERVICE_SETTINGS.items():
+        env = service_env(service)
+        assert [name for name in names if name not in env] == [], service
+
+
+def test_every_documented_setting_reaches_a_container():
+    compose = (ROOT / "docker-compose.yml").read_text()
+    used = set(re.findall(r"\$\{([A-Z0-9_]+)", compose))
+    assert sorted(env_example_names() - used - NOT_PASSED) == []
+
+
+def test_compose_defaults_match_the_code():
+    compose = (ROOT / "docker-compose.yml").read_text()
+    defaults = code_defaults()
+    for name, default in re.findall(r"\$\{([A-Z0-9_]+):-([^}]*)\}", compose):
+        if name in defaults:
+            assert default == defaults[name], name
@@ -0,0 +1,64 @@
+import json
+
+import httpx
+import pytest
+
+from conftest import fixture_json, fixture_text, rate_limited, routes, run, timeout
+from src.collectors import coinmarketcap, evidence, reddit
+
+PEPE = {"symbol": "PEPE", "name": "Pepe", "price_change_pct": 12.5}
+
+
+@pytest.fixture(autouse=True)
+def credentials(monkeypatch):
+    monkeypatch.setattr(coinmarketcap, "CMC_API_KEY", "test-key")
+    monkeypatch.setattr(reddit, "REDDIT_CLIENT_ID", "")
+
+
+def all_sources():
+    return routes({
+        "/api/v3/ticker/24hr": httpx.Response(200, json=fixture_json("binance_ticker_24hr.json")[1]),
+        "/v2/cryptocurrency/quotes/latest": httpx.Response(200, json=fixture_json("cmc_quotes.json")),
+        "/search.json": httpx.Response(200, json=fixture_json("reddit_search.json")),
+        "/rss/search": httpx.Response(200, text=fixture_text("google_news.xml")),
+    })
+
+
+def test_search_query_uses_name_and_ticker():
+    assert evidence.search_query({"symbol": "wif", "name": "dogwifhat"}) == '"dogwifhat" OR "$WIF"'
+    # A name equal to the ticker adds nothing
+    assert evidence.search_query(PEPE) == '"$PEPE" OR "PEPE crypto"'
+
+
+def test_gather_evidence_bundles_every_source(mock_http):
+    mock_http(all_sources())
+
+    bundle = run(evidence.gather_evidence(PEPE))
+
+    assert bundle["symbol"] == "PEPE"
+    assert bundle["market"]["binance"]["pair"] == "PEPEUSDT"
+    assert bundle["market"]["coinmarketcap"]["rank"] == 22
+    assert len(bundle["items"]["reddit"]) == 2
+    assert len(bundle["items"]["web"]) == 2
+    assert bundle["errors"] == {}
+
+    rendered = json.loads(evidence.format_bundle(bundle, max_items_per_source=1))
+    assert len(rendered["evidence"]["reddit"]) == 1
+    assert rendered["unavailable_sources"] == []
+
+
+def test_failing_source_does_not_sink_the_bundle(mock_http):
+    sources = all_sources()
+
+    def handler(request):
+        if request.url.host == "www.reddit.com":
+            return rate_limited(request)
+        if request.url.host == "news.google.com":
+            return timeout(request)
+        return sources(request)
+    mock_http(handler)
+
+    bundle = run(evidence.gather_evidence(PEPE))
+
+    assert bundle["market"]["binance"]["symbol"] == "PEPE"
+    assert bundle["items"] == {"reddit": [], "web": []}
@@ -0,0 +1,74 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+import pytest
+
+from src.web import export
+from src.web.models import Finding, NewsTrigger, Pump
+
+
+@pytest.fixture
+def engine(db):
+    """Two pumps, one with a trigger and two findings, one with neither."""
+    wif = Pump(symbol="WIF", price_change_pct=25.0, detected_at=datetime(2024, 1, 1, 12, 0))
+    pepe = Pump(symbol="PEPE", price_change_pct=18.5, detected_at=datetime(2024, 1, 2, 12, 0))
+    db.add_all([wif, pepe])
+    db.flush()
+    db.add(NewsTrigger(pump_id=wif.id, trigger_type="exchange_listing", description="Listed", confidence=0.8))
+    db.add_all([
+        Finding(pump_id=wif.id, source_type="web", content="Binance will list WIF", relevance_score=0.9),
+        Finding(pump_id=wif.id, source_type="reddit", content="WIF to the moon", relevance_score=0.4),
+    ])
+    db.commit()
+    return db.get_bind()
+
+
+def export_bytes(engine, fmt: str, batch_rows: int = 1, **filters) -> list[bytes]:
+    query = export.export_query(**filters)
+    encoders = {"ndjson": export._ndjson, "csv": export._csv, "parquet": export._parquet}
+    return list(encoders[fmt](export.iter_batches(engine, query, batch_rows)))
+
+
+def test_ndjson_export(engine):
+    chunks = export_bytes(engine, "ndjson")
+    assert len(chunks) == 3  # one per batch of one row
+    rows = [json.loads(line) for line in b"".join(chunks).decode().splitlines()]
+    assert [(r["symbol"], r["finding_source_type"]) for r in rows] == [
+        ("WIF", "web"), ("WIF", "reddit"), ("PEPE", None)
+    ]
+    assert rows[0]["trigger_type"] == "exchange_listing"
+    assert list(rows[0]) == export.COLUMN_NAMES
+
+
+def test_csv_export_with_filters(engine):
+    chunks = export_bytes(engine, "csv", symbols=["wif"], since=datetime(2024, 1, 1))
+    rows = list(csv.reader(io.StringIO(b"".join(chunks).decode())))
+    assert rows[0] == export.COLUMN_NAMES
+    assert [row[1] for row in rows[1:]] == ["WIF", "WIF"]
+    assert export_bytes(engine, "csv", until=datetime(2024, 1, 1)) == [
+        (",".join(export.COLUMN_NAMES) + "\r\n").encode()
+    ]
+
+
+def test_parquet_export(engine):
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    chunks = export_bytes(engine, "parquet")
+    assert len(chunks) == 4  # header and one row group per batch, then the footer
+    table = pq.read_table(io.BytesIO(b"".join(chunks)))
+    assert table.column_names == export.COLUMN_NAMES
+    assert table.column("symbol").to_pylist() == ["WIF", "WIF", "PEPE"]
+    assert table.column("finding_id").to_pylist()[2] is None
+    assert table.column("detected_at").to_pylist()[0] == datetime(2024, 1, 1, 12, 0)
+
+
+def test_chunk_sink_drains_what_was_written():
+    sink = export._ChunkSink()
+    assert sink.write(b"PAR1") == 4
+    sink.write(memoryview(b"data"))
+    assert sink.tell() == 8
+    assert sink.drain() == b"PAR1data"
+    assert sink.drain() == b""
+    assert sink.tell() == 8  # position keeps counting for the writer's offsets
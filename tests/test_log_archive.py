@@ -0,0 +1,65 @@
+import gzip
+import os
+from datetime import datetime
+
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from src.web.models import AgentRun  # noqa: E402
+from src.worker import log_archive  # noqa: E402
+from src.worker.log_archive import LogArchiveUnavailable, iter_run_log_lines  # noqa: E402
+
+
+@pytest.fixture
+def archive_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_archive, "RUN_LOG_ARCHIVE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def archived_run(run_id: int = 1) -> AgentRun:
+    return AgentRun(id=run_id, status="completed", completed_at=datetime(2024, 1, 1),
+                    logs_archive_path=f"2024/01/run-{run_id}.log.gz")
+
+
+def test_archived_logs_are_read_line_by_line(archive_dir):
+    run = archived_run()
+    (archive_dir / "2024" / "01").mkdir(parents=True)
+    (archive_dir / run.logs_archive_path).write_bytes(gzip.compress(b"first\nsecond\nthird"))
+
+    assert list(iter_run_log_lines(run)) == ["first", "second", "third"]
+
+
+def test_missing_archive_file_raises(archive_dir):
+    with pytest.raises(LogArchiveUnavailable):
+        iter_run_log_lines(archived_run())
+
+
+def test_corrupt_archive_file_raises(archive_dir):
+    run = archived_run()
+    (archive_dir / "2024" / "01").mkdir(parents=True)
+    (archive_dir / run.logs_archive_path).write_bytes(b"not gzip at all")
+
+    with pytest.raises(LogArchiveUnavailable):
+        iter_run_log_lines(run)
+
+
+def test_unavailable_logs_are_not_cached_as_immutable(archive_dir):
+    from src.web.app import app, db
+
+    with app.app_context():
+        db.session.add(archived_run(run_id=7001))
+        db.session.commit()
+    client = app.test_client()
+
+    response = client.get("/api/run/7001/logs")
+    assert response.status_code == 503
+    assert "immutable" not in response.headers.get("Cache-Control", "")
+    assert "no-store" in response.headers["Cache-Control"]
+    assert "ETag" not in response.headers
+
+    (archive_dir / "2024" / "01").mkdir(parents=True)
+    (archive_dir / "2024" / "01" / "run-7001.log.gz").write_bytes(gzip.compress(b"restored"))
+    response = client.get("/api/run/7001/logs")
+    assert response.status_code == 200 and response.get_json() == {"logs": ["restored"]}
+    assert "immutable" in response.headers["Cache-Control"]
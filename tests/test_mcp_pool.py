@@ -0,0 +1,61 @@
+import json
+
+from src.worker import claude, mcp_pool
+
+TELEGRAM = {"command": "fast-mcp-telegram", "env": {"API_ID": "${TELEGRAM_API_ID}"}}
+REDDIT = {"command": "uvx", "args": ["reddit-mcp"]}
+
+
+def write_config(path, servers):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"mcpServers": servers}))
+
+
+def test_servers_are_read_from_the_project_config_the_cli_uses(tmp_path, monkeypatch):
+    write_config(tmp_path / ".claude" / "settings.json", {"telegram": TELEGRAM, "reddit": REDDIT})
+    monkeypatch.setattr(mcp_pool, "CLAUDE_CWD", str(tmp_path))
+    monkeypatch.setattr(mcp_pool, "MCP_CONFIG_PATH", "")
+    monkeypatch.setenv("TELEGRAM_API_ID", "12345")
+
+    assert mcp_pool.server_config_path() == str(tmp_path / ".claude" / "settings.json")
+    servers = mcp_pool.load_server_config()
+    assert sorted(servers) == ["reddit", "telegram"]
+    assert servers["telegram"]["env"] == {"API_ID": "12345"}
+
+    write_config(tmp_path / ".mcp.json", {"telegram": TELEGRAM})
+    assert mcp_pool.server_config_path() == str(tmp_path / ".mcp.json")
+
+
+def test_missing_config_gives_no_servers(tmp_path, monkeypatch):
+    monkeypatch.setattr(mcp_pool, "CLAUDE_CWD", str(tmp_path))
+    monkeypatch.setattr(mcp_pool, "MCP_CONFIG_PATH", "")
+    assert mcp_pool.load_server_config() == {}
+
+
+def test_only_servers_of_the_allowed_tools_are_pooled(monkeypatch):
+    monkeypatch.setattr(mcp_pool, "MCP_POOL_SERVERS", "")
+    assert mcp_pool.tool_servers("mcp__telegram__*") == ["telegram"]
+    assert mcp_pool.tool_servers("mcp__telegram__send_message,mcp__x_api__post") == ["telegram", "x_api"]
+    assert mcp_pool.pool_server_names("mcp__telegram__*") == ["telegram"]
+    assert mcp_pool.pool_server_names() is None
+
+    pool = mcp_pool.MCPPool({"telegram": TELEGRAM, "reddit": REDDIT}, only=["telegram"])
+    assert [s.name for s in pool.servers] == ["telegram"]
+
+    monkeypatch.setattr(mcp_pool, "MCP_POOL_SERVERS", "reddit, telegram")
+    assert mcp_pool.pool_server_names("mcp__telegram__*") == ["reddit", "telegram"]
+
+
+def test_claude_only_uses_a_pool_config_with_servers(tmp_path, monkeypatch):
+    config = tmp_path / "pool.json"
+    monkeypatch.setattr(mcp_pool, "MCP_POOL_CONFIG_PATH", str(config))
+
+    assert "--mcp-config" not in claude._command("hi")
+
+    write_config(config, {})
+    assert "--strict-mcp-config" not in claude._command("hi")
+
+    write_config(config, {"telegram": {"type": "sse", "url": "http://127.0.0.1:8700/sse"}})
+    cmd = claude._command("hi", "mcp__telegram__*")
+    assert cmd[cmd.index("--mcp-config") + 1] == str(config)
+    assert "--strict-mcp-config" in cmd
@@ -0,0 +1,81 @@
+from src.agents.merge import merge_sources
+from src.agents.universe import SymbolIndex, build_universe
+
+TICKERS = [
+    {"symbol": "PEPE", "pair": "PEPEUSDT", "quote_volume": 9e8},
+    {"symbol": "1000SATS", "pair": "1000SATSUSDT", "quote_volume": 5e7},
+]
+LISTINGS = [
+    {"symbol": "PEPE", "id": 24478, "rank": 30, "name": "Pepe", "slug": "pepe", "market_cap": 4e9, "volume_24h": 1e9},
+    {"symbol": "PEPE", "id": 31000, "rank": 2400, "name": "Pepe Unchained", "slug": "pepe-unchained",
+     "market_cap": 8e6, "volume_24h": 2e6},
+    {"symbol": "SATS", "id": 28194, "rank": 200, "name": "SATS (Ordinals)", "slug": "sats",
+     "market_cap": 6e8, "volume_24h": 9e7},
+]
+
+
+def universe() -> SymbolIndex:
+    return SymbolIndex(build_universe(TICKERS, LISTINGS))
+
+
+def binance_hit(symbol: str, price: float, change: float = 20.0, window: int = 60) -> dict:
+    return {"symbol": symbol, "price_at_detection": price, "price_change_pct": change,
+            "volume_change_pct": 150.0, "market_cap": None, "volume_24h": 5e7, "source": "binance",
+            "time_window_minutes": window, "profile": f"10%/{window}m", "profiles": [f"10%/{window}m"]}
+
+
+def cmc_hit(symbol: str, cmc_id: int, price: float, change: float = 18.0, window: int = 1440, **coin) -> dict:
+    return {"symbol": symbol, "cmc_id": cmc_id, "price_at_detection": price, "price_change_pct": change,
+            "volume_change_pct": 90.0, "market_cap": 4e9, "volume_24h": 1e9, "source": "coinmarketcap",
+            "name": coin.get("name", symbol), "tags": ["memes"], "time_window_minutes": window,
+            "profile": f"10%/{window}m", "profiles": [f"10%/{window}m"]}
+
+
+def test_same_asset_on_both_sources_merges_once():
+    pumps = merge_sources([binance_hit("PEPE", 1.0e-5)], [cmc_hit("PEPE", 24478, 1.01e-5, name="Pepe")], universe())
+
+    assert len(pumps) == 1
+    pepe = pumps[0]
+    assert pepe["source"] == "both"
+    # Exchange price and change, CMC supply data
+    assert pepe["price_at_detection"] == 1.0e-5
+    assert pepe["price_change_pct"] == 20.0
+    assert pepe["market_cap"] == 4e9
+    assert pepe["name"] == "Pepe"
+    # The shortest matched window leads
+    assert pepe["time_window_minutes"] == 60
+    assert pepe["profiles"] == ["10%/60m", "10%/1440m"]
+
+
+def test_multiplier_listing_merges_with_its_asset():
+    pumps = merge_sources([binance_hit("1000SATS", 0.3)], [cmc_hit("SATS", 28194, 0.0003)], universe())
+
+    assert [(p["symbol"], p["source"]) for p in pumps] == [("SATS", "both")]
+    assert pumps[0]["binance_symbol"] == "1000SATS"
+    assert pumps[0]["price_at_detection"] == 0.0003
+
+
+def test_diverging_prices_are_different_assets():
+    pumps = merge_sources([binance_hit("PEPE", 1.0e-5)], [cmc_hit("PEPE", None, 5.0e-5)])
+
+    assert [(p["symbol"], p["source"]) for p in pumps] == [("PEPE", "binance")]
+
+
+def test_colliding_ticker_is_kept_under_its_cmc_id():
+    pumps = merge_sources(
+        [binance_hit("PEPE", 1.0e-5)],
+        [cmc_hit("PEPE", 31000, 0.002, change=60.0, name="Pepe Unchained")],
+        universe(),
+    )
+
+    assert [(p["symbol"], p["source"]) for p in pumps] == [("PEPE#31000", "coinmarketcap"), ("PEPE", "binance")]
+    unchained = pumps[0]
+    assert unchained["ticker"] == "PEPE"
+    assert unchained["aliases"] == ["PEPE"]
+    assert unchained["name"] == "Pepe Unchained"
+
+
+def test_colliding_ticker_without_the_higher_ranked_coin_detected():
+    pumps = merge_sources([], [cmc_hit("PEPE", 31000, 0.002)], universe())
+
+    assert [p["symbol"] for p in pumps] == ["PEPE#31000"]
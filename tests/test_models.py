@@ -0,0 +1,58 @@
+from datetime import datetime
+
+from sqlalchemy.orm import sessionmaker
+
+from src.web.models import AgentRun, ModelUsage, TableVersion
+from src.worker.run_lock import RunHeartbeat
+from src.worker.usage import record_usage
+
+USAGE = {"input_tokens": 100, "output_tokens": 50, "cache_read_tokens": 0,
+         "cache_creation_tokens": 0, "cost_usd": 0.01}
+
+
+def version(db, table: str) -> int:
+    db.expire_all()
+    return db.get(TableVersion, table).version
+
+
+def new_run(db) -> AgentRun:
+    run = AgentRun(status="running", started_at=datetime.utcnow())
+    db.add(run)
+    db.commit()
+    return run
+
+
+def test_heartbeat_does_not_bump_agent_runs(db):
+    run = new_run(db)
+    before = version(db, "agent_runs")
+
+    RunHeartbeat(run.id, session_factory=sessionmaker(bind=db.get_bind())).beat()
+
+    assert version(db, "agent_runs") == before
+    assert db.get(AgentRun, run.id).heartbeat_at is not None
+
+
+def test_usage_bumps_model_usage_but_not_agent_runs(db):
+    run = new_run(db)
+    runs_before, usage_before = version(db, "agent_runs"), version(db, "model_usage")
+
+    record_usage(db, USAGE, "investigation", run.id, symbol="WIF")
+
+    assert version(db, "agent_runs") == runs_before
+    assert version(db, "model_usage") == usage_before + 1
+    assert db.get(AgentRun, run.id).tokens_used == 150
+    assert db.query(ModelUsage).count() == 1
+
+
+def test_status_and_heartbeat_only_updates_of_a_run(db):
+    run = new_run(db)
+    before = version(db, "agent_runs")
+
+    run.heartbeat_at = datetime.utcnow()
+    db.commit()
+    assert version(db, "agent_runs") == before
+
+    run.status = "completed"
+    run.heartbeat_at = datetime.utcnow()
+    db.commit()
+    assert version(db, "agent_runs") == before + 1
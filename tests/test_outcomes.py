@@ -0,0 +1,76 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.web.models import Pump, PumpOutcome, SymbolUniverse
+from src.worker import outcomes
+
+DETECTED = datetime(2024, 3, 1, 12, 0)
+
+
+def save_pump(db, symbol: str, source: str = "binance", price: float = 1.0, change: float = 25.0) -> Pump:
+    pump = Pump(symbol=symbol, price_change_pct=change, price_at_detection=price,
+                source=source, detected_at=DETECTED)
+    db.add(pump)
+    db.flush()
+    return pump
+
+
+def add_universe(db, symbol: str, binance_pair: str = None, aliases: list[str] = ()):
+    db.add(SymbolUniverse(symbol=symbol, binance_pair=binance_pair, aliases=json.dumps(list(aliases))))
+    db.flush()
+
+
+def test_binance_pumps_get_every_horizon(db):
+    pump = save_pump(db, "PEPE", source="both")
+
+    assert outcomes.schedule_outcomes(db, pump) == len(outcomes.OUTCOME_HORIZONS)
+    db.flush()
+    due = [o.due_at for o in db.query(PumpOutcome).order_by(PumpOutcome.horizon_minutes)]
+    assert due == [DETECTED + timedelta(minutes=h) for h in outcomes.OUTCOME_HORIZONS]
+
+
+def test_cmc_only_pumps_are_tracked_only_when_listed_on_binance(db):
+    add_universe(db, "WIF", binance_pair="WIFUSDT")
+    add_universe(db, "BRETT")
+
+    assert outcomes.schedule_outcomes(db, save_pump(db, "WIF", source="coinmarketcap")) == 4
+    assert outcomes.schedule_outcomes(db, save_pump(db, "BRETT", source="coinmarketcap")) == 0
+    assert outcomes.schedule_outcomes(db, save_pump(db, "PEPE#31000", source="coinmarketcap")) == 0
+
+
+def test_pumps_without_a_price_are_not_tracked(db):
+    assert outcomes.schedule_outcomes(db, save_pump(db, "PEPE", price=None)) == 0
+
+
+def test_due_checks_resolve_from_the_tickers(db):
+    add_universe(db, "SATS", binance_pair="1000SATSUSDT", aliases=["1000SATS"])
+    pepe = save_pump(db, "PEPE", price=1.25, change=25.0)
+    sats = save_pump(db, "SATS", price=0.0004)
+    for pump in (pepe, sats):
+        outcomes.schedule_outcomes(db, pump)
+    db.commit()
+
+    now = DETECTED + timedelta(minutes=70)
+    tickers = [{"symbol": "PEPE", "price": 1.1}, {"symbol": "1000SATS", "price": 0.5}]
+    assert outcomes.resolve_outcomes(db, tickers, now) == (2, 2)
+
+    checks = {(o.pump.symbol, o.horizon_minutes): o for o in db.query(PumpOutcome)}
+    # +15m is past its grace period, +60m resolves, +4h is not due yet
+    assert checks["PEPE", 15].status == "missed"
+    hour = checks["PEPE", 60]
+    assert hour.status == "done"
+    assert hour.price == 1.1
+    assert hour.return_pct == pytest.approx(-12.0)
+    assert hour.retrace_pct == pytest.approx(60.0)
+    assert checks["SATS", 60].price == pytest.approx(0.0005)
+    assert checks["PEPE", 240].status == "pending"
+
+
+def test_checks_without_a_ticker_wait_until_missed(db):
+    outcomes.schedule_outcomes(db, save_pump(db, "GONE"))
+    db.commit()
+
+    assert outcomes.resolve_outcomes(db, [{"symbol": "PEPE", "price": 1.0}], DETECTED + timedelta(minutes=20)) == (0, 0)
+    assert outcomes.resolve_outcomes(db, [{"symbol": "PEPE", "price": 1.0}], DETECTED + timedelta(minutes=50)) == (0, 1)
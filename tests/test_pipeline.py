@@ -0,0 +1,170 @@
+import asyncio
+import json
+import threading
+
+from src.agents.prioritizer import RunBudget
+from src.web.models import Finding, NewsTrigger, Pump, QueuedInvestigation
+from src.worker import pipeline
+from src.worker.claude import TOKEN_PRICES_USD, UsageMeter
+from src.worker.supervisor import ProcessSupervisor
+
+
+def make_pump(symbol: str, change: float = 25.0) -> dict:
+    return {"symbol": symbol, "price_change_pct": change, "time_window_minutes": 60,
+            "source": "binance", "profile": "20%/1h", "priority": 0.5}
+
+
+def rules_investigation() -> dict:
+    return {
+        "classified_by": "rules",
+        "likely_trigger": {"trigger_type": "exchange_listing",
+                           "description": "Listed on Binance", "confidence": 0.8},
+        "findings": [{"source_type": "web", "source_url": "https://example.com/listing",
+                      "content": "Binance will list WIF", "relevance_score": 0.9}],
+        "summary": "Listed on Binance.",
+    }
+
+
+def trigger_of(db, symbol: str) -> NewsTrigger:
+    return db.query(NewsTrigger).join(Pump).filter(Pump.symbol == symbol).one()
+
+
+def test_cluster_members_get_a_trigger_pointing_to_the_representative(db):
+    cluster = [make_pump("WIF"), make_pump("BONK", 18.0), make_pump("MYRO", 15.0)]
+    stats = {"findings_count": 0, "notifications_queued": 0, "fast_path": 0}
+
+    async def investigate():
+        supervisor = ProcessSupervisor()
+        await pipeline.investigate_cluster(db, lambda line: None, cluster, {"items": {}},
+                                           rules_investigation(), None, RunBudget(), supervisor, stats)
+    asyncio.run(investigate())
+
+    representative = trigger_of(db, "WIF")
+    assert representative.trigger_type == "exchange_listing"
+    assert representative.description == "Listed on Binance"
+    for symbol in ("BONK", "MYRO"):
+        member = trigger_of(db, symbol)
+        assert member.trigger_type == "market_trend"
+        assert "WIF" in member.description and "exchange_listing" in member.description
+    assert db.query(Finding).join(Pump).filter(Pump.symbol != "WIF").count() == 0
+    assert stats["fast_path"] == 1
+
+
+def test_member_investigation_without_a_known_trigger():
+    member = pipeline.member_investigation({"likely_trigger": None}, "WIF")
+    assert member["likely_trigger"]["trigger_type"] == "market_trend"
+    assert member["likely_trigger"]["description"] == "Moved together with WIF (co-moving cluster)"
+    assert member["findings"] == []
+
+
+def queue(db, cluster: list[dict]) -> QueuedInvestigation:
+    row = QueuedInvestigation(symbol=cluster[0]["symbol"], payload=json.dumps(cluster))
+    db.add(row)
+    db.commit()
+    return row
+
+
+def investigate_all(db, monkeypatch, clusters, time_seconds=480):
+    gathered = []
+
+    async def collect_evidence(cluster):
+        gathered.append(cluster[0]["symbol"])
+        return {"items": {}}
+
+    monkeypatch.setattr(pipeline, "collect_evidence", collect_evidence)
+    monkeypatch.setattr(pipeline, "fast_path", lambda bundle: rules_investigation())
+    monkeypatch.setattr(pipeline, "RunBudget", lambda **kwargs: RunBudget(time_seconds=time_seconds, **kwargs))
+    stats = {"findings_count": 0, "notifications_queued": 0, "fast_path": 0, "deferred": 0}
+    asyncio.run(pipeline.investigate_all(db, lambda line: None, clusters, stats))
+    return gathered, stats
+
+
+def test_deferred_cluster_stays_queued_until_investigated(db, monkeypatch):
+    row = queue(db, [make_pump("WIF")])
+
+    clusters = pipeline.load_deferred(db)
+    assert clusters[0][0]["queued_id"] == row.id
+    db.refresh(row)
+    assert row.status == "deferred"
+
+    investigate_all(db, monkeypatch, clusters)
+    db.refresh(row)
+    assert row.status == "requeued"
+    assert trigger_of(db, "WIF").trigger_type == "exchange_listing"
+
+
+def test_evidence_is_only_gathered_for_clusters_that_get_budget(db, monkeypatch):
+    row = queue(db, [make_pump("WIF")])
+    clusters = pipeline.load_deferred(db) + [[make_pump("PEPE")]]
+
+    gathered, stats = investigate_all(db, monkeypatch, clusters, time_seconds=0)
+
+    assert gathered == []
+    assert stats["deferred"] == 2
+    # The carried-over cluster keeps its queue row instead of getting a second one
+    rows = db.query(QueuedInvestigation).order_by(QueuedInvestigation.id).all()
+    assert [(r.id, r.symbol, r.status) for r in rows] == [
+        (row.id, "WIF", "deferred"), (row.id + 1, "PEPE", "deferred")
+    ]
+
+
+def test_each_investigation_writes_through_its_own_session_off_the_loop(db, monkeypatch):
+    calls = []
+    save_cluster = pipeline.save_cluster
+
+    def recording_save_cluster(session, *args):
+        calls.append((session, threading.current_thread()))
+        return save_cluster(session, *args)
+
+    monkeypatch.setattr(pipeline, "save_cluster", recording_save_cluster)
+    investigate_all(db, monkeypatch, [[make_pump("WIF")], [make_pump("PEPE")], [make_pump("BONK")]])
+
+    sessions = {id(session) for session, _ in calls}
+    assert len(sessions) == 3 and id(db) not in sessions
+    assert all(thread is not threading.main_thread() for _, thread in calls)
+    assert db.query(Pump).count() == 3
+
+
+def test_pump_too_large_to_analyze_is_saved_without_a_trigger(db, monkeypatch):
+    row = queue(db, [make_pump("WIF")])
+    clusters = pipeline.load_deferred(db)
+    monkeypatch.setattr(pipeline, "PUMP_TOKEN_BUDGET", 100)
+    monkeypatch.setattr(pipeline, "fast_path", lambda bundle: None)
+
+    async def collect_evidence(cluster):
+        return {"market": {}, "items": {}, "errors": []}
+
+    monkeypatch.setattr(pipeline, "collect_evidence", collect_evidence)
+    stats = {"findings_count": 0, "notifications_queued": 0, "fast_path": 0, "deferred": 0}
+    asyncio.run(pipeline.investigate_all(db, lambda line: None, clusters, stats))
+
+    trigger = trigger_of(db, "WIF")
+    assert trigger.trigger_type == "unknown" and "per-pump limit 100" in trigger.description
+    db.refresh(row)
+    assert row.status == "requeued"
+    assert stats["notifications_queued"] == 0
+
+
+def test_usage_of_a_call_without_a_result_is_priced_from_tokens():
+    meter = UsageMeter()
+    meter.feed(json.dumps({"type": "assistant", "message": {
+        "id": "msg_1", "usage": {"input_tokens": 1_000_000, "output_tokens": 100_000}}}))
+    expected = (1_000_000 * TOKEN_PRICES_USD["input_tokens"]
+                + 100_000 * TOKEN_PRICES_USD["output_tokens"]) / 1_000_000
+    assert meter.usage["cost_usd"] == expected
+
+    meter.feed(json.dumps({"type": "result", "total_cost_usd": 0.5,
+                           "usage": {"input_tokens": 10, "output_tokens": 5}}))
+    assert meter.usage["cost_usd"] == 0.5
+
+
+def test_overlapping_investigations_reserve_their_cost():
+    budget = RunBudget(cost_usd=1.0)
+    assert budget.can_afford(1000, estimated_cost=0.6)
+    budget.reserve(1000, 0.6)
+    # Nothing has finished yet, but the first call's reservation already counts
+    assert not budget.can_afford(1000, estimated_cost=budget.estimated_cost(0.6))
+
+    budget.record(10.0, 800, 0.3, reserved=1000, reserved_cost=0.6)
+    assert budget.cost_used == 0.3 and budget.tokens_used == 800
+    assert budget.estimated_cost(0.6) == 0.3
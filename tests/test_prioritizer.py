@@ -0,0 +1,72 @@
+import time
+
+import pytest
+
+from src.agents.prioritizer import RunBudget, prioritize_clusters, score_pump
+
+
+def pump(symbol: str, change: float = 20.0, market_cap: float = None, volume_change: float = None) -> dict:
+    return {"symbol": symbol, "price_change_pct": change, "market_cap": market_cap,
+            "volume_change_pct": volume_change}
+
+
+def test_scores_are_capped_and_novelty_falls_off():
+    top = pump("BTC", change=80.0, market_cap=1e12, volume_change=900.0)
+    assert score_pump(top) == pytest.approx(1.0)
+    assert score_pump(top, recent_pumps=1) == pytest.approx(0.9)
+    assert score_pump(pump("NEW", change=0.0)) == pytest.approx(0.2)
+
+
+def test_clusters_rank_by_their_best_member():
+    small = [pump("TINY", change=45.0)]
+    sector = [pump("MEME", change=15.0), pump("PEPE", change=25.0, market_cap=4e9, volume_change=200.0)]
+    repeat = [pump("WIF", change=30.0, market_cap=2e9, volume_change=200.0)]
+
+    ordered = prioritize_clusters([small, sector, repeat], {"WIF": 3})
+
+    assert [c[0]["symbol"] for c in ordered] == ["MEME", "WIF", "TINY"]
+    assert all("priority" in p for c in ordered for p in c)
+    assert sector[1]["priority"] > repeat[0]["priority"] > small[0]["priority"]
+
+
+def started(budget: RunBudget, seconds_ago: float) -> RunBudget:
+    budget.started_at = time.monotonic() - seconds_ago
+    return budget
+
+
+def test_time_budget_leaves_room_for_the_expected_duration():
+    budget = started(RunBudget(time_seconds=480, initial_estimate_seconds=60), seconds_ago=400)
+    assert budget.can_afford()
+
+    budget.record(100.0)
+    assert not budget.can_afford()
+    # Work without a model call only needs the time left
+    assert budget.can_afford(model_call=False)
+    assert not started(budget, seconds_ago=481).can_afford(model_call=False)
+
+
+def test_token_and_cost_cutoffs_count_reservations():
+    budget = RunBudget(tokens=10000, cost_usd=1.0)
+    assert budget.can_afford(6000, estimated_cost=0.5)
+
+    budget.reserve(6000, 0.5)
+    assert not budget.can_afford(6000, estimated_cost=0.1)
+    assert not budget.can_afford(1000, estimated_cost=0.6)
+    assert budget.can_afford(4000, estimated_cost=0.5)
+
+    # The finished call used less than it reserved
+    budget.record(30.0, tokens=3000, cost_usd=0.2, reserved=6000, reserved_cost=0.5)
+    assert (budget.tokens_used, budget.cost_used) == (3000, pytest.approx(0.2))
+    assert budget.estimated_cost(initial=0.9) == pytest.approx(0.2)
+
+
+def test_daily_ceilings_cut_off_like_run_limits():
+    budget = RunBudget(daily_tokens_left=5000, daily_cost_left=0.3)
+
+    assert budget.can_afford(5000, estimated_cost=0.3)
+    assert not budget.can_afford(5001)
+    assert not budget.can_afford(estimated_cost=0.31)
+
+
+def test_zero_limits_are_unlimited():
+    assert RunBudget(tokens=0, cost_usd=0.0).can_afford(10 ** 9, estimated_cost=1e6)
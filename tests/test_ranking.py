@@ -0,0 +1,101 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.collectors import ranking
+from src.worker import pipeline
+
+DETECTED = datetime(2024, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def item(title: str, content: str = "", published_at=None, url: str = None) -> dict:
+    return {"title": title, "content": content, "source_url": url or f"https://x.com/{title}",
+            "published_at": published_at.isoformat() if published_at else None}
+
+
+def bundle(items: dict, symbol: str = "PEPE", **pump) -> dict:
+    return {
+        "symbol": symbol,
+        "pump": {"symbol": symbol, "detected_at": DETECTED.isoformat(), "time_window_minutes": 60, **pump},
+        "items": items,
+        "gathered_at": (DETECTED + timedelta(hours=12)).isoformat(),
+    }
+
+
+def titles(ranked: dict, source: str) -> list[str]:
+    return [i["title"] for i in ranked["items"][source]]
+
+
+def test_bm25_ranks_focused_mentions_first_and_drops_unrelated_items():
+    in_window = DETECTED - timedelta(minutes=30)
+    ranked = ranking.rank_bundle(bundle({"web": [
+        item("Market wrap", "bitcoin ether solana and pepe among many other coins today", in_window),
+        item("PEPE rallies", "pepe pepe jumps after pepe listing news", in_window),
+        item("Bitcoin ETF flows", "nothing about frogs here", in_window),
+    ]}))
+    assert titles(ranked, "web") == ["PEPE rallies", "Market wrap"]
+    assert ranked["candidate_counts"] == {"web": 3}
+
+
+def test_cashtag_outranks_a_bare_mention():
+    at = DETECTED - timedelta(minutes=10)
+    ranked = ranking.rank_bundle(bundle({"reddit": [
+        item("pepe thread", "pepe", at),
+        item("ticker thread", "$pepe", at),
+    ]}))
+    assert titles(ranked, "reddit") == ["ticker thread", "pepe thread"]
+
+
+def test_recency_decays_from_the_pump_window():
+    assert ranking.recency_weight(DETECTED - timedelta(minutes=30), DETECTED, 60) == 1.0
+    one_half_life = DETECTED - timedelta(minutes=60) - timedelta(hours=6)
+    assert ranking.recency_weight(one_half_life, DETECTED, 60, half_life_hours=6) == pytest.approx(0.5)
+    assert ranking.recency_weight(DETECTED + timedelta(minutes=5), DETECTED, 60) == ranking.LATE_WEIGHT
+    assert ranking.recency_weight(None, DETECTED, 60) == ranking.UNDATED_WEIGHT
+
+
+def test_recency_is_measured_from_detection_not_gathering():
+    # Published half an hour before detection, gathered twelve hours after it
+    ranked = ranking.rank_bundle(bundle({"web": [item("PEPE news", "pepe", DETECTED - timedelta(minutes=30))]}))
+    fresh = ranked["items"]["web"][0]["relevance"]
+
+    undated = bundle({"web": [item("PEPE news", "pepe", DETECTED - timedelta(minutes=30))]})
+    del undated["pump"]["detected_at"]
+    stale = ranking.rank_bundle(undated)["items"]["web"][0]["relevance"]
+    # Measured from gathering, the item would be 11.5h older than the window
+    assert stale == pytest.approx(fresh * 0.5 ** (11.5 / ranking.HALF_LIFE_HOURS), abs=1e-3)
+
+
+def test_top_k_keeps_the_best_items_per_source():
+    at = DETECTED - timedelta(minutes=5)
+    items = [item(f"pepe {'pepe ' * n}", "", at, url=f"https://x.com/{n}") for n in range(6)]
+    ranked = ranking.rank_bundle(bundle({"web": items, "reddit": items[:2]}), top_k=3)
+    assert [i["source_url"] for i in ranked["items"]["web"]] == ["https://x.com/5", "https://x.com/4", "https://x.com/3"]
+    assert len(ranked["items"]["reddit"]) == 2
+
+
+def test_aliases_and_name_match():
+    at = DETECTED - timedelta(minutes=5)
+    items = {"web": [item("1000SATS perp opens", "", at), item("Ordinals token runs", "", at)]}
+    assert titles(ranking.rank_bundle(bundle(items, symbol="SATS")), "web") == []
+
+    items = {"web": [item("1000SATS perp opens", "", at), item("Ordinals token runs", "", at)]}
+    ranked = ranking.rank_bundle(bundle(items, symbol="SATS", name="Ordinals"), aliases=["1000SATS"])
+    assert sorted(titles(ranked, "web")) == ["1000SATS perp opens", "Ordinals token runs"]
+
+
+def test_pipeline_ranks_with_universe_aliases_and_detection_time(monkeypatch):
+    at = DETECTED - timedelta(minutes=5)
+
+    async def gather_evidence(pump):
+        return {"symbol": pump["symbol"], "pump": pump, "items": {"web": [item("1000SATS perp opens", "", at)]},
+                "gathered_at": (DETECTED + timedelta(hours=12)).isoformat()}
+
+    monkeypatch.setattr(pipeline, "gather_evidence", gather_evidence)
+    pump = {"symbol": "SATS", "detected_at": DETECTED.isoformat(), "time_window_minutes": 60, "aliases": ["1000SATS"]}
+    ranked = asyncio.run(pipeline.collect_evidence([pump]))
+    assert titles(ranked, "web") == ["1000SATS perp opens"]
+    # Inside the pump window: full weight, not the late-item discount
+    assert ranked["items"]["web"][0]["relevance"] == pytest.approx(
+        ranking.score_items(ranked["items"]["web"], {"sats", "1000sats"}, "SATS")[0], abs=1e-3)
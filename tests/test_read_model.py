@@ -0,0 +1,50 @@
+import json
+from datetime import datetime, timedelta
+
+from sqlalchemy.dialects import postgresql
+
+from src.web import read_model
+from src.web.models import Pump, SymbolSummary, TableVersion
+
+
+def add_pump(db, symbol: str, minutes_ago: int = 0) -> Pump:
+    pump = Pump(symbol=symbol, price_change_pct=25.0,
+                detected_at=datetime.utcnow() - timedelta(minutes=minutes_ago))
+    db.add(pump)
+    db.commit()
+    return pump
+
+
+def summary_version(db) -> int:
+    return db.get(TableVersion, "symbol_summaries").version
+
+
+def test_refresh_inserts_then_updates_documents(db):
+    add_pump(db, "WIF", minutes_ago=10)
+    assert read_model.refresh_symbol_summaries(db, ["WIF"]) == 1
+    version = summary_version(db)
+
+    add_pump(db, "WIF")
+    read_model.refresh_symbol_summaries(db, ["WIF"])
+
+    row = db.query(SymbolSummary).one()
+    assert row.pump_count == 2
+    assert len(json.loads(row.document)["pumps"]) == 2
+    db.expire_all()
+    assert summary_version(db) > version
+
+
+def test_refresh_drops_documents_of_symbols_without_pumps(db):
+    add_pump(db, "WIF")
+    read_model.refresh_symbol_summaries(db, ["WIF"])
+    db.query(Pump).delete()
+    db.commit()
+
+    assert read_model.refresh_symbol_summaries(db, ["WIF"]) == 0
+    assert db.query(SymbolSummary).count() == 0
+
+
+def test_upsert_for_postgresql():
+    statement = read_model._upsert("postgresql", [{"symbol": "WIF", "document": "{}"}])
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (symbol) DO UPDATE SET document = excluded.document" in sql
@@ -0,0 +1,64 @@
+import httpx
+import pytest
+
+from conftest import fixture_json, invalid_json, rate_limited, routes, run, timeout
+from src.collectors import reddit
+
+
+@pytest.fixture(autouse=True)
+def no_cached_token(monkeypatch):
+    monkeypatch.setattr(reddit, "_token", {"value": None, "expires_at": 0.0})
+    monkeypatch.setattr(reddit, "REDDIT_CLIENT_ID", "")
+    monkeypatch.setattr(reddit, "REDDIT_CLIENT_SECRET", "")
+
+
+def test_search_posts_public_endpoint(mock_http):
+    requests = mock_http(routes({"/search.json": httpx.Response(200, json=fixture_json("reddit_search.json"))}))
+
+    posts = run(reddit.search_posts('"$PEPE"'))
+
+    assert requests[0].url.host == "www.reddit.com"
+    assert requests[0].url.params["q"] == '"$PEPE"'
+    assert [p["title"] for p in posts] == ["PEPE listed on Upbit KRW market", "$PEPE up 12% today"]
+    first = posts[0]
+    assert first["source_type"] == "reddit"
+    assert first["source_url"] == "https://www.reddit.com/r/CryptoCurrency/comments/1ddq2zk/pepe_listed_on_upbit_krw_market/"
+    assert first["published_at"] == "2024-06-12T07:50:01+00:00"
+    assert first["metadata"] == {"subreddit": "CryptoCurrency", "score": 412, "num_comments": 133}
+
+
+def test_search_posts_with_oauth_token(mock_http, monkeypatch):
+    monkeypatch.setattr(reddit, "REDDIT_CLIENT_ID", "id")
+    monkeypatch.setattr(reddit, "REDDIT_CLIENT_SECRET", "secret")
+    requests = mock_http(routes({
+        "/api/v1/access_token": httpx.Response(200, json={"access_token": "tok", "token_type": "bearer", "expires_in": 86400}),
+        "/search": httpx.Response(200, json=fixture_json("reddit_search.json")),
+    }))
+
+    posts = run(reddit.search_posts("PEPE"))
+    run(reddit.search_posts("WIF"))
+
+    assert len(posts) == 2
+    # The token is fetched once and reused
+    assert [r.url.path for r in requests] == ["/api/v1/access_token", "/search", "/search"]
+    assert requests[1].url.host == "oauth.reddit.com"
+    assert requests[1].headers["Authorization"] == "Bearer tok"
+
+
+def test_token_failure_falls_back_to_public_endpoint(mock_http, monkeypatch):
+    monkeypatch.setattr(reddit, "REDDIT_CLIENT_ID", "id")
+    monkeypatch.setattr(reddit, "REDDIT_CLIENT_SECRET", "secret")
+    requests = mock_http(routes({
+        "/api/v1/access_token": rate_limited,
+        "/search.json": httpx.Response(200, json=fixture_json("reddit_search.json")),
+    }))
+
+    assert len(run(reddit.search_posts("PEPE"))) == 2
+    assert requests[-1].url.path == "/search.json"
+
+
+@pytest.mark.parametrize("handler", [rate_limited, invalid_json, timeout])
+def test_errors_return_no_posts(mock_http, handler):
+    mock_http(handler)
+
+    assert run(reddit.search_posts("PEPE")) == []
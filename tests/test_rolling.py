@@ -0,0 +1,77 @@
+import math
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from src.agents.rolling import MultiResolutionHistory, forward_fill
+
+START = datetime(2024, 1, 1)
+NOW = START + timedelta(hours=6)
+
+
+def history() -> MultiResolutionHistory:
+    """A ticks every minute, B every 15 minutes, C only lately; six hours in all."""
+    rows = []
+    for minute in range(361):
+        rows.append(("A", minute, 100.0 + minute, 1000.0 + 10 * minute))
+        if minute % 15 == 0:
+            rows.append(("B", minute, 60.0 if minute == 360 else 50.0, 5000.0))
+    rows.append(("C", 350, 3.0, 10.0))
+    rows.append(("C", 360, 3.3, 12.0))
+    # A second snapshot in the same minute supersedes the first
+    rows.append(("A", 360, 470.0, 4600.0))
+    symbols, minutes, prices, volumes = zip(*rows)
+    return MultiResolutionHistory(list(symbols), [START + timedelta(minutes=m) for m in minutes],
+                                  list(prices), list(volumes), now=NOW)
+
+
+def changes(hist: MultiResolutionHistory, window: int) -> dict:
+    price, volume = hist.window_changes(window)
+    return {s: (price[i], volume[i]) for i, s in enumerate(hist.symbols)}
+
+
+def test_forward_fill_carries_the_last_value():
+    matrix = np.array([[1.0, np.nan, np.nan, 4.0, np.nan], [np.nan, 2.0, np.nan, np.nan, 5.0]])
+    filled = forward_fill(matrix)
+    assert filled[0].tolist() == [1.0, 1.0, 1.0, 4.0, 4.0]
+    assert math.isnan(filled[1, 0]) and filled[1, 1:].tolist() == [2.0, 2.0, 2.0, 5.0]
+
+
+def test_latest_snapshot_wins():
+    hist = history()
+    assert hist.symbols == ["A", "B", "C"]
+    assert hist.latest_prices().tolist() == [470.0, 60.0, 3.3]
+
+
+def test_short_windows_read_the_minute_level():
+    hour = changes(history(), 60)
+    assert hour["A"][0] == pytest.approx((470 / 400 - 1) * 100)
+    assert hour["A"][1] == pytest.approx((4600 / 4000 - 1) * 100)
+    # B's quarter-hour snapshots are forward-filled between ticks
+    assert hour["B"] == (pytest.approx(20.0), pytest.approx(0.0))
+    # C has no data an hour back
+    assert math.isnan(hour["C"][0])
+
+
+def test_longer_windows_read_downsampled_closes():
+    # 4h is past the 2h of minutes kept: it is read from 15m buckets, each
+    # closing at its last snapshot (the 02:00 bucket closes at 02:14)
+    four_hours = changes(history(), 240)
+    assert four_hours["A"][0] == pytest.approx((470 / 234 - 1) * 100)
+    assert four_hours["B"][0] == pytest.approx(20.0)
+
+
+def test_coverage_follows_the_stored_span_and_resolutions():
+    hist = history()
+    assert hist.covers(60) and hist.covers(240) and hist.covers(360)
+    assert not hist.covers(1440)
+    assert not hist.covers(8 * 1440)
+    price, volume = hist.window_changes(8 * 1440)
+    assert np.isnan(price).all() and np.isnan(volume).all()
+
+
+def test_empty_history_covers_nothing():
+    hist = MultiResolutionHistory([], [], [], [])
+    assert not hist.covers(5)
+    assert hist.latest_prices().size == 0
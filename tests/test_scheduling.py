@@ -0,0 +1,26 @@
+from datetime import datetime, timedelta
+
+from src.web.models import PriceSnapshot
+from src.worker import scheduling
+
+NOW = datetime(2024, 1, 1, 12, 0)
+
+
+def snapshots(db, latest: datetime):
+    start = latest - timedelta(minutes=scheduling.VOLATILITY_WINDOW_MINUTES)
+    for symbol, change in (("PEPE", 1.05), ("WIF", 0.99)):
+        db.add(PriceSnapshot(symbol=symbol, captured_at=start, price=1.0))
+        db.add(PriceSnapshot(symbol=symbol, captured_at=latest, price=change))
+    db.commit()
+
+
+def test_market_heat_from_fresh_snapshots(db):
+    snapshots(db, NOW - timedelta(minutes=1))
+    heat = scheduling.market_heat(db, NOW)
+    assert heat["symbols"] == 2
+    assert round(heat["volatility_pct"], 6) == 3.0
+
+
+def test_stalled_snapshots_give_no_signal(db):
+    snapshots(db, NOW - timedelta(seconds=scheduling.SNAPSHOT_STALE_SECONDS + 60))
+    assert scheduling.market_heat(db, NOW) is None
@@ -0,0 +1,94 @@
+import asyncio
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+
+from src.worker import supervisor as supervisor_module
+from src.worker.supervisor import ProcessSupervisor
+
+
+def python(code: str) -> list[str]:
+    return [sys.executable, "-u", "-c", code]
+
+
+@pytest.fixture
+def spawned(monkeypatch):
+    """Record every process the supervisor starts."""
+    processes = []
+    create = asyncio.create_subprocess_exec
+
+    async def recording(*args, **kwargs):
+        process = await create(*args, **kwargs)
+        processes.append(process)
+        return process
+
+    monkeypatch.setattr(supervisor_module.asyncio, "create_subprocess_exec", recording)
+    return processes
+
+
+def test_output_lines_and_return_code():
+    seen = []
+
+    async def main():
+        return await ProcessSupervisor().run(python("print('one'); print('two'); raise SystemExit(3)"),
+                                             timeout=10, on_line=seen.append)
+
+    assert asyncio.run(main()) == (3, ["one", "two"])
+    assert seen == ["one", "two"]
+
+
+def test_concurrency_is_capped():
+    peak = []
+
+    async def main():
+        supervisor = ProcessSupervisor(max_concurrent=2)
+        cmd = python("import time; print('up'); time.sleep(0.3)")
+        await asyncio.gather(*(
+            supervisor.run(cmd, timeout=10, on_line=lambda _: peak.append(supervisor.running))
+            for _ in range(5)
+        ))
+        return supervisor.running
+
+    assert asyncio.run(main()) == 0
+    assert len(peak) == 5
+    assert max(peak) == 2
+
+
+def test_overdue_process_is_terminated(spawned):
+    async def main():
+        await ProcessSupervisor().run(python("import time; print('started'); time.sleep(30)"), timeout=0.5)
+
+    with pytest.raises(subprocess.TimeoutExpired) as timeout:
+        asyncio.run(main())
+    assert timeout.value.output == "started"
+    assert spawned[0].returncode == -signal.SIGTERM
+
+
+def test_process_ignoring_sigterm_is_killed_after_the_grace_period(spawned, monkeypatch):
+    monkeypatch.setattr(supervisor_module, "KILL_GRACE_SECONDS", 0.2)
+    code = "import signal, time; signal.signal(signal.SIGTERM, signal.SIG_IGN); print('started'); time.sleep(30)"
+
+    async def main():
+        await ProcessSupervisor().run(python(code), timeout=0.5)
+
+    started = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        asyncio.run(main())
+    assert spawned[0].returncode == -signal.SIGKILL
+    assert time.monotonic() - started < 5
+
+
+def test_cancelled_run_stops_its_process(spawned):
+    async def main():
+        supervisor = ProcessSupervisor()
+        task = asyncio.create_task(supervisor.run(python("import time; print('started'); time.sleep(30)"),
+                                                  timeout=30, on_line=lambda _: task.cancel()))
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return supervisor.running
+
+    assert asyncio.run(main()) == 0
+    assert spawned[0].returncode is not None
@@ -0,0 +1,225 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from src.web.models import AgentRun, Notification, Pump, RunCheckpoint  # noqa: E402
+from src.worker import run_lock, tasks  # noqa: E402
+from src.worker.log_archive import iter_run_log_lines  # noqa: E402
+
+
+@pytest.fixture
+def worker(db, monkeypatch):
+    """Run tasks against the test database with an in-process run lock and queue."""
+    state = {"holder": None, "released": [], "started": [], "alert_locks": {}}
+
+    def acquire(run_id):
+        if state["holder"] is not None:
+            return False
+        state["holder"] = run_id
+        return True
+
+    def release(run_id):
+        state["released"].append(run_id)
+        if state["holder"] == run_id:
+            state["holder"] = None
+        return True
+
+    monkeypatch.setattr(tasks, "SessionLocal", sessionmaker(bind=db.get_bind()))
+    monkeypatch.setattr(tasks, "acquire_run_lock", acquire)
+    monkeypatch.setattr(tasks, "lock_holder", lambda: state["holder"])
+    monkeypatch.setattr(tasks, "release_run_lock", release)
+    monkeypatch.setattr(run_lock, "release_run_lock", release)
+    monkeypatch.setattr(tasks.run_pump_agent, "delay", lambda run_id: state["started"].append(run_id))
+    monkeypatch.setattr(tasks, "acquire_alert_lock",
+                        lambda pump_id, owner: state["alert_locks"].setdefault(pump_id, owner) == owner)
+    monkeypatch.setattr(tasks, "release_alert_lock",
+                        lambda pump_id, owner: state["alert_locks"].pop(pump_id, None) == owner)
+    return state
+
+
+def stuck_run(db, detected: bool) -> int:
+    run = AgentRun(status="running", started_at=datetime.utcnow() - timedelta(hours=1),
+                   heartbeat_at=datetime.utcnow() - timedelta(hours=1))
+    db.add(run)
+    db.flush()
+    if detected:
+        db.add(RunCheckpoint(run_id=run.id, phase="detected", payload="[]"))
+    db.commit()
+    return run.id
+
+
+def test_reaper_queues_a_take_over_run_for_work_past_detection(db, worker):
+    run_id = stuck_run(db, detected=True)
+    worker["holder"] = run_id
+
+    result = tasks.reap_stuck_agent_runs()
+
+    assert result["reaped"] == [run_id]
+    take_over = result["take_over"]["run_id"]
+    assert worker["started"] == [take_over] and worker["holder"] == take_over
+    assert db.get(AgentRun, run_id).status == "failed"
+    assert db.get(AgentRun, take_over).status == "queued"
+
+
+def test_reaped_runs_get_an_error_message_and_a_log(db, worker):
+    run_id = stuck_run(db, detected=False)
+    queued = AgentRun(status="queued", started_at=datetime.utcnow() - timedelta(hours=2))
+    db.add(queued)
+    db.commit()
+
+    assert sorted(tasks.reap_stuck_agent_runs()["reaped"]) == [run_id, queued.id]
+
+    db.expire_all()
+    stuck = db.get(AgentRun, run_id)
+    assert stuck.error_message.startswith("Worker heartbeat lost: none since ")
+    assert list(iter_run_log_lines(stuck)) == [f"Run #{run_id} failed: {stuck.error_message}"]
+    never_started = db.get(AgentRun, queued.id)
+    assert never_started.error_message.startswith("Never picked up by a worker")
+    assert never_started.logs is None and never_started.logs_archive is not None
+
+
+def test_reaper_does_not_queue_a_run_without_checkpointed_work(db, worker):
+    run_id = stuck_run(db, detected=False)
+
+    result = tasks.reap_stuck_agent_runs()
+
+    assert result == {"reaped": [run_id], "take_over": None}
+    assert worker["started"] == []
+
+
+def test_run_lock_is_released_when_the_run_is_missing(worker):
+    worker["holder"] = 404
+
+    assert tasks.run_pump_agent.run(404) == {"error": "Run not found"}
+    assert worker["holder"] is None
+
+
+def test_run_lock_is_released_when_storing_the_logs_fails(db, worker, monkeypatch):
+    from src.worker import pipeline
+
+    run = AgentRun(status="queued")
+    db.add(run)
+    db.commit()
+    worker["holder"] = run.id
+
+    def store_run_logs(run, logs):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(pipeline, "run_pipeline", lambda *args: {
+        "pumps_detected": 0, "findings_count": 0, "fast_path": 0, "notifications_queued": 0, "deferred": 0
+    })
+    monkeypatch.setattr(tasks, "store_run_logs", store_run_logs)
+
+    with pytest.raises(RuntimeError):
+        tasks.run_pump_agent.run(run.id)
+    assert worker["released"] == [run.id] and worker["holder"] is None
+
+
+def test_failed_pipeline_is_recorded_after_a_database_error(db, worker, monkeypatch):
+    from sqlalchemy import text
+    from src.worker import pipeline
+
+    run = AgentRun(status="queued")
+    db.add(run)
+    db.commit()
+    worker["holder"] = run.id
+
+    def run_pipeline(session, *args):
+        session.execute(text("SELECT * FROM no_such_table"))
+
+    monkeypatch.setattr(pipeline, "run_pipeline", run_pipeline)
+
+    assert tasks.run_pump_agent.run(run.id)["status"] == "failed"
+    db.expire_all()
+    assert db.get(AgentRun, run.id).status == "failed"
+    assert worker["holder"] is None
+
+
+def alert_setup(db, sent_before: bool = False):
+    run = AgentRun(status="completed")
+    pump = Pump(symbol="WIF", price_change_pct=25.0)
+    db.add_all([run, pump])
+    db.flush()
+    if sent_before:
+        db.add(Notification(pump_id=pump.id, channel="telegram", message="...", status="sent"))
+    db.commit()
+    return run.id, pump.id
+
+
+def notified(db, run_id: int) -> list[str]:
+    return [symbol for (symbol,) in db.query(RunCheckpoint.symbol).filter(
+        RunCheckpoint.run_id == run_id, RunCheckpoint.phase == "notified")]
+
+
+def test_alert_is_checkpointed_once_sent(db, worker, monkeypatch):
+    from src.worker import pipeline
+
+    run_id, pump_id = alert_setup(db)
+    sends = []
+
+    async def notify(session, pump_row, pump, investigation, run_id=None):
+        sends.append(pump_row.id)
+        return True
+
+    monkeypatch.setattr(pipeline, "notify", notify)
+    result = tasks.send_pump_alert.run(pump_id, {"symbol": "WIF"}, {}, run_id)
+
+    assert result == {"pump_id": pump_id, "sent": True, "already_sent": False}
+    assert sends == [pump_id]
+    assert notified(db, run_id) == ["WIF"]
+
+
+def test_alert_already_sent_is_not_sent_again(db, worker, monkeypatch):
+    from src.worker import pipeline
+
+    run_id, pump_id = alert_setup(db, sent_before=True)
+
+    async def notify(*args, **kwargs):
+        raise AssertionError("sent twice")
+
+    monkeypatch.setattr(pipeline, "notify", notify)
+    result = tasks.send_pump_alert.run(pump_id, {"symbol": "WIF"}, {}, run_id)
+
+    assert result["already_sent"] is True
+    assert notified(db, run_id) == ["WIF"]
+
+
+def test_alert_is_not_sent_while_another_copy_holds_its_lock(db, worker, monkeypatch):
+    from celery.exceptions import Retry
+    from src.worker import pipeline
+
+    run_id, pump_id = alert_setup(db)
+    worker["alert_locks"][pump_id] = "other-copy"
+
+    async def notify(*args, **kwargs):
+        raise AssertionError("sent concurrently")
+
+    monkeypatch.setattr(pipeline, "notify", notify)
+    with pytest.raises(Retry):
+        tasks.send_pump_alert.run(pump_id, {"symbol": "WIF"}, {}, run_id)
+    assert worker["alert_locks"] == {pump_id: "other-copy"}
+
+
+def test_alert_out_of_retries_is_recorded_as_given_up(db, worker, monkeypatch):
+    from src.worker import pipeline
+
+    run_id, pump_id = alert_setup(db)
+
+    async def notify(session, pump_row, pump, investigation, run_id=None):
+        session.add(Notification(pump_id=pump_row.id, channel="telegram", message="...", status="failed"))
+        session.commit()
+        return False
+
+    monkeypatch.setattr(pipeline, "notify", notify)
+    result = tasks.send_pump_alert.apply((pump_id, {"symbol": "WIF"}, {}, run_id),
+                                         retries=tasks.ALERT_MAX_RETRIES).get()
+
+    assert result == {"pump_id": pump_id, "sent": False, "gave_up": True}
+    statuses = [status for (status,) in db.query(Notification.status).order_by(Notification.id)]
+    assert statuses == ["failed", "gave_up"]
+    assert notified(db, run_id) == []
+    assert worker["alert_locks"] == {}
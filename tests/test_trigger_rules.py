@@ -0,0 +1,119 @@
+import pytest
+
+from src.agents import trigger_rules
+
+
+def bundle(**items):
+    return {"symbol": "PEPE", "items": items}
+
+
+def web(title, url, content=""):
+    return {"source_type": "web", "title": title, "content": content, "source_url": url}
+
+
+def test_repeated_generic_items_do_not_saturate():
+    items = [web(f"PEPE team announced update {i}", f"https://site{i}.com/post") for i in range(6)]
+
+    result = trigger_rules.classify_evidence(bundle(web=items))
+
+    assert result["likely_trigger"]["trigger_type"] == "announcement"
+    assert result["likely_trigger"]["confidence"] == pytest.approx(0.35)
+    assert trigger_rules.fast_path(bundle(web=items)) is None
+
+
+def test_weak_rules_alone_never_reach_the_fast_path():
+    items = [web("New listing: PEPE", "https://a.com/1"), web("PEPE officially announced", "https://b.com/2")]
+
+    result = trigger_rules.classify_evidence(bundle(web=items, twitter=items))
+
+    assert result["likely_trigger"]["confidence"] <= trigger_rules.WEAK_RULES_MAX_CONFIDENCE
+
+
+def test_bare_regulator_words_are_not_regulation():
+    items = [web(f"sec filing ruling court {i}", f"https://c{i}.com") for i in range(6)]
+
+    assert trigger_rules.classify_evidence(bundle(web=items)) is None
+
+
+def test_regulator_action_is_regulation():
+    result = trigger_rules.classify_evidence(bundle(web=[web("SEC drops case against PEPE issuer", "https://d.com")]))
+
+    assert result["likely_trigger"]["trigger_type"] == "regulation"
+
+
+def test_duplicates_count_once():
+    item = web("Binance will list PEPE", "https://binance.com/en/support/announcement/1")
+    copies = [item, dict(item, source_url=item["source_url"] + "?utm=x"), dict(item, source_url="https://mirror.com/a")]
+
+    once = trigger_rules.classify_evidence(bundle(web=[item]))
+    repeated = trigger_rules.classify_evidence(bundle(web=copies))
+
+    assert len(repeated["findings"]) == 1
+    assert repeated["likely_trigger"]["confidence"] == once["likely_trigger"]["confidence"]
+
+
+def test_independent_sources_corroborate_a_decisive_rule():
+    result = trigger_rules.fast_path(bundle(
+        web=[web("Binance will list PEPE", "https://binance.com/a")],
+        twitter=[{"source_type": "twitter", "title": "Upbit lists PEPE KRW pair", "source_url": "https://x.com/1"}],
+    ))
+
+    assert result is not None
+    assert result["likely_trigger"]["trigger_type"] == "listing"
+
+
+@pytest.mark.parametrize("text, sentiment", [
+    ("Binance will list PEPE", "positive"),
+    ("PEPE bridge exploited, funds drained after hack", "negative"),
+    ("PEPE weekly report", "neutral"),
+])
+def test_finding_sentiment_follows_the_evidence(text, sentiment):
+    assert trigger_rules.evidence_sentiment(text.lower()) == sentiment
+
+
+def test_calibration_shrinks_toward_prior():
+    examples = [("Binance will list PEPE", "listing")] * 5 + [("Binance lists PEPE perps", "unknown")] * 5
+
+    calibrated = trigger_rules.calibrate_precisions(examples, prior_strength=10)
+
+    assert calibrated["listing_exchange"]["matches"] == 10
+    assert calibrated["listing_exchange"]["hits"] == 5
+    assert calibrated["listing_exchange"]["precision"] == pytest.approx((5 + 10 * 0.8) / 20)
+
+
+SOURCES = ("web", "twitter", "reddit", "telegram", "discord")
+TYPE_EXAMPLES = {
+    "listing": "Binance will list PEPE",
+    "partnership": "PEPE partners with Visa",
+    "airdrop": "PEPE airdrop snapshot date set",
+    "regulation": "SEC drops case against PEPE issuer",
+    "product_launch": "PEPE mainnet goes live",
+    "whale_activity": "Whales bought 2T PEPE",
+    "announcement": "PEPE team announced an update",
+}
+
+
+def corroborated(text: str, sources) -> dict:
+    """The same kind of news from several independent sources."""
+    return bundle(**{
+        source: [{"source_type": source, "title": f"{text} ({source})", "source_url": f"https://{source}.com/1"}]
+        for source in sources
+    })
+
+
+def test_several_trigger_types_can_reach_the_fast_path_by_default():
+    reach = {
+        trigger_type for trigger_type, text in TYPE_EXAMPLES.items()
+        if trigger_rules.fast_path(corroborated(text, SOURCES)) is not None
+    }
+    assert reach == {"listing", "partnership", "airdrop", "regulation", "product_launch"}
+
+
+@pytest.mark.parametrize("trigger_type, sources_needed", [
+    ("listing", 2), ("partnership", 3), ("airdrop", 3), ("regulation", 4), ("product_launch", 5),
+])
+def test_sources_needed_for_the_fast_path(trigger_type, sources_needed):
+    text = TYPE_EXAMPLES[trigger_type]
+    assert trigger_rules.fast_path(corroborated(text, SOURCES[:sources_needed - 1])) is None
+    result = trigger_rules.fast_path(corroborated(text, SOURCES[:sources_needed]))
+    assert result["likely_trigger"]["trigger_type"] == trigger_type
@@ -0,0 +1,84 @@
+from src.agents import universe
+from src.agents.universe import EXCHANGE_BINANCE, EXCHANGE_COINMARKETCAP, SymbolIndex, build_universe
+from src.worker.market_data import load_universe, refresh_universe
+
+
+def ticker(symbol: str, volume: float = 1e7) -> dict:
+    return {"symbol": symbol, "pair": f"{symbol}USDT", "quote_volume": volume}
+
+
+def coin(symbol: str, cmc_id: int, rank: int = None, market_cap: float = 1e9, volume: float = 1e8) -> dict:
+    return {"symbol": symbol, "id": cmc_id, "rank": rank, "name": f"{symbol} coin", "slug": symbol.lower(),
+            "market_cap": market_cap, "volume_24h": volume}
+
+
+def by_symbol(entries: list[dict]) -> dict:
+    return {e["symbol"]: e for e in entries}
+
+
+def test_highest_ranked_coin_keeps_a_shared_ticker():
+    entries = by_symbol(build_universe([], [coin("PEPE", 31000, rank=2400), coin("PEPE", 24478, rank=30),
+                                            coin("PEPE", 99999)]))
+    assert entries["PEPE"]["cmc_id"] == 24478
+    assert entries["PEPE"]["exchanges"] == EXCHANGE_COINMARKETCAP
+
+
+def test_multiplier_listing_becomes_an_alias():
+    entries = by_symbol(build_universe([ticker("1000SATS", 5e7)], [coin("SATS", 28194, rank=200)]))
+
+    sats = entries["SATS"]
+    assert set(entries) == {"SATS"}
+    assert sats["aliases"] == ["1000SATS"]
+    assert sats["binance_pair"] == "1000SATSUSDT"
+    assert sats["exchanges"] == EXCHANGE_BINANCE | EXCHANGE_COINMARKETCAP
+    # CMC volume is kept over the exchange's
+    assert sats["volume_24h"] == 1e8
+
+
+def test_an_asset_trading_under_its_own_name_is_never_claimed_by_an_alias():
+    entries = by_symbol(build_universe([ticker("1000SATS"), ticker("SATS")], [coin("SATS", 28194, rank=200)]))
+
+    assert entries["SATS"]["binance_pair"] == "SATSUSDT" and entries["SATS"]["aliases"] == []
+    assert entries["1000SATS"]["binance_pair"] == "1000SATSUSDT"
+    assert entries["1000SATS"]["cmc_id"] is None
+
+
+def test_binance_only_assets_get_their_own_entry():
+    entries = by_symbol(build_universe([ticker("NEWCOIN", 2e6), ticker("1000XYZ")], []))
+
+    assert entries["NEWCOIN"]["exchanges"] == EXCHANGE_BINANCE
+    assert entries["NEWCOIN"]["volume_24h"] == 2e6
+    assert entries["NEWCOIN"]["market_cap"] is None
+    # No asset to be a multiple of
+    assert entries["1000XYZ"]["aliases"] == []
+
+
+def test_liquidity_floors(monkeypatch):
+    monkeypatch.setattr(universe, "MIN_VOLUME_USD", 500000.0)
+    monkeypatch.setattr(universe, "MIN_MARKET_CAP_USD", 5e6)
+    index = SymbolIndex(build_universe(
+        [ticker("BIG"), ticker("THIN", 1e5), ticker("BINONLY", 1e6)],
+        [coin("BIG", 1, rank=10), coin("MICRO", 2, rank=3000, market_cap=1e6), coin("THIN", 3, rank=900, volume=None)],
+    ))
+
+    assert index.is_liquid("BIG")
+    assert not index.is_liquid("MICRO")
+    assert not index.is_liquid("THIN")
+    # Binance-only: no market cap does not fail the floor
+    assert index.is_liquid("BINONLY")
+    # Unknown to the universe: the detection's own values decide
+    assert index.is_liquid("FRESH", market_cap=None, volume_24h=1e6)
+    assert not index.is_liquid("FRESH", market_cap=None, volume_24h=None)
+
+
+def test_stored_universe_round_trips(db):
+    entries = build_universe([ticker("1000SATS"), ticker("PEPE")], [coin("SATS", 28194, rank=200),
+                                                                   coin("PEPE", 24478, rank=30)])
+    assert refresh_universe(db, entries) == 2
+    assert refresh_universe(db, []) == 0
+
+    index = load_universe(db)
+    assert len(index) == 2
+    assert index.get("SATS")["aliases"] == ["1000SATS"]
+    assert index.canonical_binance("1000SATS") == "SATS"
+    assert index.canonical_binance("PEPE") == "PEPE"
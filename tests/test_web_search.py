@@ -0,0 +1,35 @@
+import httpx
+import pytest
+
+from conftest import fixture_text, rate_limited, routes, run, timeout
+from src.collectors import web_search
+
+
+def test_search_news_parses_feed(mock_http):
+    requests = mock_http(routes({"/rss/search": httpx.Response(200, text=fixture_text("google_news.xml"))}))
+
+    items = run(web_search.search_news('"$PEPE"'))
+
+    assert requests[0].url.params["q"] == '"$PEPE" when:1d'
+    assert [i["title"] for i in items] == [
+        "Upbit lists PEPE against the Korean won - The Block",
+        "PEPE rallies 12% as meme coins rebound - CoinDesk",
+    ]
+    assert items[0]["source_type"] == "web"
+    assert items[0]["published_at"] == "2024-06-12T07:41:00+00:00"
+    assert items[0]["metadata"] == {"publisher": "The Block"}
+    # Unparseable dates are dropped, not fatal
+    assert items[1]["published_at"] is None
+
+
+def test_invalid_feed_returns_no_items(mock_http):
+    mock_http(routes({"/rss/search": httpx.Response(200, text="{not xml")}))
+
+    assert run(web_search.search_news("PEPE")) == []
+
+
+@pytest.mark.parametrize("handler", [rate_limited, timeout])
+def test_errors_return_no_items(mock_http, handler):
+    mock_http(handler)
+
+    assert run(web_search.search_news("PEPE")) == []